@@ -0,0 +1,215 @@
+import atexit
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+try:
+    import win32com.client as win32
+    import pythoncom
+except ImportError:
+    # 한/글이 없는 환경에서는 풀을 만들 수 없음 (네이티브 백엔드 사용)
+    win32 = None
+    pythoncom = None
+
+# 풀 크기 기본값. 환경변수 HWP_COM_POOL_SIZE로 바꿀 수 있음
+DEFAULT_POOL_SIZE = int(os.environ.get("HWP_COM_POOL_SIZE", "2"))
+# 작업이 없을 때 인스턴스 상태를 확인하는 주기(초)
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+
+
+def launch_hwp(visible=False):
+    """숨겨진 한/글 인스턴스를 새로 실행하고 보안 모듈을 등록합니다."""
+    # DispatchEx로 매번 별도 프로세스를 띄우고, 출력 인자(GetText 등)를 위해 early binding 적용
+    hwp = win32.gencache.EnsureDispatch(win32.DispatchEx("HWPFrame.HwpObject"))
+    hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
+    hwp.XHwpWindows.Item(0).Visible = visible
+    return hwp
+
+
+def is_healthy(hwp):
+    """인스턴스가 아직 응답하는지 확인합니다. (한/글이 죽었으면 COM 호출이 실패함)"""
+    if hwp is None:
+        return False
+    try:
+        hwp.XHwpDocuments.Count
+        return True
+    except Exception:
+        return False
+
+
+class _HwpWorker(threading.Thread):
+    """
+    한/글 인스턴스 하나를 소유하는 STA 스레드.
+    COM 객체는 만든 스레드에서만 써야 하므로 작업 함수도 이 스레드에서 실행됩니다.
+    """
+
+    def __init__(self, pool, index):
+        super().__init__(name=f"hwp-com-{index}", daemon=True)
+        self.pool = pool
+        self.hwp = None
+        self.jobs_done = 0
+        self.restarts = 0
+
+    def run(self):
+        pythoncom.CoInitialize()
+        try:
+            while True:
+                try:
+                    job = self.pool._jobs.get(timeout=self.pool.health_check_interval)
+                except queue.Empty:
+                    # 쉬는 동안 죽은 인스턴스는 미리 다시 띄워 둠
+                    try:
+                        self._ensure_hwp()
+                    except Exception as e:
+                        print(f"⚠️ {self.name}: 한/글 인스턴스 실행 실패: {e}")
+                    continue
+                if job is None:
+                    break
+                func, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(self._ensure_hwp()))
+                except BaseException as e:
+                    future.set_exception(e)
+                finally:
+                    self.jobs_done += 1
+        finally:
+            self._quit()
+            pythoncom.CoUninitialize()
+
+    def _ensure_hwp(self):
+        """상태 확인 후 필요하면 인스턴스를 (재)실행합니다."""
+        if self.hwp is not None and is_healthy(self.hwp):
+            return self.hwp
+        if self.hwp is not None:
+            print(f"⚠️ {self.name}: 한/글 인스턴스가 응답하지 않아 다시 실행합니다.")
+            self.restarts += 1
+            self._quit()
+        self.hwp = launch_hwp(self.pool.visible)
+        return self.hwp
+
+    def _quit(self):
+        if self.hwp is not None:
+            try:
+                self.hwp.Quit()
+            except Exception:
+                pass
+            self.hwp = None
+
+
+class HwpComPool:
+    """
+    미리 실행해 둔 한/글 인스턴스 풀.
+    작업은 비어 있는 인스턴스가 가져가 실행하며, 문서만 닫고 인스턴스는 계속 재사용합니다.
+
+    사용 예:
+        pool = HwpComPool(size=2)
+        fields = pool.run_document("a.hwp", lambda hwp: hwp.GetFieldList(0, ""))
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, visible=False,
+                 health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL, warm=True):
+        if win32 is None:
+            raise RuntimeError("COM 풀을 사용하려면 pywin32와 한/글이 필요합니다")
+        if size < 1:
+            raise ValueError("풀 크기는 1 이상이어야 합니다")
+        self.size = size
+        self.visible = visible
+        self.health_check_interval = health_check_interval
+        self._jobs = queue.Queue()
+        self._closed = False
+        self._workers = [_HwpWorker(self, i) for i in range(size)]
+        for worker in self._workers:
+            worker.start()
+        if warm:
+            # 각 워커가 인스턴스를 미리 띄우도록 빈 작업을 하나씩 넣어 둠
+            for _ in range(size):
+                self.submit(lambda hwp: None)
+
+    def submit(self, func):
+        """func(hwp)를 풀의 인스턴스에서 실행하고 Future를 반환합니다."""
+        if self._closed:
+            raise RuntimeError("이미 종료된 COM 풀입니다")
+        future = Future()
+        self._jobs.put((func, future))
+        return future
+
+    def run(self, func, timeout=None):
+        """submit 후 결과를 기다립니다."""
+        return self.submit(func).result(timeout)
+
+    def submit_document(self, file_path, func):
+        """문서를 열고 func(hwp)를 실행한 뒤 그 문서만 닫습니다."""
+        file_path = os.path.abspath(file_path)
+
+        def job(hwp):
+            if not hwp.Open(file_path):
+                raise IOError(f"문서를 열 수 없습니다: {file_path}")
+            try:
+                return func(hwp)
+            finally:
+                # 인스턴스는 유지하고 현재 문서만 저장하지 않고 닫음
+                hwp.Clear(1)
+
+        return self.submit(job)
+
+    def run_document(self, file_path, func, timeout=None):
+        return self.submit_document(file_path, func).result(timeout)
+
+    def stats(self):
+        """워커별 처리 건수와 재실행 횟수"""
+        return {
+            "size": self.size,
+            "pending": self._jobs.qsize(),
+            "workers": [
+                {"name": w.name, "alive": w.is_alive(), "jobs_done": w.jobs_done, "restarts": w.restarts}
+                for w in self._workers
+            ],
+        }
+
+    def shutdown(self, wait=True):
+        """모든 인스턴스를 종료합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._jobs.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(size=None):
+    """프로세스 전역 COM 풀을 (처음 호출 시 만들어) 반환합니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HwpComPool(size=size or DEFAULT_POOL_SIZE)
+            atexit.register(shutdown_pool)
+        return _pool
+
+
+def configure_pool(size=DEFAULT_POOL_SIZE, **kwargs):
+    """전역 풀을 지정한 설정으로 다시 만듭니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        else:
+            atexit.register(shutdown_pool)
+        _pool = HwpComPool(size=size, **kwargs)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,369 @@
+"""
+HWPAssistant를 별도 프로세스에서 실행하는 작업 프로세스와, GUI 쪽에서 쓰는 클라이언트.
+
+한/글 COM 아파트는 작업 프로세스의 메인 스레드 하나가 소유하고,
+GUI는 파이프로 요청을 보내 Future로 결과를 받습니다. (Tk에서는 after()로 Future를 확인)
+한/글이 멈추거나 작업 프로세스가 죽어도 GUI 프로세스는 영향을 받지 않으며, 다음 요청 때 다시 띄웁니다.
+
+    worker = AssistantWorker(backend="com")
+    future = worker.submit("open_file", "a.hwp")
+    stream = worker.stream("call_gemini", "다듬어줘", text)   # 조각 단위 수신, close()로 취소
+"""
+import collections
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+# 작업 프로세스에서 GUI로 돌려보내는 HWPAssistant 상태
+MIRRORED_STATE = ("is_opened", "current_file", "last_llm_cache", "use_llm_cache")
+# GUI에서 바꿀 수 있는 HWPAssistant 속성
+SETTABLE_OPTIONS = ("use_llm_cache",)
+
+
+class WorkerError(RuntimeError):
+    """작업 프로세스 안에서 발생한 예외 (원래 예외 이름과 메시지를 담음)"""
+
+    def __init__(self, type_name, message):
+        super().__init__(f"{type_name}: {message}")
+        self.type_name = type_name
+
+
+class WorkerCrashedError(RuntimeError):
+    """작업 프로세스가 응답 도중 종료됨 (한/글 비정상 종료 등)"""
+
+
+# --- 작업 프로세스 쪽 ---
+
+def _state_of(assistant):
+    import llm_cache
+
+    state = {name: getattr(assistant, name, None) for name in MIRRORED_STATE}
+    state["com_ready"] = assistant.backend.hwp is not None
+    state["llm_cache_summary"] = llm_cache.get_cache().summary()
+    return state
+
+
+def _worker_main(conn, backend):
+    """작업 프로세스 진입점: HWPAssistant를 만들고 파이프 요청을 순서대로 처리합니다."""
+    from hwp_assistant import HWPAssistant  # 작업 프로세스에서만 COM을 초기화
+
+    assistant = HWPAssistant(backend=backend)
+    pending = collections.deque()
+    cancelled = set()
+
+    def receive():
+        return pending.popleft() if pending else conn.recv()
+
+    def drain(call_id):
+        """스트리밍 중 도착한 메시지를 확인: 이 요청의 취소면 True, 다른 요청은 나중에 처리하도록 보관"""
+        while conn.poll():
+            message = conn.recv()
+            if message[0] == "cancel":
+                cancelled.add(message[1])
+            else:
+                pending.append(message)
+        return call_id in cancelled
+
+    conn.send(("ready", None, None, _state_of(assistant)))
+    while True:
+        try:
+            message = receive()
+        except (EOFError, OSError):
+            break
+        kind = message[0]
+        if kind == "stop":
+            break
+        if kind == "cancel":
+            cancelled.add(message[1])
+            continue
+
+        _, call_id, method, args, kwargs, streaming = message
+        if call_id in cancelled:
+            cancelled.discard(call_id)
+            conn.send(("error", call_id, ("CancelledError", "취소됨"), _state_of(assistant)))
+            continue
+        try:
+            if method == "set_option":
+                name, value = args
+                if name not in SETTABLE_OPTIONS:
+                    raise AttributeError(f"바꿀 수 없는 속성입니다: {name}")
+                setattr(assistant, name, value)
+                result = None
+            elif method.startswith("_"):
+                raise AttributeError(f"내부 메서드는 호출할 수 없습니다: {method}")
+            else:
+                result = getattr(assistant, method)(*args, **kwargs)
+            if streaming and result is not None and not isinstance(result, str):
+                for piece in result:
+                    if drain(call_id):
+                        if hasattr(result, "close"):
+                            result.close()  # 연결/프로세스 정리
+                        break
+                    conn.send(("chunk", call_id, piece, None))
+                result = None
+            conn.send(("done", call_id, result, _state_of(assistant)))
+        except Exception as e:
+            conn.send(("error", call_id, (type(e).__name__, str(e)), _state_of(assistant)))
+        finally:
+            cancelled.discard(call_id)
+
+    try:
+        assistant.close_file()
+    except Exception:
+        pass
+
+
+# --- GUI 프로세스 쪽 ---
+
+class WorkerStream:
+    """
+    작업 프로세스가 보내는 응답 조각을 차례로 내보내는 반복자.
+    HWPAssistant.call_gemini(stream=True)의 제너레이터처럼 쓸 수 있고, close()하면 작업 프로세스에 취소를 보냅니다.
+    """
+    _END = object()
+
+    def __init__(self, worker, call_id):
+        self.worker = worker
+        self.call_id = call_id
+        self.future = Future()
+        self._pieces = queue.Queue()
+        self._closed = False
+
+    def _put(self, piece):
+        self._pieces.put(piece)
+
+    def _finish(self, error=None):
+        if error is None:
+            self.future.set_result(None)
+        else:
+            self.future.set_exception(error)
+        self._pieces.put(self._END)
+
+    def __iter__(self):
+        while True:
+            piece = self._pieces.get()
+            if piece is self._END:
+                break
+            yield piece
+        error = self.future.exception()
+        if error is not None:
+            raise error
+
+    def close(self):
+        if not self._closed and not self.future.done():
+            try:
+                self.worker._send(("cancel", self.call_id))
+            except OSError:
+                pass  # 작업 프로세스가 이미 종료됨
+        self._closed = True
+
+
+class AssistantWorker:
+    """
+    작업 프로세스의 HWPAssistant를 호출하는 클라이언트.
+    결과는 concurrent.futures.Future로 돌려주며, 작업 프로세스가 죽으면 대기 중인 요청을
+    WorkerCrashedError로 끝내고 다음 요청 때 프로세스를 새로 띄운 뒤 열려 있던 문서를 다시 엽니다.
+    """
+
+    def __init__(self, backend="com", start=True):
+        self.backend = backend
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._calls = {}  # call_id -> Future | WorkerStream
+        self._process = None
+        self._conn = None
+        self._ready = None
+        self.restarts = 0
+        self.state = {name: None for name in MIRRORED_STATE}
+        self.state.update(is_opened=False, current_file="", com_ready=False)
+        self._reopen_path = None
+        if start:
+            self.start()
+
+    # --- 프로세스 관리 ---
+    def start(self):
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self._ready = Future()
+        self._process = self._context.Process(target=_worker_main, args=(child_conn, self.backend),
+                                              name="hwp-assistant-worker", daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        # 프로세스마다 대기 중인 요청 표를 따로 두어, 이전 프로세스 정리가 새 요청을 건드리지 않게 함
+        self._calls = {}
+        threading.Thread(target=self._read_loop, args=(parent_conn, self._process, self._calls, self._ready),
+                         name="hwp-assistant-reader", daemon=True).start()
+
+    def wait_ready(self, timeout=None):
+        """작업 프로세스가 HWPAssistant를 만들 때까지 기다립니다. (실패하면 WorkerCrashedError)"""
+        return self._ready.result(timeout)
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def _ensure_started(self):
+        """작업 프로세스가 죽었으면 다시 띄우고, 열려 있던 문서를 다시 엽니다."""
+        with self._lock:
+            if self.is_alive():
+                return False
+            self.restarts += 1
+            print(f"⚠️ 한/글 작업 프로세스를 다시 시작합니다 ({self.restarts}번째)")
+            self._start_locked()
+            reopen, self._reopen_path = self._reopen_path, None
+        if reopen and os.path.exists(reopen):
+            self.submit("open_file", reopen)
+        return True
+
+    def shutdown(self, timeout=5):
+        if self.is_alive():
+            try:
+                self._send(("stop",))
+            except OSError:
+                pass
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.kill()
+
+    # --- 송수신 ---
+    def _send(self, message):
+        with self._send_lock:
+            self._conn.send(message)
+
+    def _read_loop(self, conn, process, calls, ready):
+        while True:
+            try:
+                kind, call_id, value, state = conn.recv()
+            except (EOFError, OSError):
+                break
+            if state:
+                self._update_state(state)
+            if kind == "ready":
+                ready.set_result(True)
+                continue
+            if kind == "chunk":
+                call = calls.get(call_id)
+                if isinstance(call, WorkerStream):
+                    call._put(value)
+                continue
+            call = calls.pop(call_id, None)
+            if call is None:
+                continue
+            error = WorkerError(*value) if kind == "error" else None
+            if isinstance(call, WorkerStream):
+                call._finish(error)
+            elif error is not None:
+                call.set_exception(error)
+            else:
+                call.set_result(value)
+
+        # 파이프가 끊김: 작업 프로세스 종료 (한/글 비정상 종료 포함)
+        process.join(1)
+        crashed = WorkerCrashedError(f"한/글 작업 프로세스가 종료되었습니다 (종료 코드 {process.exitcode})")
+        if not ready.done():
+            ready.set_exception(crashed)
+        with self._lock:
+            if self._process is process:
+                if self.state.get("is_opened"):
+                    self._reopen_path = self.state.get("current_file")
+                self.state.update(is_opened=False, com_ready=False)
+            unfinished = list(calls.values())
+            calls.clear()
+        for call in unfinished:
+            if isinstance(call, WorkerStream):
+                call._finish(crashed)
+            elif not call.done():
+                call.set_exception(crashed)
+
+    def _update_state(self, state):
+        self.state.update(state)
+        if state.get("is_opened"):
+            self._reopen_path = state.get("current_file")
+
+    def _call(self, method, args, kwargs, streaming):
+        self._ensure_started()
+        call_id = next(self._ids)
+        call = WorkerStream(self, call_id) if streaming else Future()
+        self._calls[call_id] = call
+        try:
+            self._send(("call", call_id, method, args, kwargs, streaming))
+        except Exception as e:
+            self._calls.pop(call_id, None)
+            if isinstance(e, OSError):
+                e = WorkerCrashedError(f"한/글 작업 프로세스에 요청을 보낼 수 없습니다: {e}")
+            if streaming:
+                call._finish(e)
+            else:
+                call.set_exception(e)
+        return call
+
+    def submit(self, method, *args, **kwargs):
+        """HWPAssistant.<method>(*args, **kwargs)를 작업 프로세스에서 실행하고 Future를 반환합니다."""
+        return self._call(method, args, kwargs, False)
+
+    def stream(self, method, *args, **kwargs):
+        """제너레이터를 돌려주는 메서드(call_gemini(stream=True) 등)를 조각 단위로 받습니다."""
+        return self._call(method, args, kwargs, True)
+
+    def set_option(self, name, value):
+        self.state[name] = value
+        return self.submit("set_option", name, value)
+
+    # --- HWPAssistant 상태 (작업 프로세스가 보낸 마지막 값) ---
+    @property
+    def is_opened(self):
+        return bool(self.state.get("is_opened"))
+
+    @property
+    def current_file(self):
+        return self.state.get("current_file") or ""
+
+    @property
+    def last_llm_cache(self):
+        return self.state.get("last_llm_cache")
+
+    @property
+    def use_llm_cache(self):
+        value = self.state.get("use_llm_cache")
+        return True if value is None else bool(value)
+
+    @use_llm_cache.setter
+    def use_llm_cache(self, value):
+        self.set_option("use_llm_cache", value)
+
+    @property
+    def com_ready(self):
+        return bool(self.state.get("com_ready"))
+
+    @property
+    def llm_cache_summary(self):
+        """작업 프로세스의 AI 응답 캐시 적중률 요약"""
+        return self.state.get("llm_cache_summary") or ""
+
+
+def poll_future(widget, future, on_done, on_error=None, interval=50):
+    """
+    Tk 메인 루프에서 Future가 끝났는지 after()로 확인하고, 끝나면 메인 스레드에서 콜백을 호출합니다.
+    on_error가 없으면 예외를 출력만 합니다.
+    """
+    def check():
+        if not future.done():
+            widget.after(interval, check)
+            return
+        error = future.exception()
+        if error is None:
+            on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"❌ 작업 실패: {error}")
+
+    widget.after(interval, check)
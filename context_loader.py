@@ -0,0 +1,144 @@
+import os
+import threading
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INSTRUCTIONS_DIR = "instructions"
+
+
+def candidate_paths(filename, document_dir="", cwd=None):
+    """
+    컨텍스트 파일을 찾을 경로 후보 (우선순위 순).
+    현재 작업 디렉토리 → 스크립트 디렉토리 → 열린 HWP 파일 디렉토리 → context/, instructions/ 폴더
+    """
+    cwd = cwd or os.getcwd()
+    paths = [os.path.join(cwd, filename), os.path.join(SCRIPT_DIR, filename)]
+    if document_dir:
+        paths.append(os.path.join(document_dir, filename))
+    paths += [
+        os.path.join(cwd, "context", filename),
+        os.path.join(cwd, INSTRUCTIONS_DIR, filename),
+        os.path.join(SCRIPT_DIR, "context", filename),
+        os.path.join(SCRIPT_DIR, INSTRUCTIONS_DIR, filename),
+    ]
+    return paths
+
+
+def _find(filename, document_dir, cwd):
+    return next((os.path.abspath(p) for p in candidate_paths(filename, document_dir, cwd) if os.path.exists(p)), None)
+
+
+class ContextLoader:
+    """
+    지침(instructions/*.md)과 @컨텍스트 파일의 경로 탐색 결과와 내용을 메모리에 두는 캐시.
+    꺼낼 때마다 파일을 stat 한 번으로 확인해, 수정 시각이 같으면 메모리 사본을 그대로 돌려주고
+    바뀐 파일만 다시 읽습니다. (style_registry와 같은 방식, 감시 스레드 없음)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (파일 이름, 문서 디렉토리, 작업 디렉토리) -> 찾은 경로 | None
+        self._resolved = {}
+        # 경로 -> (수정 시각, 내용)
+        self._contents = {}
+        self.reads = 0
+
+    # --- 경로 탐색 ---
+    def resolve(self, filename, document_path=""):
+        """
+        컨텍스트 파일의 실제 경로. 없으면 None.
+        기억해 둔 경로는 아직 있는지만 확인하고, 없어졌거나 전에 못 찾았으면 다시 찾습니다.
+        """
+        key = (filename, os.path.dirname(document_path) if document_path else "", os.getcwd())
+        with self._lock:
+            path = self._resolved.get(key)
+        if path is not None and os.path.exists(path):
+            return path
+        found = _find(*key)
+        with self._lock:
+            self._resolved[key] = found
+        return found
+
+    # --- 내용 ---
+    def _load_file(self, path, mtime):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with self._lock:
+            self._contents[path] = (mtime, content)
+            self.reads += 1
+        return content
+
+    def read(self, path):
+        """파일 내용 (수정 시각이 같으면 메모리 사본). 파일을 읽을 수 없으면 OSError."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._contents.pop(path, None)
+            raise
+        with self._lock:
+            entry = self._contents.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        return self._load_file(path, mtime)
+
+    def load(self, filename, document_path=""):
+        """경로를 찾아 (경로, 내용)을 반환합니다. 파일이 없으면 (None, None)."""
+        path = self.resolve(filename, document_path)
+        if path is None:
+            return None, None
+        return path, self.read(path)
+
+    def preload(self, directory=None):
+        """instructions/ 폴더의 지침 파일을 미리 읽어 둡니다."""
+        directories = [directory] if directory else [INSTRUCTIONS_DIR, os.path.join(SCRIPT_DIR, INSTRUCTIONS_DIR)]
+        count = 0
+        for d in dict.fromkeys(os.path.abspath(d) for d in directories):
+            if not os.path.isdir(d):
+                continue
+            for name in sorted(os.listdir(d)):
+                if not name.endswith(".md"):
+                    continue
+                try:
+                    self.read(os.path.join(d, name))
+                    self.resolve(f"{INSTRUCTIONS_DIR}/{name}")
+                    count += 1
+                except OSError as e:
+                    print(f"⚠️ 지침 파일 미리 읽기 실패 ({name}): {e}")
+        return count
+
+    def refresh(self):
+        """
+        기억해 둔 경로를 모두 다시 찾습니다. (우선순위가 더 높은 위치에 새 파일을 둔 경우 등)
+        내용은 꺼낼 때 수정 시각으로 확인하므로 따로 다시 읽지 않습니다.
+
+        Returns:
+            int: 경로가 바뀐 항목 수
+        """
+        changed = 0
+        with self._lock:
+            resolved = list(self._resolved.items())
+        for key, path in resolved:
+            found = _find(*key)
+            if found != path:
+                with self._lock:
+                    self._resolved[key] = found
+                changed += 1
+        return changed
+
+    def clear(self):
+        with self._lock:
+            self._resolved.clear()
+            self._contents.clear()
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_loader():
+    """프로세스 전역 컨텍스트 로더"""
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = ContextLoader()
+        return _loader
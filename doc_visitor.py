@@ -0,0 +1,434 @@
+"""
+문서를 한 번만 순회하며 필요한 정보를 모으는 방문자.
+
+리더(hwp5_reader, hwpx_reader)는 문단을 문서 순서대로 넘겨주기만 하고,
+제목 / 누름틀 / 표 / 글꼴 / 서식 / 본문 텍스트는 등록된 수집기(Collector)가 각자 모읍니다.
+필요한 수집기만 켜면 그만큼 일을 덜 합니다.
+
+사용 예:
+    with hwp5_reader.Hwp5File(path) as doc:
+        result = doc.visit(["title", "fields"])
+    result["title"], result["fields"]
+"""
+
+# COM 경로의 SetPos(2, pos, pos) 샘플 위치 (문단 번호, 글자 위치)
+SAMPLE_POSITIONS = [0, 100, 200, 500, 1000]
+
+
+def _shape_at(runs, pos):
+    """문단 글자 모양 목록에서 pos 위치에 적용된 글자 모양 ID"""
+    shape_id = runs[0][1] if runs else 0
+    for start, sid in runs:
+        if start > pos:
+            break
+        shape_id = sid
+    return shape_id
+
+
+def _cell_grid(table):
+    """표 셀을 rows x cols 텍스트 격자로 변환 (병합 셀은 왼쪽 위 칸에 기록)"""
+    grid = [["" for _ in range(table["cols"])] for _ in range(table["rows"])]
+    for cell in table["cells"]:
+        if cell["row"] < table["rows"] and cell["col"] < table["cols"]:
+            text = " ".join(p.text.replace("\n", " ").strip() for p in cell["paragraphs"])
+            grid[cell["row"]][cell["col"]] = text.strip()
+    return grid
+
+
+def _cell_details(table):
+    """셀마다 위치, 병합 크기, 텍스트 (셀 안 문단은 줄바꿈으로 연결)"""
+    return [
+        {
+            "row": cell["row"],
+            "col": cell["col"],
+            "row_span": cell["row_span"],
+            "col_span": cell["col_span"],
+            "text": "\n".join(p.text.strip() for p in cell["paragraphs"]).strip(),
+        }
+        for cell in table["cells"]
+    ]
+
+
+def _cell_matrix(rows, cols, details):
+    """
+    rows x cols 셀 행렬. 병합 셀의 텍스트는 왼쪽 위 칸에 두고,
+    병합으로 가려진 칸은 None으로 표시합니다. (셀이 없는 칸은 "")
+    """
+    matrix = [["" for _ in range(cols)] for _ in range(rows)]
+    for cell in details:
+        for r in range(cell["row"], min(cell["row"] + max(cell["row_span"], 1), rows)):
+            for c in range(cell["col"], min(cell["col"] + max(cell["col_span"], 1), cols)):
+                matrix[r][c] = None
+    for cell in details:
+        if cell["row"] < rows and cell["col"] < cols:
+            matrix[cell["row"]][cell["col"]] = cell["text"]
+    return matrix
+
+
+def _table_summary(index, table):
+    details = _cell_details(table)
+    return {
+        "table_index": index,
+        "description": f"표 {index + 1}",
+        "cells": f"표 크기: {table['rows']}행 {table['cols']}열",
+        "rows": table["rows"],
+        "cols": table["cols"],
+        "matrix": _cell_matrix(table["rows"], table["cols"], details),
+        "cell_details": details,
+    }
+
+
+class VisitContext:
+    """수집기에 넘겨주는 현재 위치 정보"""
+    __slots__ = ("section", "index", "in_table", "table_index")
+
+    def __init__(self):
+        self.section = 0
+        self.index = -1        # 본문(표 밖) 문단 번호. 표 안 문단은 표를 가진 본문 문단 번호
+        self.in_table = False
+        self.table_index = -1  # 문서 전체에서 몇 번째 표인지
+
+
+class Collector:
+    """
+    수집기 기본 클래스. 필요한 메서드만 재정의하면 됩니다.
+    begin → (paragraph / table)* → result 순으로 호출됩니다.
+    """
+    name = ""
+
+    def begin(self, doc):
+        self.doc = doc
+
+    @property
+    def doc_info(self):
+        """서식 표 (처음 쓸 때 한 번만 해석됨)"""
+        return self.doc.doc_info
+
+    def paragraph(self, para, ctx):
+        pass
+
+    def table(self, table, ctx):
+        pass
+
+    def result(self):
+        return None
+
+
+class TextLinesCollector(Collector):
+    """GetTextFile("TEXT") 결과처럼 공백이 아닌 줄 목록 (표 안 문단 포함)"""
+    name = "paragraphs"
+
+    def __init__(self):
+        self.lines = []
+
+    def paragraph(self, para, ctx):
+        for line in para.text.split("\n"):
+            if line.strip():
+                self.lines.append(line.strip())
+
+    def result(self):
+        return self.lines
+
+
+class FullTextCollector(Collector):
+    """모든 문단을 문서 순서대로 "\\r\\n"으로 연결한 전체 텍스트"""
+    name = "full_text"
+
+    def __init__(self):
+        self.parts = []
+
+    def paragraph(self, para, ctx):
+        self.parts.append(para.text)
+
+    def result(self):
+        return "\r\n".join(self.parts)
+
+
+class FieldCollector(Collector):
+    """누름틀 이름 → 값"""
+    name = "fields"
+
+    def __init__(self):
+        self.fields = {}
+
+    def paragraph(self, para, ctx):
+        for name, value in para.fields:
+            if name:
+                self.fields[name] = value.strip()
+
+    def result(self):
+        return self.fields
+
+
+class TitleCollector(Collector):
+    """'제목' 누름틀 값, 없으면 첫 번째 비어 있지 않은 본문 문단의 첫 줄"""
+    name = "title"
+
+    def __init__(self):
+        self.field_title = ""
+        self.first_line = None
+
+    def paragraph(self, para, ctx):
+        for name, value in para.fields:
+            if name == "제목":
+                self.field_title = value.strip()
+        if self.first_line is None and not ctx.in_table and para.text.strip():
+            self.first_line = para.text.split("\n")[0].strip()
+
+    def result(self):
+        return self.field_title or self.first_line or ""
+
+
+class TableSummaryCollector(Collector):
+    """표마다 행/열 수, 병합을 반영한 셀 행렬, 셀별 텍스트와 병합 크기 (중첩 표 포함)"""
+    name = "tables"
+
+    def __init__(self):
+        self.tables = []
+
+    def table(self, table, ctx):
+        self.tables.append(_table_summary(ctx.table_index, table))
+
+    def result(self):
+        return self.tables
+
+
+class FontCollector(Collector):
+    """문서에 정의된 글꼴 이름 목록"""
+    name = "fonts"
+
+    def result(self):
+        return self.doc_info.fonts_used()
+
+
+class FormatSampleCollector(Collector):
+    """SAMPLE_POSITIONS 위치의 글자 / 문단 서식 (예전 COM 샘플링과 같은 결과)"""
+    name = "format_samples"
+
+    def __init__(self, positions=SAMPLE_POSITIONS):
+        self.positions = set(positions)
+        self.character_formats = []
+        self.paragraph_formats = []
+
+    def paragraph(self, para, ctx):
+        if ctx.in_table or ctx.index not in self.positions:
+            return
+        pos = ctx.index
+        char_format = self.doc_info.char_format(_shape_at(para.char_shape_runs, pos))
+        para_format = self.doc_info.para_format(para.para_shape_id)
+        if char_format is None or para_format is None:
+            return
+        self.character_formats.append({"position": pos, **char_format})
+        self.paragraph_formats.append({"position": pos, **para_format})
+
+    def result(self):
+        return {"character_formats": self.character_formats, "paragraph_formats": self.paragraph_formats}
+
+
+class ParagraphFormatCollector(Collector):
+    """
+    본문 문단마다 글자 서식(첫 글자)과 문단 서식. 샘플링 없이 모든 문단을 기록하며,
+    서식은 서식 표에서 ID로 바로 찾으므로 문단 수에 비례하는 비용만 듭니다.
+    """
+    name = "formats"
+
+    def __init__(self):
+        self.character_formats = []
+        self.paragraph_formats = []
+
+    def paragraph(self, para, ctx):
+        if ctx.in_table:
+            return
+        char_format = self.doc_info.char_format(_shape_at(para.char_shape_runs, 0))
+        para_format = self.doc_info.para_format(para.para_shape_id)
+        if char_format is None or para_format is None:
+            return
+        self.character_formats.append({"position": ctx.index, **char_format})
+        self.paragraph_formats.append({"position": ctx.index, **para_format})
+
+    def result(self):
+        return {"character_formats": self.character_formats, "paragraph_formats": self.paragraph_formats}
+
+
+class StyledStructureCollector(Collector):
+    """
+    본문 문단마다 텍스트, 첫 글자의 글꼴/크기/굵기, 글자 모양 구간(runs),
+    본문 문단에 붙은 표의 텍스트 격자.
+
+    runs는 [텍스트 위치, 스타일 번호] 목록이고, 스타일 번호는 문서 전체가 함께 쓰는
+    styles 표(내용이 같은 글자 모양은 하나로 합침)를 가리킵니다.
+    """
+    name = "styled_structure"
+
+    def __init__(self):
+        self.structure = []
+        self.styles = []
+        self._style_index = {}   # 서식 내용 → 스타일 번호
+        self._shape_style = {}   # 글자 모양 ID → 스타일 번호
+
+    def _style_of(self, shape_id):
+        index = self._shape_style.get(shape_id)
+        if index is None:
+            char_format = self.doc_info.char_format(shape_id) or {}
+            key = tuple(sorted(char_format.items()))
+            index = self._style_index.get(key)
+            if index is None:
+                index = len(self.styles)
+                self.styles.append(char_format)
+                self._style_index[key] = index
+            self._shape_style[shape_id] = index
+        return index
+
+    def _runs(self, para, text):
+        """구간 위치를 앞뒤 공백을 제거한 text 기준으로 옮기고, 같은 스타일이 이어지면 합칩니다."""
+        lead = len(para.text) - len(para.text.lstrip())
+        runs = []
+        for offset, shape_id in para.text_char_shape_runs():
+            offset = max(offset - lead, 0)
+            if runs and offset >= len(text):
+                break  # 뒤쪽 공백 / 문단 끝에만 걸친 구간
+            style = self._style_of(shape_id)
+            if runs and runs[-1][0] == offset:
+                runs.pop()
+            if runs and runs[-1][1] == style:
+                continue
+            runs.append([offset, style])
+        return runs
+
+    def paragraph(self, para, ctx):
+        if ctx.in_table:
+            return
+        char_format = self.doc_info.char_format(_shape_at(para.char_shape_runs, 0)) or {}
+        text = para.text.strip()
+        self.structure.append({
+            "type": "paragraph",
+            "text": text,
+            "style": {
+                "font": char_format.get("font_name", ""),
+                "size": char_format.get("font_size", 0.0),
+                "bold": bool(char_format.get("is_bold")),
+            },
+            "runs": self._runs(para, text),
+        })
+
+    def table(self, table, ctx):
+        if not ctx.in_table:
+            self.structure.append({"type": "table", "cells": _cell_grid(table)})
+
+    def result(self):
+        return {"structure": self.structure, "styles": self.styles}
+
+
+COLLECTORS = {}
+
+
+def register_collector(cls, name=None):
+    """수집기 클래스를 이름으로 등록합니다. (데코레이터로도 사용 가능)"""
+    COLLECTORS[name or cls.name] = cls
+    return cls
+
+
+for _cls in (TextLinesCollector, FullTextCollector, FieldCollector, TitleCollector,
+             TableSummaryCollector, FontCollector, FormatSampleCollector, ParagraphFormatCollector,
+             StyledStructureCollector):
+    register_collector(_cls)
+
+
+def _make_collectors(collectors):
+    """이름 또는 Collector 객체 목록을 {이름: Collector}로 바꿉니다."""
+    made = {}
+    for item in collectors:
+        if isinstance(item, Collector):
+            made[item.name] = item
+        elif item in COLLECTORS:
+            made[item] = COLLECTORS[item]()
+        else:
+            raise ValueError(f"알 수 없는 수집기입니다: {item} (사용 가능: {', '.join(COLLECTORS)})")
+    return made
+
+
+def visit(doc, section_paragraphs, parse_table, collectors):
+    """
+    문서를 한 번 순회하며 수집기들에 문단과 표를 전달합니다.
+
+    Args:
+        doc: doc_info(char_format / para_format / fonts_used)를 제공하는 문서 객체
+        section_paragraphs: (구역 번호, 최상위 문단) 이터러블
+        parse_table: 문단의 tables() 항목을 {"rows", "cols", "cells"} dict로 바꾸는 함수
+        collectors: 수집기 이름 또는 Collector 객체 목록
+
+    Returns:
+        dict: {수집기 이름: 결과}
+    """
+    active = _make_collectors(collectors)
+    for collector in active.values():
+        collector.begin(doc)
+
+    paragraph_hooks = [c.paragraph for c in active.values()
+                       if type(c).paragraph is not Collector.paragraph]
+    table_hooks = [c.table for c in active.values()
+                   if type(c).table is not Collector.table]
+    ctx = VisitContext()
+
+    def walk(para, depth):
+        ctx.in_table = depth > 0
+        for hook in paragraph_hooks:
+            hook(para, ctx)
+        for raw in para.tables():
+            table = parse_table(raw)
+            ctx.table_index += 1
+            ctx.in_table = depth > 0
+            for hook in table_hooks:
+                hook(table, ctx)
+            for cell in table["cells"]:
+                for cell_para in cell["paragraphs"]:
+                    walk(cell_para, depth + 1)
+
+    # 글꼴처럼 서식 표만 보는 수집기뿐이면 본문은 읽지 않음
+    if not paragraph_hooks and not table_hooks:
+        section_paragraphs = ()
+
+    for section, para in section_paragraphs:
+        ctx.section = section
+        ctx.index += 1
+        walk(para, 0)
+
+    return {name: collector.result() for name, collector in active.items()}
+
+
+# --- visit 결과를 기존 extractor 반환 형식으로 조립 ---
+
+STRUCTURE_COLLECTORS = ("title", "paragraphs", "fields", "tables")
+FORMATTING_COLLECTORS = STRUCTURE_COLLECTORS + ("fonts", "formats")
+STYLE_COLLECTORS = ("styled_structure", "fields")
+
+
+def structure_result(file_path, visited):
+    return {
+        "document_path": file_path,
+        "document_title": visited["title"],
+        "paragraphs": visited["paragraphs"],
+        "fields": visited["fields"],
+        "tables": visited["tables"],
+    }
+
+
+def formatting_result(file_path, visited):
+    result = structure_result(file_path, visited)
+    result["formatting_info"] = {
+        "fonts_used": visited["fonts"],
+        "paragraph_formats": visited["formats"]["paragraph_formats"],
+        "character_formats": visited["formats"]["character_formats"],
+    }
+    return result
+
+
+def style_result(file_path, visited):
+    structure = visited["styled_structure"]["structure"]
+    title = next((item["text"] for item in structure if item["type"] == "paragraph" and item["text"]), "")
+    return {
+        "document_path": file_path,
+        "metadata": {"title": title, "fields": visited["fields"]},
+        "structure": structure,
+        "styles": visited["styled_structure"]["styles"],
+    }
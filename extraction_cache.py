@@ -0,0 +1,192 @@
+import collections
+import hashlib
+import json
+import os
+import threading
+
+# 리더/추출 결과 형식이 바뀌면 올려서 예전 캐시를 무효화
+CACHE_VERSION = 6
+
+DEFAULT_CACHE_DIR = os.environ.get("HWP_CACHE_DIR", os.path.join(os.getcwd(), ".hwp_cache"))
+DEFAULT_MAX_BYTES = int(os.environ.get("HWP_CACHE_MAX_MB", "256")) * 1024 * 1024
+# 프로세스 안에 기억해 둘 파일 해시 수 (파일 버전 하나에 하나)
+MEMORY_DIGESTS = int(os.environ.get("HWP_CACHE_MEMORY_DIGESTS", "1024"))
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(file_path):
+    """파일 내용의 SHA-256 (경로나 수정 시각과 무관하게 같은 내용이면 같은 값)"""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    """
+    파일 내용 해시 + 추출 모드를 키로 하는 디스크 캐시.
+    항목 하나가 JSON 파일 하나이며, 파일 수정 시각을 마지막 사용 시각으로 써서
+    전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+    여러 프로세스(배치 추출 등)가 같은 디렉터리를 함께 써도 안전하도록 원자적으로 기록합니다.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = os.path.join(cache_dir or DEFAULT_CACHE_DIR, "extraction")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # (절대경로, 수정시각, 크기) -> 해시. 같은 프로세스에서 같은 파일을 다시 해시하지 않음 (LRU, 최대 MEMORY_DIGESTS개)
+        self._digests = collections.OrderedDict()
+        self._total_bytes = None
+
+    # --- 키 ---
+    def digest(self, file_path):
+        st = os.stat(file_path)
+        stamp = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._digests.get(stamp)
+            if digest is not None:
+                self._digests.move_to_end(stamp)
+                return digest
+        # 해시 계산은 잠금 밖에서 (다른 스레드의 조회를 막지 않도록)
+        digest = file_digest(file_path)
+        with self._lock:
+            self._digests[stamp] = digest
+            self._digests.move_to_end(stamp)
+            while len(self._digests) > MEMORY_DIGESTS:
+                self._digests.popitem(last=False)
+        return digest
+
+    def _entry_path(self, digest, mode):
+        safe_mode = "".join(c if c.isalnum() or c in "-_" else "_" for c in mode)
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.{safe_mode}.v{CACHE_VERSION}.json")
+
+    # --- 조회 / 저장 ---
+    def get(self, file_path, mode):
+        """캐시된 결과를 반환합니다. 없으면 None."""
+        return self.get_by_digest(self.digest(file_path), mode)
+
+    def put(self, file_path, mode, value):
+        self.put_by_digest(self.digest(file_path), mode, value)
+
+    def get_by_digest(self, digest, mode, count=True):
+        """
+        파일 대신 이미 구한 내용 해시(구역 스트림 해시 등)로 조회합니다.
+        count=False면 적중/실패 횟수에 넣지 않습니다. (구역 캐시처럼 따로 세는 경우)
+        """
+        path = self._entry_path(digest, mode)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            if count:
+                with self._lock:
+                    self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: 사용 시각 갱신
+        except OSError:
+            pass
+        if count:
+            with self._lock:
+                self.hits += 1
+        return value
+
+    def put_by_digest(self, digest, mode, value):
+        path = self._entry_path(digest, mode)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data)
+        self._evict_if_needed()
+
+    def get_or_compute(self, file_path, mode, compute):
+        """캐시에 있으면 바로 반환하고, 없으면 compute()로 만든 결과를 저장한 뒤 반환합니다."""
+        value = self.get(file_path, mode)
+        if value is None:
+            value = compute()
+            try:
+                self.put(file_path, mode, value)
+            except (OSError, TypeError, ValueError) as e:
+                # 캐시 기록 실패는 추출 결과에 영향을 주지 않음
+                print(f"⚠️ 추출 캐시 저장 실패: {e}")
+        return value
+
+    # --- 용량 관리 ---
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+        return entries
+
+    def _evict_if_needed(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            if self._total_bytes <= self.max_bytes:
+                return
+            # 다른 프로세스가 추가/삭제했을 수 있으므로 실제 디렉터리 기준으로 다시 계산
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._total_bytes = total
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._total_bytes = 0
+
+    def stats(self):
+        """적중/실패 횟수와 현재 캐시 크기"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 전역 추출 캐시"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+        return _cache
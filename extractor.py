@@ -1,7 +1,58 @@
-import win32com.client as win32
+import argparse
+import functools
+import glob
 import json
 import os
+import queue
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import com_pool
+import doc_visitor
+import extraction_cache
+import hwp5_reader
+import hwpx_reader
+
+try:
+    import win32com.client as win32
+except ImportError:
+    # 한/글이 설치되지 않은 환경(Linux 추출 워커 등)에서는 네이티브 백엔드만 사용
+    win32 = None
+
+BACKENDS = ("auto", "com", "native")
+
+
+def _use_native(backend: str, file_path: str = "") -> bool:
+    """backend 인자에 따라 네이티브(HWP5/HWPX 직접 해석) 경로를 쓸지 결정합니다."""
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드입니다: {backend}")
+    if backend == "auto":
+        # HWPX는 zip+XML이라 네이티브 경로가 가장 빠르므로 항상 직접 해석
+        return win32 is None or hwpx_reader.is_hwpx_file(file_path)
+    if backend == "com" and win32 is None:
+        raise RuntimeError("COM 백엔드를 사용하려면 pywin32와 한/글이 필요합니다")
+    return backend == "native"
+
+def _cached(mode: str):
+    """
+    추출 결과를 파일 내용 해시 기준으로 캐시하는 데코레이터.
+    같은 내용의 파일이면 경로가 달라도 재사용하며, 백엔드(native/com)별로 따로 저장합니다.
+    use_cache=False로 호출하면 이 캐시와 리더의 구역 캐시(section_cache)를 모두 건너뜁니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(file_path: str, backend: str = "auto", use_cache: bool = True) -> dict:
+            if not use_cache or not os.path.exists(file_path):
+                return func(file_path, backend, use_cache)
+            kind = "native" if _use_native(backend, file_path) else "com"
+            result = extraction_cache.get_cache().get_or_compute(
+                file_path, f"{mode}-{kind}", lambda: func(file_path, backend, use_cache))
+            # 같은 내용의 다른 파일에서 저장된 결과일 수 있으므로 경로는 현재 파일로 맞춤
+            result["document_path"] = file_path
+            return result
+        return wrapper
+    return decorator
 
 def get_char_shape(hwp_obj):
     """현재 커서 위치의 글자 모양(서식) 정보를 반환합니다."""
@@ -20,15 +71,27 @@ def get_char_shape(hwp_obj):
 
     return {"font": font_name, "size": height, "bold": bool(is_bold)}
 
-def extract_hwp_structure_with_style(file_path: str) -> dict:
+@_cached("style")
+def extract_hwp_structure_with_style(file_path: str, backend: str = "auto", use_cache: bool = True) -> dict:
     """
     HWP 문서의 구조, 내용, 핵심 서식 정보를 체계적으로 추출합니다.
     """
-    # ... (파일 존재 확인 및 hwp 객체 생성 부분은 이전과 동일) ...
-    hwp = win32.gencache.EnsureDispatch("HWPFrame.HwpObject")
-    hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
-    hwp.Open(file_path)
+    if _use_native(backend, file_path):
+        if hwpx_reader.is_hwpx_file(file_path):
+            return hwpx_reader.extract_hwpx_structure_with_style(file_path, use_cache)
+        return hwp5_reader.extract_hwp_structure_with_style(file_path, use_cache)
+
+    # 글자 모양은 문단마다 CharShape 액션을 부르는 대신 PARA_CHAR_SHAPE 구간에서 한 번에 읽음
+    visited = _native_visit(file_path, doc_visitor.STYLE_COLLECTORS, use_cache)
+    if visited is not None:
+        return doc_visitor.style_result(file_path, visited)
 
+    return com_pool.get_pool().run_document(
+        file_path, lambda hwp: _structure_with_style_com(hwp, file_path))
+
+
+def _structure_with_style_com(hwp, file_path: str) -> dict:
+    """풀에서 빌린 한/글 인스턴스로 문서 구조와 서식을 추출합니다. (문서는 이미 열려 있음)"""
     result = {
         "document_path": file_path,
         "metadata": {"title": "", "fields": {}},
@@ -83,7 +146,6 @@ def extract_hwp_structure_with_style(file_path: str) -> dict:
             result["structure"].append(table_data)
 
     hwp.ReleaseScan() # 스캔 종료
-    hwp.Quit()
     
     # 첫 번째 유의미한 텍스트를 제목으로 설정
     for item in result["structure"]:
@@ -93,278 +155,446 @@ def extract_hwp_structure_with_style(file_path: str) -> dict:
 
     return result
 
-def extract_hwp_structure(file_path: str) -> dict:
+
+@_cached("structure")
+def extract_hwp_structure(file_path: str, backend: str = "auto", use_cache: bool = True) -> dict:
     """
     HWP 문서의 양식 구조와 내용을 체계적으로 추출하여 JSON 호환 딕셔너리로 반환합니다.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+    if _use_native(backend, file_path):
+        if hwpx_reader.is_hwpx_file(file_path):
+            return hwpx_reader.extract_hwpx_structure(file_path, use_cache)
+        return hwp5_reader.extract_hwp_structure(file_path, use_cache)
 
-    hwp = None
-    try:
-        hwp = win32.gencache.EnsureDispatch("HWPFrame.HwpObject")
-        hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
-        hwp.Open(file_path)
-        
-        result = {
-            "document_path": file_path,
-            "document_title": "",
-            "paragraphs": [],
-            "fields": {},
-            "tables": []
-        }
-
-        # --- 1. 문서 제목 추출 ---
-        try:
-            result["document_title"] = hwp.GetFieldText("제목").strip()
-        except Exception:
-            try:
-                hwp.SetPos(2, 0, 0)
-                act = hwp.CreateAction("GetPos")
-                p_set = act.CreateSet()
-                act.Execute(p_set)
-                result["document_title"] = p_set.Item("ParaText").split('\r\n')[0].strip()
-            except Exception:
-                result["document_title"] = "제목을 찾을 수 없음"
-
-        # --- 2. 누름틀 (Field) 정보 추출 ---
-        try:
-            field_list_raw = hwp.GetFieldList(1, "누름틀")
-            if field_list_raw:
-                for field_name in field_list_raw.split("\x02"):
-                    if field_name:
-                        try:
-                            field_text = hwp.GetFieldText(field_name)
-                            result["fields"][field_name] = field_text.strip()
-                        except Exception:
-                            result["fields"][field_name] = "[값 추출 오류]"
-        except Exception:
-            result["fields"] = {}
-        
-        # --- 3. 표(Table) 정보 추출 (수정된 로직) ---
-        ctrl = hwp.HeadCtrl
-        table_index = 0
-        
-        while ctrl:
-            if ctrl.CtrlID == "tbl":
-                table_data = { 
-                    "table_index": table_index, 
-                    "description": f"표 {table_index + 1}",
-                    "cells": [] 
-                }
-                
-                try:
-                    # 표의 위치로 커서 이동
-                    hwp.SetPosBySet(ctrl.GetAnchorPos(0))
-                    
-                    # 표 선택하기
-                    hwp.Run("ShapeObjSelect")
-                    
-                    # 표 속성 정보를 얻기 위한 액션 생성
-                    act = hwp.CreateAction("TablePropertyDialog")
-                    p_set = act.CreateSet()
-                    act.GetDefault(p_set)
-                    
-                    # 행과 열 개수 추출
-                    rows = p_set.Item("Rows") if p_set.Item("Rows") else 0
-                    cols = p_set.Item("Cols") if p_set.Item("Cols") else 0
-                    
-                    # 간단한 표 정보만 기록 (실제 셀 내용은 전체 텍스트에서 파악 가능)
-                    table_data["rows"] = rows
-                    table_data["cols"] = cols
-                    table_data["cells"] = f"표 크기: {rows}행 {cols}열"
-                    
-                    result["tables"].append(table_data)
-                    table_index += 1
-                    
-                except Exception as e:
-                    # 표 세부 정보 추출 실패 시, 최소한 표 존재 정보는 기록
-                    table_data["rows"] = "알 수 없음"
-                    table_data["cols"] = "알 수 없음"  
-                    table_data["cells"] = f"표 {table_index + 1} 감지됨 (세부 정보 추출 실패)"
-                    result["tables"].append(table_data)
-                    table_index += 1
+    return com_pool.get_pool().run_document(
+        file_path, lambda hwp: _structure_com(hwp, file_path, use_cache))
 
-            ctrl = ctrl.Next
 
-        # --- 4. 일반 문단 텍스트 추출 ---
-        text_content = hwp.GetTextFile("TEXT", "")
-        result["paragraphs"] = [p.strip() for p in text_content.split('\r\n') if p.strip()]
+def _structure_com(hwp, file_path: str, use_cache: bool = True) -> dict:
+    """풀에서 빌린 한/글 인스턴스로 양식 구조를 추출합니다. (문서는 이미 열려 있음)"""
+    return doc_visitor.structure_result(
+        file_path, _visit_com(hwp, doc_visitor.STRUCTURE_COLLECTORS, file_path, use_cache))
 
-    finally:
-        if hwp:
-            hwp.Quit()
-            
-    return result
 
-def extract_hwp_with_formatting(file_path: str) -> dict:
+@_cached("formatting")
+def extract_hwp_with_formatting(file_path: str, backend: str = "auto", use_cache: bool = True) -> dict:
     """
     HWP 문서의 내용과 서식 정보를 모두 추출합니다.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+    if _use_native(backend, file_path):
+        if hwpx_reader.is_hwpx_file(file_path):
+            return hwpx_reader.extract_hwpx_with_formatting(file_path, use_cache)
+        return hwp5_reader.extract_hwp_with_formatting(file_path, use_cache)
+
+    return com_pool.get_pool().run_document(
+        file_path, lambda hwp: _formatting_com(hwp, file_path, use_cache))
+
+
+def _formatting_com(hwp, file_path: str, use_cache: bool = True) -> dict:
+    """풀에서 빌린 한/글 인스턴스로 내용과 서식을 추출합니다. (문서는 이미 열려 있음)"""
+    return doc_visitor.formatting_result(
+        file_path, _visit_com(hwp, doc_visitor.FORMATTING_COLLECTORS, file_path, use_cache))
+
+
+# COM 경로에서 지원하는 수집기 (doc_visitor.COLLECTORS의 일부)
+COM_COLLECTORS = ("title", "paragraphs", "full_text", "fields", "tables", "fonts", "formats")
 
-    hwp = None
+
+def _visit_com(hwp, collectors, file_path: str = None, use_cache: bool = True) -> dict:
+    """
+    열려 있는 문서에서 요청한 항목만 모읍니다.
+    본문 텍스트와 누름틀은 한 번씩만 읽어 제목 등 여러 항목이 함께 사용합니다.
+    file_path를 주면 표는 COM 대신 파일의 TABLE/LIST_HEADER 레코드에서 직접 읽습니다.
+    """
+    wanted = set(collectors)
+    unsupported = wanted - set(COM_COLLECTORS)
+    if unsupported:
+        raise ValueError(f"COM 백엔드에서 지원하지 않는 수집기입니다: {', '.join(sorted(unsupported))}")
+
+    visited = {}
+    if wanted & {"paragraphs", "full_text", "title"}:
+        text_content = hwp.GetTextFile("TEXT", "")
+        lines = [p.strip() for p in text_content.split('\r\n') if p.strip()]
+        if "paragraphs" in wanted:
+            visited["paragraphs"] = lines
+        if "full_text" in wanted:
+            visited["full_text"] = text_content
+    if wanted & {"fields", "title"}:
+        fields = _fields_com(hwp)
+        if "fields" in wanted:
+            visited["fields"] = fields
+    if "title" in wanted:
+        # '제목' 누름틀이 없으면 첫 번째 비어 있지 않은 줄 (SetPos/GetPos 왕복 없이 본문에서 구함)
+        visited["title"] = fields.get("제목") or (lines[0] if lines else "")
+    # 표 / 글꼴 / 서식은 파일의 TABLE, DocInfo 표에서 직접 읽는 편이 빠르고 빠짐없음 (실패 시 COM)
+    native_wanted = [name for name in ("tables", "fonts", "formats") if name in wanted]
+    native = _native_visit(file_path, native_wanted, use_cache) if file_path and native_wanted else None
+    if native is not None:
+        visited.update(native)
+    else:
+        if "tables" in wanted:
+            visited["tables"] = _tables_com(hwp)
+        if "fonts" in wanted:
+            visited["fonts"] = _fonts_com(hwp)
+        if "formats" in wanted:
+            visited["formats"] = _format_samples_com(hwp)
+    return visited
+
+
+def _fields_com(hwp) -> dict:
+    """누름틀 이름 → 값. 값은 \\x02로 이어 붙인 이름으로 한 번에 가져옵니다."""
     try:
-        hwp = win32.gencache.EnsureDispatch("HWPFrame.HwpObject")
-        hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
-        hwp.Open(file_path)
-        
-        result = {
-            "document_path": file_path,
-            "document_title": "",
-            "paragraphs": [],
-            "fields": {},
-            "tables": [],
-            "formatting_info": {
-                "fonts_used": [],
-                "paragraph_formats": [],
-                "character_formats": []
-            }
-        }
+        field_list_raw = hwp.GetFieldList(1, "누름틀")
+    except Exception:
+        return {}
+    names = [name for name in (field_list_raw or "").split("\x02") if name]
+    if not names:
+        return {}
+
+    try:
+        values = hwp.GetFieldText("\x02".join(names)).split("\x02")
+    except Exception:
+        values = []
+    if len(values) >= len(names):
+        return {name: value.strip() for name, value in zip(names, values)}
 
-        # --- 1. 문서 제목 추출 ---
+    # 한 번에 가져오지 못하면 필드별로 다시 시도
+    fields = {}
+    for field_name in names:
         try:
-            result["document_title"] = hwp.GetFieldText("제목").strip()
+            fields[field_name] = hwp.GetFieldText(field_name).strip()
         except Exception:
+            fields[field_name] = "[값 추출 오류]"
+    return fields
+
+
+def _native_visit(file_path: str, collectors, use_cache: bool = True):
+    """
+    COM 백엔드에서도 파일에서 직접 읽는 편이 훨씬 빠른 항목(표, 서식 표, 글자 모양 구간)을 네이티브로 모읍니다.
+    읽을 수 없는 형식이면 None을 반환해 COM 경로를 쓰게 합니다.
+    """
+    try:
+        reader_file = hwpx_reader.HwpxFile if hwpx_reader.is_hwpx_file(file_path) else hwp5_reader.Hwp5File
+        with reader_file(file_path) as doc:
+            return doc.visit(collectors, use_cache)
+    except Exception as e:
+        print(f"⚠️ 문서를 직접 읽지 못해 COM으로 추출합니다: {e}", file=sys.stderr)
+        return None
+
+
+def _tables_com(hwp) -> list:
+    """HeadCtrl 목록을 따라가며 표마다 행/열 수를 구합니다."""
+    tables = []
+    ctrl = hwp.HeadCtrl
+    table_index = 0
+
+    while ctrl:
+        if ctrl.CtrlID == "tbl":
+            table_data = {
+                "table_index": table_index,
+                "description": f"표 {table_index + 1}",
+                "cells": []
+            }
+
             try:
-                hwp.SetPos(2, 0, 0)
-                act = hwp.CreateAction("GetPos")
+                # 표의 위치로 커서 이동
+                hwp.SetPosBySet(ctrl.GetAnchorPos(0))
+
+                # 표 선택하기
+                hwp.Run("ShapeObjSelect")
+
+                # 표 속성 정보를 얻기 위한 액션 생성
+                act = hwp.CreateAction("TablePropertyDialog")
                 p_set = act.CreateSet()
-                act.Execute(p_set)
-                result["document_title"] = p_set.Item("ParaText").split('\r\n')[0].strip()
+                act.GetDefault(p_set)
+
+                # 행과 열 개수 추출
+                rows = p_set.Item("Rows") if p_set.Item("Rows") else 0
+                cols = p_set.Item("Cols") if p_set.Item("Cols") else 0
+
+                # 간단한 표 정보만 기록 (실제 셀 내용은 전체 텍스트에서 파악 가능)
+                table_data["rows"] = rows
+                table_data["cols"] = cols
+                table_data["cells"] = f"표 크기: {rows}행 {cols}열"
+
             except Exception:
-                result["document_title"] = "제목을 찾을 수 없음"
+                # 표 세부 정보 추출 실패 시, 최소한 표 존재 정보는 기록
+                table_data["rows"] = "알 수 없음"
+                table_data["cols"] = "알 수 없음"
+                table_data["cells"] = f"표 {table_index + 1} 감지됨 (세부 정보 추출 실패)"
+
+            tables.append(table_data)
+            table_index += 1
+
+        ctrl = ctrl.Next
+    return tables
+
+
+def _fonts_com(hwp) -> list:
+    """문서에 사용된 폰트 목록"""
+    try:
+        fonts = set()
+        for i in range(1, hwp.XHwpDocuments.Count + 1):
+            doc = hwp.XHwpDocuments[i]
+            for j in range(1, doc.XHwpXFont.Count + 1):
+                font = doc.XHwpXFont.Item(j).Name
+                if font:
+                    fonts.add(font)
+        return list(fonts)
+    except Exception:
+        return ["폰트 정보 추출 실패"]
 
-        # --- 2. 누름틀 (Field) 정보 추출 ---
+
+def _format_samples_com(hwp) -> dict:
+    """몇 개의 샘플 위치에서 글자 / 문단 서식 정보를 추출합니다."""
+    formats = {"character_formats": [], "paragraph_formats": []}
+    hwp.SetPos(2, 0, 0)  # 문서 시작으로 이동
+
+    for pos in doc_visitor.SAMPLE_POSITIONS:
         try:
-            field_list_raw = hwp.GetFieldList(1, "누름틀")
-            if field_list_raw:
-                for field_name in field_list_raw.split("\x02"):
-                    if field_name:
-                        try:
-                            field_text = hwp.GetFieldText(field_name)
-                            result["fields"][field_name] = field_text.strip()
-                        except Exception:
-                            result["fields"][field_name] = "[값 추출 오류]"
+            hwp.SetPos(2, pos, pos)
+
+            char_format = {
+                "position": pos,
+                "font_name": hwp.CharShape.Item("FaceNameUser"),
+                "font_size": hwp.CharShape.Item("Height") / 100.0,
+                "is_bold": hwp.CharShape.Item("Bold"),
+                "is_italic": hwp.CharShape.Item("Italic"),
+                "underline": hwp.CharShape.Item("Underline")
+            }
+
+            para_format = {
+                "position": pos,
+                "alignment": hwp.ParaShape.Item("Align"),
+                "left_margin": hwp.ParaShape.Item("LeftMargin"),
+                "line_spacing": hwp.ParaShape.Item("LineSpacing")
+            }
+
+            formats["character_formats"].append(char_format)
+            formats["paragraph_formats"].append(para_format)
+
         except Exception:
-            result["fields"] = {}
-        
-        # --- 3. 표(Table) 정보 추출 (수정된 로직) ---
-        ctrl = hwp.HeadCtrl
-        table_index = 0
-        
-        while ctrl:
-            if ctrl.CtrlID == "tbl":
-                table_data = { 
-                    "table_index": table_index, 
-                    "description": f"표 {table_index + 1}",
-                    "cells": [] 
-                }
-                
-                try:
-                    # 표의 위치로 커서 이동
-                    hwp.SetPosBySet(ctrl.GetAnchorPos(0))
-                    
-                    # 표 선택하기
-                    hwp.Run("ShapeObjSelect")
-                    
-                    # 표 속성 정보를 얻기 위한 액션 생성
-                    act = hwp.CreateAction("TablePropertyDialog")
-                    p_set = act.CreateSet()
-                    act.GetDefault(p_set)
-                    
-                    # 행과 열 개수 추출
-                    rows = p_set.Item("Rows") if p_set.Item("Rows") else 0
-                    cols = p_set.Item("Cols") if p_set.Item("Cols") else 0
-                    
-                    # 간단한 표 정보만 기록 (실제 셀 내용은 전체 텍스트에서 파악 가능)
-                    table_data["rows"] = rows
-                    table_data["cols"] = cols
-                    table_data["cells"] = f"표 크기: {rows}행 {cols}열"
-                    
-                    result["tables"].append(table_data)
-                    table_index += 1
-                    
-                except Exception as e:
-                    # 표 세부 정보 추출 실패 시, 최소한 표 존재 정보는 기록
-                    table_data["rows"] = "알 수 없음"
-                    table_data["cols"] = "알 수 없음"  
-                    table_data["cells"] = f"표 {table_index + 1} 감지됨 (세부 정보 추출 실패)"
-                    result["tables"].append(table_data)
-                    table_index += 1
+            continue
+    return formats
 
-            ctrl = ctrl.Next
 
-        # --- 서식 정보 추출 ---
-        
-        # 1. 문서에 사용된 폰트 목록 추출
+def visit_document(file_path: str, collectors, backend: str = "auto", use_cache: bool = True) -> dict:
+    """
+    필요한 수집기만 골라 문서를 한 번 순회합니다.
+    예: visit_document("a.hwp", ["title", "fields"]) -> {"title": ..., "fields": {...}}
+
+    수집기 이름은 doc_visitor.COLLECTORS 참고 (doc_visitor.register_collector로 추가 가능).
+    COM 백엔드는 COM_COLLECTORS만 지원합니다. use_cache=False면 구역 캐시를 쓰지 않습니다.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+    if _use_native(backend, file_path):
+        reader_file = hwpx_reader.HwpxFile if hwpx_reader.is_hwpx_file(file_path) else hwp5_reader.Hwp5File
+        with reader_file(file_path) as doc:
+            return doc.visit(collectors, use_cache)
+    return com_pool.get_pool().run_document(
+        file_path, lambda hwp: _visit_com(hwp, collectors, file_path, use_cache))
+
+
+def iter_hwp_elements(file_path: str, backend: str = "auto"):
+    """
+    문서 요소(문단, 표, 누름틀)를 파싱되는 즉시 하나씩 반환하는 제너레이터.
+    전체 결과를 메모리에 모으지 않으므로 큰 문서도 일정한 메모리로 처리합니다.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+    if _use_native(backend, file_path):
+        if hwpx_reader.is_hwpx_file(file_path):
+            yield from hwpx_reader.iter_elements(file_path)
+        else:
+            yield from hwp5_reader.iter_elements(file_path)
+        return
+
+    # COM 객체는 풀 스레드에서만 다룰 수 있으므로, 그 스레드가 요소를 큐에 넣고 여기서 꺼내 반환
+    elements = queue.Queue()
+    done = object()
+
+    def scan(hwp):
         try:
-            fonts = set()
-            for i in range(1, hwp.XHwpDocuments.Count + 1):
-                doc = hwp.XHwpDocuments[i]
-                for j in range(1, doc.XHwpXFont.Count + 1):
-                    font = doc.XHwpXFont.Item(j).Name
-                    if font:
-                        fonts.add(font)
-            result["formatting_info"]["fonts_used"] = list(fonts)
-        except Exception:
-            result["formatting_info"]["fonts_used"] = ["폰트 정보 추출 실패"]
+            _scan_elements_com(hwp, elements.put)
+        finally:
+            elements.put(done)
 
-        # 2. 문서를 순회하며 각 위치의 서식 정보 샘플링
-        hwp.SetPos(2, 0, 0)  # 문서 시작으로 이동
-        
-        # 몇 개의 샘플 위치에서 서식 정보 추출
-        sample_positions = [0, 100, 200, 500, 1000]  # 문자 위치 샘플
-        
-        for pos in sample_positions:
-            try:
-                hwp.SetPos(2, pos, pos)
-                
-                char_format = {
-                    "position": pos,
-                    "font_name": hwp.CharShape.Item("FaceNameUser"),
-                    "font_size": hwp.CharShape.Item("Height") / 100.0,
-                    "is_bold": hwp.CharShape.Item("Bold"),
-                    "is_italic": hwp.CharShape.Item("Italic"),
-                    "underline": hwp.CharShape.Item("Underline")
-                }
-                
-                para_format = {
-                    "position": pos,
-                    "alignment": hwp.ParaShape.Item("Align"),
-                    "left_margin": hwp.ParaShape.Item("LeftMargin"),
-                    "line_spacing": hwp.ParaShape.Item("LineSpacing")
-                }
-                
-                result["formatting_info"]["character_formats"].append(char_format)
-                result["formatting_info"]["paragraph_formats"].append(para_format)
-                
-            except Exception:
-                continue
+    future = com_pool.get_pool().submit_document(file_path, scan)
+    while True:
+        element = elements.get()
+        if element is done:
+            break
+        yield element
+    future.result()  # 작업 중 발생한 예외를 호출한 쪽으로 전달
 
-        # 기존 텍스트 추출 코드
-        text_content = hwp.GetTextFile("TEXT", "")
-        result["paragraphs"] = [p.strip() for p in text_content.split('\r\n') if p.strip()]
 
+def _scan_elements_com(hwp, emit):
+    """열려 있는 문서의 문단과 누름틀을 하나씩 emit으로 전달합니다."""
+    # 문단은 GetText로 한 덩어리씩 받아 바로 내보냄
+    index = 0
+    hwp.InitScan()
+    try:
+        while True:
+            ret, text = hwp.GetText()
+            if ret == 0:
+                break
+            emit({"type": "paragraph", "section": 0, "index": index, "text": text.strip()})
+            index += 1
     finally:
-        if hwp:
-            hwp.Quit()
-            
+        hwp.ReleaseScan()
+
+    field_list_raw = hwp.GetFieldList(1, "누름틀")
+    for field_name in (field_list_raw or "").split("\x02"):
+        if field_name:
+            emit({"type": "field", "section": 0, "index": -1,
+                  "name": field_name, "value": hwp.GetFieldText(field_name).strip()})
+
+
+# --- 배치 모드: 디렉터리/글롭 단위로 여러 파일을 프로세스 풀에서 동시에 추출 ---
+
+HWP_EXTENSIONS = (".hwp", ".hwpx")
+
+EXTRACT_MODES = {
+    "formatting": extract_hwp_with_formatting,
+    "structure": extract_hwp_structure,
+    "style": extract_hwp_structure_with_style,
+}
+
+
+def collect_batch_files(patterns) -> list:
+    """디렉터리(하위 폴더 포함), 글롭, 파일 경로를 HWP/HWPX 파일 목록으로 펼칩니다."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, names in os.walk(pattern):
+                dirs.sort()
+                files.extend(os.path.join(root, n) for n in sorted(names))
+        elif glob.has_magic(pattern):
+            files.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            files.append(pattern)
+
+    # 중복 제거 (처음 나온 순서 유지), 한/글 파일만 남김
+    seen = set()
+    result = []
+    for path in files:
+        key = os.path.abspath(path)
+        if key in seen or not path.lower().endswith(HWP_EXTENSIONS):
+            continue
+        seen.add(key)
+        result.append(path)
     return result
 
 
+def _init_batch_worker(pool_size: int):
+    # 워커 프로세스마다 한/글을 여러 개 띄우지 않도록 COM 풀 크기를 제한 (기본 1개)
+    com_pool.DEFAULT_POOL_SIZE = pool_size
+
+
+def _extract_batch_file(file_path: str, mode: str, backend: str, use_cache: bool = True) -> dict:
+    """파일 하나를 추출해 JSONL 한 줄에 들어갈 레코드를 만듭니다. 예외는 레코드에 기록합니다."""
+    started = time.perf_counter()
+    record = {"path": file_path, "mode": mode, "ok": True}
+    try:
+        record["result"] = EXTRACT_MODES[mode](file_path, backend=backend, use_cache=use_cache)
+    except Exception as e:
+        record["ok"] = False
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return record
+
+
+def run_batch(patterns, output=None, mode: str = "formatting", backend: str = "auto",
+              workers: int = None, pool_size: int = 1, use_cache: bool = True) -> dict:
+    """
+    여러 문서를 프로세스 풀에서 추출해 파일마다 JSONL 레코드 한 줄씩 기록합니다.
+    레코드는 끝나는 순서대로 기록되며, 실패한 파일도 error와 함께 남습니다.
+    워커 프로세스가 죽어(BrokenProcessPool 등) 결과를 받지 못한 파일도 실패 레코드로 남기고 계속합니다.
+
+    Returns:
+        dict: {"total", "succeeded", "failed", "elapsed_ms"}
+    """
+    if mode not in EXTRACT_MODES:
+        raise ValueError(f"알 수 없는 추출 모드입니다: {mode}")
+    files = collect_batch_files(patterns)
+    summary = {"total": len(files), "succeeded": 0, "failed": 0}
+    started = time.perf_counter()
+
+    out = open(output, "w", encoding="utf-8") if output else sys.stdout
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(pool_size,)) as executor:
+            futures = {executor.submit(_extract_batch_file, path, mode, backend, use_cache): path
+                       for path in files}
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except Exception as e:
+                    record = {"path": futures[future], "mode": mode, "ok": False,
+                              "error": f"{type(e).__name__}: {e}",
+                              "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+                summary["succeeded" if record["ok"] else "failed"] += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if output:
+            out.close()
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return summary
+
+
 if __name__ == '__main__':
     # 스크립트 실행 시 첫 번째 인자로 파일 경로를 받음
-    if len(sys.argv) < 2:
-        print("사용법: python extractor.py \"<HWP 파일 경로>\"", file=sys.stderr)
-        sys.exit(1)
-        
-    # 첫 번째 인자(sys.argv[1])를 파일 경로로 사용
-    hwp_file_path = sys.argv[1] 
-    
+    parser = argparse.ArgumentParser(description="HWP 문서 구조/서식 추출기")
+    parser.add_argument("hwp_file_path", nargs="+",
+                        help="HWP/HWPX 파일 경로 (--batch에서는 디렉터리나 글롭도 여러 개 가능)")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="auto: pywin32가 없으면 네이티브, com: 한/글 COM, native: HWP5 직접 해석")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="요소(문단/표/누름틀)를 파싱되는 즉시 한 줄에 하나씩 JSON으로 출력")
+    parser.add_argument("--pool-size", type=int, default=None,
+                        help="COM 백엔드에서 미리 띄워 둘 한/글 인스턴스 수 (기본: HWP_COM_POOL_SIZE 또는 2)")
+    parser.add_argument("--batch", action="store_true",
+                        help="여러 파일을 프로세스 풀로 동시에 추출해 파일마다 JSONL 한 줄씩 출력")
+    parser.add_argument("--mode", choices=EXTRACT_MODES, default="formatting",
+                        help="배치 모드에서 사용할 추출 함수")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="배치 모드 워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="배치 결과 JSONL 파일 경로 (기본: 표준 출력)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="추출 캐시를 사용하지 않고 항상 새로 추출")
+    args = parser.parse_args()
+
+    if args.batch:
+        summary = run_batch(args.hwp_file_path, output=args.output, mode=args.mode,
+                            backend=args.backend, workers=args.workers, pool_size=args.pool_size or 1,
+                            use_cache=not args.no_cache)
+        print(f"✅ 배치 추출 완료: 전체 {summary['total']}개, 성공 {summary['succeeded']}개, "
+              f"실패 {summary['failed']}개 ({summary['elapsed_ms'] / 1000:.1f}초)", file=sys.stderr)
+        sys.exit(1 if summary["failed"] else 0)
+
+    if len(args.hwp_file_path) > 1:
+        parser.error("여러 파일을 처리하려면 --batch 옵션을 사용하세요")
+    hwp_file_path = args.hwp_file_path[0]
+
     try:
-        document_structure = extract_hwp_with_formatting(hwp_file_path)
+        # --backend com인데 pywin32가 없으면 _use_native가 RuntimeError를 내므로 try 안에서 확인
+        if args.pool_size and not _use_native(args.backend, hwp_file_path):
+            com_pool.configure_pool(size=args.pool_size)
+        if args.ndjson:
+            for element in iter_hwp_elements(hwp_file_path, backend=args.backend):
+                print(json.dumps(element, ensure_ascii=False), flush=True)
+            sys.exit(0)
+
+        document_structure = extract_hwp_with_formatting(hwp_file_path, backend=args.backend,
+                                                         use_cache=not args.no_cache)
         print(json.dumps(document_structure, ensure_ascii=False, indent=2))
         
     except FileNotFoundError as e:
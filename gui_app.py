@@ -2,9 +2,15 @@ import customtkinter as ctk
 import threading
 import json
 import os
+import queue
+import time
 import traceback
 from tkinter import filedialog, messagebox
-from hwp_assistant import HWPAssistant  # 기존 클래스
+import com_worker
+import template_index
+
+# 스트리밍 응답을 결과 창에 옮겨 그리는 간격(ms)
+STREAM_POLL_MS = 30
 
 
 class ErrorHandler:
@@ -33,8 +39,10 @@ class MainApp(ctk.CTk):
         # 기본 설정
         self.title("HWP AI 어시스턴트 v3.0 통합 GUI")
         self.geometry("800x700")
-        self.assistant = HWPAssistant()
+        # HWPAssistant는 한/글 COM을 소유하는 작업 프로세스에서 실행 (GUI는 Future를 after()로 확인)
+        self.assistant = com_worker.AssistantWorker()
         self.current_file = ""
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # GUI 초기화
         self._setup_gui()
@@ -151,6 +159,10 @@ class MainApp(ctk.CTk):
         log_frame = ctk.CTkFrame(self)
         log_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
+        self.llm_cache_var = ctk.BooleanVar(value=self.assistant.use_llm_cache)
+        ctk.CTkCheckBox(log_frame, text="AI 응답 캐시 사용", variable=self.llm_cache_var,
+                        command=self._toggle_llm_cache).pack(side="top", anchor="e", padx=10, pady=(5, 0))
+
         ctk.CTkLabel(log_frame, text="📋 작업 로그", 
                     font=ctk.CTkFont(size=16, weight="bold")).pack(pady=5)
         
@@ -163,11 +175,33 @@ class MainApp(ctk.CTk):
         self.log_textbox.see("end")
         self.update_idletasks()
         
-    def _run_in_thread(self, target_func):
-        """GUI 블로킹 방지를 위한 스레드 실행"""
-        thread = threading.Thread(target=target_func)
-        thread.daemon = True
-        thread.start()
+    def _toggle_llm_cache(self):
+        """AI 응답 캐시 사용 여부 전환 (끄면 항상 새로 호출)"""
+        self.assistant.use_llm_cache = self.llm_cache_var.get()
+        self.log(f"💾 AI 응답 캐시 {'사용' if self.assistant.use_llm_cache else '건너뜀'}")
+
+    def log_llm_cache(self):
+        """마지막 AI 호출의 캐시 적중 여부와 누적 적중률 기록"""
+        status = {"hit": "적중", "miss": "새로 호출", "bypass": "건너뜀"}.get(self.assistant.last_llm_cache)
+        if status:
+            self.log(f"💾 AI 응답 캐시 {status} - {self.assistant.llm_cache_summary}")
+
+    def run_async(self, method, *args, on_done=None, on_error=None, **kwargs):
+        """
+        HWPAssistant.<method>를 작업 프로세스에서 실행하고, 끝나면 메인 스레드에서 on_done(결과)를 호출합니다.
+        실패(한/글 오류, 작업 프로세스 종료 포함)하면 on_error(예외), 없으면 로그만 남깁니다.
+        """
+        future = self.assistant.submit(method, *args, **kwargs)
+        com_worker.poll_future(self, future, on_done or (lambda result: None),
+                               on_error or (lambda e: self.log(f"❌ 작업 실패 ({method}): {e}")))
+        return future
+
+    def _on_close(self):
+        """창을 닫을 때 작업 프로세스(한/글 포함)도 종료"""
+        try:
+            self.assistant.shutdown()
+        finally:
+            self.destroy()
 
     @ErrorHandler.handle_error
     def _open_file(self):
@@ -178,32 +212,39 @@ class MainApp(ctk.CTk):
         )
         
         if file_path:
-            try:
-                self._show_progress("📂 파일을 열고 있습니다...")
-                
-                if self.assistant.open_file(file_path):
+            self._show_progress("📂 파일을 열고 있습니다...")
+            self.open_button.configure(state="disabled")
+
+            def opened(ok):
+                self.open_button.configure(state="normal")
+                if ok:
                     self.current_file = file_path
                     filename = os.path.basename(file_path)
                     self.file_status.configure(text=f"열림: {filename}")
                     self.log(f"✅ 파일 열기 성공: {filename}")
                 else:
                     self.log("❌ 파일 열기 실패")
-            except Exception as e:
+
+            def failed(e):
+                self.open_button.configure(state="normal")
                 self.log(f"❌ 파일 열기 오류: {e}")
 
+            self.run_async("open_file", file_path, on_done=opened, on_error=failed)
+
     @ErrorHandler.handle_error    
     def _close_file(self):
-        """파일 닫기 - 메인 스레드 직접 실행"""
-        try:
-            if self.assistant.is_opened:
-                self.assistant.close_file()
-                self.current_file = ""
-                self.file_status.configure(text="파일이 열리지 않음")
-                self.log("📁 파일이 닫혔습니다")
-            else:
-                self.log("⚠️ 열린 파일이 없습니다")
-        except Exception as e:
-            self.log(f"❌ 파일 닫기 오류: {e}")
+        """파일 닫기"""
+        if not self.assistant.is_opened:
+            self.log("⚠️ 열린 파일이 없습니다")
+            return
+
+        def closed(_):
+            self.current_file = ""
+            self.file_status.configure(text="파일이 열리지 않음")
+            self.log("📁 파일이 닫혔습니다")
+
+        self.run_async("close_file", on_done=closed,
+                       on_error=lambda e: self.log(f"❌ 파일 닫기 오류: {e}"))
 
     def _show_progress(self, message):
         """진행 상황 표시"""
@@ -211,7 +252,7 @@ class MainApp(ctk.CTk):
         self.update()  # GUI 즉시 업데이트
 
     def _modify_selected_text(self):
-        """✨ 완전히 메인 스레드에서 실행되는 텍스트 수정"""
+        """✨ 선택 텍스트 수정 (한/글·Gemini 작업은 작업 프로세스에서, GUI는 결과만 받아 그림)"""
         if not self.assistant.is_opened:
             self.log("⚠️ 먼저 파일을 열어주세요")
             return
@@ -223,44 +264,43 @@ class MainApp(ctk.CTk):
 
         # 버튼 비활성화 (중복 실행 방지)
         self.modify_button.configure(state="disabled", text="처리 중...")
-        
-        try:
-            # 1단계: 선택된 텍스트 가져오기 (메인 스레드)
-            self._show_progress("📌 선택된 텍스트를 가져오는 중...")
-            selected_text = self.assistant.get_selected_text()
-            
+
+        def restore_button():
+            self.modify_button.configure(state="normal", text="선택된 텍스트 수정")
+
+        def on_selected(selected_text):
+            restore_button()
             if not selected_text:
                 self.log("⚠️ 텍스트를 선택해주세요")
                 return
                 
             self._show_progress(f"📝 선택된 텍스트: '{selected_text[:50]}...'")
             
-            # 2단계: AI 처리 (메인 스레드에서 블로킹 실행)
+            # 2단계: AI 처리 요청
             context = self.context_entry.get().strip()
             full_request = f"{request} {context}".strip()
             
-            self._show_progress("🤖 AI가 텍스트를 분석하고 있습니다... (잠시만 기다려주세요)")
-            
-            # ✨ 핵심: 메인 스레드에서 블로킹 실행 (스레드 사용 안 함)
-            modified_text = self.assistant.call_gemini(full_request, selected_text)
+            self._show_progress("🤖 AI가 텍스트를 작성하고 있습니다... (결과 창에 실시간으로 표시됩니다)")
             
-            if not modified_text:
-                self.log("❌ AI 수정 실패")
-                return
-                
-            self._show_progress("✅ AI 수정 완료")
+            # ✨ 스트리밍: 응답 조각을 받는 대로 결과 창에 표시 (백그라운드 스레드에서 수신)
+            stream = self.assistant.stream("call_gemini", full_request, selected_text, stream=True)
             
             # 3단계: 결과 확인 및 적용
-            self._show_modification_result(modified_text, selected_text)
-            
-        except Exception as e:
+            self._show_modification_result(None, selected_text, stream=stream)
+
+        def on_error(e):
+            restore_button()
             self.log(f"❌ 처리 오류: {e}")
-        finally:
-            # 버튼 재활성화
-            self.modify_button.configure(state="normal", text="선택된 텍스트 수정")
 
-    def _show_modification_result(self, modified_text, original_text):
-        """수정 결과 확인 창"""
+        # 1단계: 선택된 텍스트 가져오기
+        self._show_progress("📌 선택된 텍스트를 가져오는 중...")
+        self.run_async("get_selected_text", on_done=on_selected, on_error=on_error)
+
+    def _show_modification_result(self, modified_text, original_text, stream=None):
+        """
+        수정 결과 확인 창.
+        stream(응답 조각 제너레이터)을 주면 도착하는 대로 결과를 그리고, 중지 버튼으로 생성을 취소할 수 있습니다.
+        """
         result_window = ctk.CTkToplevel(self)
         result_window.title("수정 결과 확인")
         result_window.geometry("700x600")
@@ -281,79 +321,175 @@ class MainApp(ctk.CTk):
         
         result_box = ctk.CTkTextbox(result_window, height=200)
         result_box.pack(fill="x", padx=20, pady=5)
-        result_box.insert("0.0", modified_text)
+        if modified_text:
+            result_box.insert("0.0", modified_text)
+
+        status_label = ctk.CTkLabel(result_window, text="")
+        status_label.pack(pady=2)
         
         # 버튼
         button_frame = ctk.CTkFrame(result_window)
         button_frame.pack(fill="x", padx=20, pady=10)
+
+        cancel_event = threading.Event()
         
         def apply_changes():
-            """✨ 메인 스레드에서 직접 텍스트 교체"""
-            try:
-                final_text = result_box.get("0.0", "end-1c")
-                
-                self.log("🔄 텍스트를 교체하고 있습니다...")
-                
-                # COM 작업을 메인 스레드에서 직접 실행
-                if self.assistant.replace_selected_text(final_text):
+            """✨ 작업 프로세스에서 텍스트 교체"""
+            final_text = result_box.get("0.0", "end-1c")
+            self.log("🔄 텍스트를 교체하고 있습니다...")
+            apply_button.configure(state="disabled")
+
+            def replaced(ok):
+                if ok:
                     self.log("✅ 텍스트 교체 성공!")
                     result_window.destroy()
                 else:
+                    apply_button.configure(state="normal")
                     self.log("❌ 텍스트 교체 실패")
-            except Exception as e:
+
+            def failed(e):
+                apply_button.configure(state="normal")
                 self.log(f"❌ 교체 오류: {e}")
+
+            self.run_async("replace_selected_text", final_text, on_done=replaced, on_error=failed)
                 
         def cancel_changes():
+            cancel_event.set()
             self.log("❌ 텍스트 교체 취소")
             result_window.destroy()
-        
-        ctk.CTkButton(button_frame, text="✅ 적용", 
-                     command=apply_changes, width=120).pack(side="left", padx=10)
+
+        def stop_stream():
+            cancel_event.set()
+            stop_button.configure(state="disabled")
+            apply_button.configure(state="normal")
+            status_label.configure(text="⏹ 생성을 중지했습니다 (받은 부분까지 편집/적용 가능)")
+            self.log("⏹ AI 응답 생성 중지")
+        
+        apply_button = ctk.CTkButton(button_frame, text="✅ 적용", 
+                                     command=apply_changes, width=120)
+        apply_button.pack(side="left", padx=10)
+        stop_button = ctk.CTkButton(button_frame, text="⏹ 중지", 
+                                    command=stop_stream, width=120)
         ctk.CTkButton(button_frame, text="❌ 취소", 
                      command=cancel_changes, width=120).pack(side="right", padx=10)
 
+        if stream is None:
+            return
+
+        # --- 스트리밍: 수신은 작업 스레드, 그리기는 after()로 메인 스레드에서 ---
+        apply_button.configure(state="disabled")
+        stop_button.pack(side="left", padx=10)
+        status_label.configure(text="⏳ AI가 작성 중...")
+        pieces = queue.Queue()
+        started = time.perf_counter()
+
+        def receive():
+            try:
+                for piece in stream:
+                    if cancel_event.is_set():
+                        break
+                    pieces.put(("text", piece))
+                pieces.put(("done", None))
+            except Exception as e:
+                pieces.put(("error", str(e)))
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()  # 취소된 경우 연결/프로세스 정리
+
+        state = {"chars": 0}
+
+        def render():
+            if not result_window.winfo_exists():
+                cancel_event.set()
+                return
+            while True:
+                try:
+                    kind, value = pieces.get_nowait()
+                except queue.Empty:
+                    break
+                if cancel_event.is_set():
+                    return
+                if kind == "text":
+                    if not state["chars"]:
+                        value = value.lstrip()
+                        self.log(f"⚡ 첫 응답까지 {(time.perf_counter() - started) * 1000:.0f}ms")
+                    result_box.insert("end", value)
+                    result_box.see("end")
+                    state["chars"] += len(value)
+                    status_label.configure(text=f"⏳ AI가 작성 중... ({state['chars']}자)")
+                    continue
+                stop_button.configure(state="disabled")
+                self.log_llm_cache()
+                if kind == "done":
+                    text = result_box.get("0.0", "end-1c")
+                    if text != text.rstrip():
+                        result_box.delete(f"0.0+{len(text.rstrip())}c", "end")
+                    apply_button.configure(state="normal")
+                    status_label.configure(text=f"✅ 완료 ({state['chars']}자)")
+                    self.log("✅ AI 수정 완료")
+                else:
+                    status_label.configure(text=f"❌ AI 수정 실패: {value}")
+                    self.log(f"❌ AI 수정 실패: {value}")
+                    if state["chars"]:
+                        apply_button.configure(state="normal")
+                return
+            result_window.after(STREAM_POLL_MS, render)
+
+        threading.Thread(target=receive, daemon=True).start()
+        result_window.after(STREAM_POLL_MS, render)
+
     def _create_table(self):
-        """표 생성 - 완전히 메인 스레드에서 실행"""
+        """표 생성 (선택 텍스트 → Gemini → 표 삽입을 작업 프로세스에서 차례로 실행)"""
         if not self.assistant.is_opened:
             self.log("⚠️ 먼저 파일을 열어주세요")
             return
             
         # 버튼 비활성화
         self.table_button.configure(state="disabled", text="표 생성 중...")
-        
-        try:
-            # 1단계: 선택된 텍스트 가져오기
-            self._show_progress("📌 선택된 텍스트를 가져오는 중...")
-            selected_text = self.assistant.get_selected_text()
-            
+
+        def restore_button():
+            self.table_button.configure(state="normal", text="선택된 텍스트를 표로 변환")
+
+        def on_error(e):
+            restore_button()
+            self.log(f"❌ 표 생성 오류: {e}")
+
+        def on_selected(selected_text):
             if not selected_text:
                 self.log("⚠️ 표로 만들 텍스트를 선택해주세요")
+                restore_button()
                 return
                 
             self._show_progress(f"📝 선택된 텍스트: '{selected_text[:50]}...'")
             
-            # 2단계: AI 처리 (메인 스레드에서 블로킹)
+            # 2단계: AI 처리
             self._show_progress("🤖 AI가 표를 생성하고 있습니다...")
-            modified_text = self.assistant.call_gemini("이 내용을 표로 만들어줘", selected_text)
-            
+            self.run_async("call_gemini", "이 내용을 표로 만들어줘", selected_text,
+                           on_done=on_generated, on_error=on_error)
+
+        def on_generated(modified_text):
+            self.log_llm_cache()
             if not (modified_text and modified_text.strip().startswith('|')):
                 self.log("❌ 표 형식 생성 실패")
+                restore_button()
                 return
                 
-            # 3단계: 표 삽입 (메인 스레드)
+            # 3단계: 표 삽입 (커서 이동 후 삽입, 작업 프로세스가 순서대로 처리)
             self._show_progress("📊 문서에 표를 삽입하고 있습니다...")
-            self.assistant.move_caret_right()  # 커서 이동
-            
-            if self.assistant.insert_table(modified_text):
+            self.run_async("move_caret_right")
+            self.run_async("insert_table", modified_text, on_done=on_inserted, on_error=on_error)
+
+        def on_inserted(ok):
+            restore_button()
+            if ok:
                 self.log("✅ 표 삽입 성공!")
             else:
                 self.log("❌ 표 삽입 실패")
-                
-        except Exception as e:
-            self.log(f"❌ 표 생성 오류: {e}")
-        finally:
-            # 버튼 재활성화
-            self.table_button.configure(state="normal", text="선택된 텍스트를 표로 변환")
+
+        # 1단계: 선택된 텍스트 가져오기
+        self._show_progress("📌 선택된 텍스트를 가져오는 중...")
+        self.run_async("get_selected_text", on_done=on_selected, on_error=on_error)
             
     def _open_template_creation(self):
         """템플릿 생성 윈도우 열기"""
@@ -369,8 +505,7 @@ class MainApp(ctk.CTk):
 
     def _load_styles(self):
         """사용 가능한 스타일 목록을 콤보박스에 로드합니다."""
-        try:
-            styles = self.assistant.get_style_list()
+        def loaded(styles):
             if styles:
                 self.style_combo.configure(values=styles)
                 self.style_combo.set(styles[0])
@@ -378,8 +513,9 @@ class MainApp(ctk.CTk):
             else:
                 self.style_combo.configure(values=["스타일 없음"])
                 self.style_combo.set("스타일 없음")
-        except Exception as e:
-            self.log(f"❌ 스타일 로딩 오류: {e}")
+
+        self.run_async("get_style_list", on_done=loaded,
+                       on_error=lambda e: self.log(f"❌ 스타일 로딩 오류: {e}"))
 
     def _apply_style(self):
         """선택된 스타일을 적용합니다."""
@@ -393,25 +529,28 @@ class MainApp(ctk.CTk):
             return
             
         self.apply_style_button.configure(state="disabled", text="적용 중...")
-        
-        try:
-            self.log(f"🎨 스타일 '{style_name}'을(를) 적용합니다...")
-            
-            # JSON 파일 읽기
-            style_path = os.path.join(os.getcwd(), "styles", f"{style_name}.json")
-            with open(style_path, 'r', encoding='utf-8') as f:
-                style_data = json.load(f)
-                
-            # 백엔드 메서드 호출 (메인 스레드에서 직접 실행)
-            if self.assistant.apply_style_to_selection(style_data):
+
+        def restore_button():
+            self.apply_style_button.configure(state="normal", text="선택된 영역에 적용")
+
+        def applied(ok):
+            restore_button()
+            if ok:
                 self.log("✅ 스타일 적용 성공!")
             else:
                 self.log("❌ 스타일 적용 실패")
 
-        except Exception as e:
+        def failed(e):
+            restore_button()
             self.log(f"❌ 스타일 적용 오류: {e}")
-        finally:
-            self.apply_style_button.configure(state="normal", text="선택된 영역에 적용")
+        
+        try:
+            self.log(f"🎨 스타일 '{style_name}'을(를) 적용합니다...")
+            
+            # 스타일 파일은 작업 프로세스의 스타일 등록부가 읽고 캐시함
+            self.run_async("apply_style_to_selection", style_name, on_done=applied, on_error=failed)
+        except Exception as e:
+            failed(e)
 
     def _open_smart_style_window(self):
         """스마트 스타일 적용 윈도우 열기"""
@@ -477,12 +616,10 @@ class TemplateCreationWindow(ctk.CTkToplevel):
         self.update()
 
     def _analyze_document_main_thread(self):
-        """✨ 강화된 디버깅과 함께 문서 분석 실행"""
-        try:
-            self._show_progress("📄 문서 구조를 분석하고 있습니다...")
-            
-            # 1단계: 문서 분석
-            structure = self.assistant.analyze_document_for_template()
+        """✨ 강화된 디버깅과 함께 문서 분석 실행 (분석·Gemini 호출은 작업 프로세스에서)"""
+        on_error = lambda e: self._show_error(f"분석 오류: {e}")
+
+        def analyzed(structure):
             if not structure:
                 self._show_error("문서 분석 실패")
                 return
@@ -491,12 +628,22 @@ class TemplateCreationWindow(ctk.CTkToplevel):
             
             # 2단계: Gemini 분석
             analysis_request = "이 문서를 분석하여 템플릿으로 만들 변수들을 제안해줘."
-            template_plan_str = self.assistant.call_gemini(
+            self.parent.run_async(
+                "call_gemini",
                 analysis_request, 
                 json.dumps(structure, ensure_ascii=False, indent=2), 
-                mode="template_analysis"
+                mode="template_analysis",
+                on_done=self._on_template_plan, on_error=on_error
             )
-            
+
+        self._show_progress("📄 문서 구조를 분석하고 있습니다...")
+        # 1단계: 문서 분석
+        self.parent.run_async("analyze_document_for_template", on_done=analyzed, on_error=on_error)
+
+    def _on_template_plan(self, template_plan_str):
+        """Gemini가 제안한 템플릿 필드 처리"""
+        self.parent.log_llm_cache()
+        try:
             # ✨ 핵심 수정: 응답 디버깅 및 강화된 처리
             if not template_plan_str:
                 self._show_error("AI가 빈 응답을 반환했습니다")
@@ -620,47 +767,51 @@ class TemplateCreationWindow(ctk.CTkToplevel):
             return
             
         # ✨ HWP 객체 상태 확인
-        if not self.assistant.hwp:
+        if not self.assistant.com_ready:
             self._show_error("HWP 객체가 초기화되지 않았습니다.")
             return
             
         # 버튼 비활성화
         self.create_button.configure(state="disabled", text="생성 중...")
-        
-        try:
-            self._show_progress("🔄 누름틀을 생성하고 있습니다...")
-            
-            # 모든 COM 작업을 메인 스레드에서 실행
-            success_count = 0
-            total_fields = len(selected_fields)
-            
-            for i, field in enumerate(selected_fields):
-                self._show_progress(f"🔄 누름틀 생성 중... ({i+1}/{total_fields})")
-                
-                if self.assistant.convert_text_to_field(
-                    field['original_text'], 
-                    field['field_name']
-                ):
-                    success_count += 1
-                    
+        self._show_progress("🔄 누름틀을 생성하고 있습니다...")
+        
+        # 누름틀 변환을 모두 요청해 두면 작업 프로세스가 순서대로 처리
+        total_fields = len(selected_fields)
+        futures = [
+            self.parent.run_async("convert_text_to_field", field['original_text'], field['field_name'],
+                                  on_done=lambda ok, i=i: self._show_progress(
+                                      f"🔄 누름틀 생성 중... ({i+1}/{total_fields})"))
+            for i, field in enumerate(selected_fields)
+        ]
+
+        def restore_button():
+            self.create_button.configure(state="normal", text="템플릿 생성")
+
+        def saved(ok):
+            if ok:
+                success_msg = f"템플릿 '{template_name}' 생성 완료!"
+                self._show_success(success_msg)
+                self.destroy()  # 성공 시 창 닫기
+            else:
+                restore_button()
+                self._show_error("템플릿 저장 실패")
+
+        def failed(e):
+            restore_button()
+            self._show_error(f"생성 오류: {e}")
+
+        def converted(_):
+            success_count = sum(1 for f in futures if f.exception() is None and f.result())
             if success_count > 0:
                 self._show_progress("💾 템플릿을 저장하고 있습니다...")
-                
-                if self.assistant.create_template_from_current(template_name):
-                    success_msg = f"템플릿 '{template_name}' 생성 완료!"
-                    self._show_success(success_msg)
-                    self.destroy()  # 성공 시 창 닫기
-                else:
-                    self._show_error("템플릿 저장 실패")
+                self.parent.run_async("create_template_from_current", template_name,
+                                      on_done=saved, on_error=failed)
             else:
+                restore_button()
                 self._show_error("필드 생성 실패")
-                
-        except Exception as e:
-            error_msg = str(e)
-            self._show_error(f"생성 오류: {error_msg}")
-        finally:
-            # 버튼 재활성화
-            self.create_button.configure(state="normal", text="템플릿 생성")
+
+        # 마지막 변환이 끝나면 (앞의 것도 모두 끝난 상태) 저장 단계로
+        com_worker.poll_future(self, futures[-1], converted, lambda e: converted(None))
 
     def _extract_json_from_markdown(self, text):
         """마크다운 코드 블록에서 JSON 추출"""
@@ -748,6 +899,9 @@ class TemplateUsageWindow(ctk.CTkToplevel):
         
         ctk.CTkButton(button_frame, text="문서 생성", 
                      command=self._create_document).pack(side="left", padx=10)
+        # HWPX로 저장 (같은 이름의 .hwpx 템플릿이 있으면 한/글 없이 바로 채움)
+        self.hwpx_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(button_frame, text="HWPX로 저장", variable=self.hwpx_var).pack(side="left", padx=10)
         ctk.CTkButton(button_frame, text="취소", 
                      command=self.destroy).pack(side="right", padx=10)
         
@@ -756,7 +910,11 @@ class TemplateUsageWindow(ctk.CTkToplevel):
         try:
             template_dir = os.path.join(os.getcwd(), "templates")
             if os.path.exists(template_dir):
-                templates = [f[:-4] for f in os.listdir(template_dir) if f.endswith('.hwp')]
+                # 바뀐 템플릿만 다시 색인 (이후 템플릿 전환은 색인에서 바로 읽음)
+                template_index.get_index().refresh()
+                templates = list(dict.fromkeys(
+                    os.path.splitext(f)[0] for f in sorted(os.listdir(template_dir))
+                    if f.lower().endswith(template_index.TEMPLATE_EXTENSIONS)))
                 if templates:
                     self.template_combo.configure(values=templates)
                     self.template_combo.set(templates[0])
@@ -776,10 +934,17 @@ class TemplateUsageWindow(ctk.CTkToplevel):
             widget.destroy()
         self.field_entries.clear()
         
+        # 템플릿 파일에서 필드 목록 가져오기 (작업 프로세스)
+        self.parent.run_async(
+            "get_field_list_from_file", template_name,
+            on_done=lambda fields: self._display_template_fields(template_name, fields),
+            on_error=lambda e: ctk.CTkLabel(self.fields_frame, text=f"필드 로딩 오류: {e}").pack())
+
+    def _display_template_fields(self, template_name, fields):
+        """필드 입력 위젯 생성 (그 사이 다른 템플릿을 골랐으면 무시)"""
+        if not self.winfo_exists() or self.template_combo.get() != template_name:
+            return
         try:
-            # 템플릿 파일에서 필드 목록 가져오기
-            fields = self.assistant.get_field_list_from_file(template_name)
-            
             if not fields:
                 ctk.CTkLabel(self.fields_frame, text="템플릿에서 필드를 찾을 수 없습니다.").pack()
                 return
@@ -819,16 +984,15 @@ class TemplateUsageWindow(ctk.CTkToplevel):
             messagebox.showerror("오류", "하나 이상의 필드에 값을 입력하세요")
             return
             
-        def create_task():
-            try:
-                if self.assistant.create_document_from_template(template_name, field_values):
-                    self.after(0, lambda: self._show_success(f"'{template_name}' 템플릿으로 문서 생성 완료!"))
-                else:
-                    self.after(0, lambda: self._show_error("문서 생성 실패"))
-            except Exception as e:
-                self.after(0, lambda: self._show_error(f"생성 오류: {e}"))
+        def created(ok):
+            if ok:
+                self._show_success(f"'{template_name}' 템플릿으로 문서 생성 완료!")
+            else:
+                self._show_error("문서 생성 실패")
                 
-        threading.Thread(target=create_task, daemon=True).start()
+        output_format = "hwpx" if self.hwpx_var.get() else "hwp"
+        self.parent.run_async("create_document_from_template", template_name, field_values, output_format,
+                              on_done=created, on_error=lambda e: self._show_error(f"생성 오류: {e}"))
         
     def _show_error(self, message):
         messagebox.showerror("오류", message)
@@ -988,12 +1152,17 @@ class SmartStyleWindow(ctk.CTkToplevel):
         return ""
 
     def _run_analysis(self):
-        """문서 분석 실행 - 다양한 JSON 구조 처리"""
+        """문서 분석 실행 (작업 프로세스에서 분석하는 동안 창은 계속 응답)"""
+        self.progress_label.configure(text="🤖 AI가 문서 구조를 분석하고 있습니다...")
+        self.parent.run_async("analyze_document_structure", on_done=self._on_analysis,
+                              on_error=lambda e: self._show_error(f"분석 오류: {e}"))
+
+    def _on_analysis(self, result):
+        """분석 결과 처리 - 다양한 JSON 구조 처리"""
+        if not self.winfo_exists():
+            return
         try:
-            self.progress_label.configure(text="🤖 AI가 문서 구조를 분석하고 있습니다...")
-            self.update()
-            
-            result = self.assistant.analyze_document_structure()
+            self.parent.log_llm_cache()
             if not result:
                 self._show_error("문서 분석에 실패했습니다.")
                 return
@@ -1037,10 +1206,9 @@ class SmartStyleWindow(ctk.CTkToplevel):
             self.style_plan = self._normalize_style_plan(raw_plan)
             
             if self.style_plan:
-                self._display_style_plan()
-                self.apply_button.configure(state="normal")
-                self.progress_label.configure(text="✅ 분석 완료! 계획을 확인하고 적용하세요.")
-                self.parent.log(f"🎯 총 {len(self.style_plan)}개 구간 분석 완료")
+                # 사용 가능한 모든 스타일 목록을 받은 뒤 계획 표시
+                self.parent.run_async("get_style_list", on_done=self._display_style_plan,
+                                      on_error=lambda e: self._display_style_plan([]))
             else:
                 self._show_error("유효한 스타일 계획을 변환하지 못했습니다.")
                 
@@ -1092,10 +1260,10 @@ class SmartStyleWindow(ctk.CTkToplevel):
             print(f"❌ 테이블 파싱 실패: {e}")
             return None
     
-    def _display_style_plan(self):
+    def _display_style_plan(self, available_styles):
         """스타일 계획을 GUI에 표시 - 사용 가능한 모든 스타일 로드"""
-        # 사용 가능한 모든 스타일 목록 가져오기
-        available_styles = self.parent.assistant.get_style_list()
+        if not self.winfo_exists():
+            return
         if not available_styles:
             available_styles = ["스타일 없음"]
             
@@ -1116,6 +1284,10 @@ class SmartStyleWindow(ctk.CTkToplevel):
             
             plan['style_combo'] = style_combo
 
+        self.apply_button.configure(state="normal")
+        self.progress_label.configure(text="✅ 분석 완료! 계획을 확인하고 적용하세요.")
+        self.parent.log(f"🎯 총 {len(self.style_plan)}개 구간 분석 완료")
+
     def _get_default_style(self, style_type):
         """스타일 타입에 따른 기본 스타일 반환"""
         mapping = {
@@ -1131,20 +1303,30 @@ class SmartStyleWindow(ctk.CTkToplevel):
     
     def _apply_smart_styles(self):
         """스마트 스타일 적용 실행"""
+        def applied(ok):
+            self.apply_button.configure(state="normal")
+            if ok:
+                messagebox.showinfo("성공", "스마트 스타일 적용이 완료되었습니다!")
+                self.destroy()
+            else:
+                messagebox.showerror("실패", "스타일 적용 중 오류가 발생했습니다.")
+
+        def failed(e):
+            self.apply_button.configure(state="normal")
+            messagebox.showerror("오류", f"스타일 적용 오류: {e}")
+
         try:
             # 스타일 매핑 수집
             style_mapping = {}
             for plan in self.style_plan:
                 style_mapping[plan['style_type']] = plan['style_combo'].get()
             
-            # 자동 적용 실행
-            if self.assistant.apply_smart_styles(self.style_plan, style_mapping):
-                messagebox.showinfo("성공", "스마트 스타일 적용이 완료되었습니다!")
-                self.destroy()
-            else:
-                messagebox.showerror("실패", "스타일 적용 중 오류가 발생했습니다.")
+            # 자동 적용 실행 (위젯은 작업 프로세스로 보낼 수 없으므로 계획 값만 전달)
+            plan = [{k: v for k, v in item.items() if k != 'style_combo'} for item in self.style_plan]
+            self.apply_button.configure(state="disabled")
+            self.parent.run_async("apply_smart_styles", plan, style_mapping, on_done=applied, on_error=failed)
         except Exception as e:
-            messagebox.showerror("오류", f"스타일 적용 오류: {e}")
+            failed(e)
 
     def _show_error(self, message):
         """에러 메시지 표시"""
@@ -0,0 +1,854 @@
+import hashlib
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+import doc_visitor
+import section_cache
+from doc_visitor import _cell_details, _cell_grid
+
+# =====================================================================
+# HWP5 순수 파이썬 리더
+#  - 한/글(COM) 없이 OLE 복합 파일(Compound File)을 직접 읽습니다.
+#  - FileHeader / DocInfo / BodyText/SectionN 레코드 스트림을 해석합니다.
+# =====================================================================
+
+CFB_SIGNATURE = bytes.fromhex("D0CF11E0A1B11AE1")
+ENDOFCHAIN = 0xFFFFFFFE
+FREESECT = 0xFFFFFFFF
+NOSTREAM = 0xFFFFFFFF
+
+HWP_SIGNATURE = b"HWP Document File"
+
+# --- 레코드 태그 (HWPTAG_BEGIN = 0x10) ---
+HWPTAG_BEGIN = 0x10
+HWPTAG_DOCUMENT_PROPERTIES = HWPTAG_BEGIN
+HWPTAG_ID_MAPPINGS = HWPTAG_BEGIN + 1
+HWPTAG_FACE_NAME = HWPTAG_BEGIN + 3
+HWPTAG_CHAR_SHAPE = HWPTAG_BEGIN + 5
+HWPTAG_PARA_SHAPE = HWPTAG_BEGIN + 9
+HWPTAG_PARA_HEADER = HWPTAG_BEGIN + 50
+HWPTAG_PARA_TEXT = HWPTAG_BEGIN + 51
+HWPTAG_PARA_CHAR_SHAPE = HWPTAG_BEGIN + 52
+HWPTAG_PARA_LINE_SEG = HWPTAG_BEGIN + 53
+HWPTAG_CTRL_HEADER = HWPTAG_BEGIN + 55
+HWPTAG_LIST_HEADER = HWPTAG_BEGIN + 56
+HWPTAG_TABLE = HWPTAG_BEGIN + 61
+HWPTAG_CTRL_DATA = HWPTAG_BEGIN + 71
+
+# --- PARA_TEXT 제어 문자 ---
+# 1 WCHAR 차지하는 문자 제어를 제외한 나머지는 8 WCHAR(16바이트)를 차지합니다.
+CHAR_CONTROLS = {0, 10, 13, 24, 25, 26, 27, 28, 29, 30, 31}
+INLINE_CONTROLS = {4, 5, 6, 7, 8, 9, 19, 20}
+EXTENDED_CONTROLS = {1, 2, 3, 11, 12, 14, 15, 16, 17, 18, 21, 22, 23}
+CTRL_FIELD_START = 3
+CTRL_FIELD_END = 4
+
+# 누름틀(클릭히어) 필드 컨트롤 ID
+CTRL_ID_CLICK_HERE = "%clk"
+CTRL_ID_TABLE = "tbl "
+
+
+class HwpFormatError(ValueError):
+    """HWP5 형식이 아니거나 지원하지 않는 문서일 때 발생합니다."""
+
+
+# ---------------------------------------------------------------------
+# OLE 복합 파일 리더
+# ---------------------------------------------------------------------
+
+class CompoundFileReader:
+    """OLE 복합 파일(CFB)에서 스트림을 읽는 최소 구현"""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._fp = open(file_path, "rb")
+        try:
+            self._read_header()
+            self._read_fat()
+            self._read_directory()
+            self._read_mini_fat()
+        except Exception:
+            self._fp.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._fp:
+            self._fp.close()
+            self._fp = None
+
+    def _read_header(self):
+        header = self._fp.read(512)
+        if len(header) < 512 or header[:8] != CFB_SIGNATURE:
+            raise HwpFormatError(f"OLE 복합 파일이 아닙니다: {self.file_path}")
+
+        self.sector_size = 1 << struct.unpack_from("<H", header, 0x1E)[0]
+        self.mini_sector_size = 1 << struct.unpack_from("<H", header, 0x20)[0]
+        (self._num_fat_sectors, self._first_dir_sector, _,
+         self.mini_stream_cutoff, self._first_mini_fat_sector,
+         self._num_mini_fat_sectors, self._first_difat_sector,
+         self._num_difat_sectors) = struct.unpack_from("<8I", header, 0x2C)
+        self._difat = [s for s in struct.unpack_from("<109I", header, 0x4C) if s != FREESECT]
+
+    def _read_sector(self, sector):
+        self._fp.seek((sector + 1) * self.sector_size)
+        return self._fp.read(self.sector_size)
+
+    def _read_fat(self):
+        per_sector = self.sector_size // 4
+        difat = list(self._difat)
+        sector = self._first_difat_sector
+        while sector < ENDOFCHAIN and len(difat) < self._num_fat_sectors:
+            values = struct.unpack(f"<{per_sector}I", self._read_sector(sector))
+            difat.extend(s for s in values[:-1] if s != FREESECT)
+            sector = values[-1]
+
+        fat = []
+        for fat_sector in difat[:self._num_fat_sectors]:
+            fat.extend(struct.unpack(f"<{per_sector}I", self._read_sector(fat_sector)))
+        self._fat = fat
+
+    def _chain(self, start, table):
+        sectors = []
+        sector = start
+        while sector < ENDOFCHAIN:
+            if sector >= len(table) or len(sectors) > len(table):
+                raise HwpFormatError("손상된 섹터 체인입니다")
+            sectors.append(sector)
+            sector = table[sector]
+        return sectors
+
+    def _read_chain(self, start):
+        return b"".join(self._read_sector(s) for s in self._chain(start, self._fat))
+
+    def _read_directory(self):
+        raw = self._read_chain(self._first_dir_sector)
+        entries = []
+        for offset in range(0, len(raw) - 127, 128):
+            name_len = struct.unpack_from("<H", raw, offset + 64)[0]
+            name = raw[offset:offset + max(name_len - 2, 0)].decode("utf-16-le", "replace")
+            entry_type = raw[offset + 66]
+            left, right, child = struct.unpack_from("<3I", raw, offset + 68)
+            start = struct.unpack_from("<I", raw, offset + 116)[0]
+            size = struct.unpack_from("<Q", raw, offset + 120)[0]
+            if self.sector_size == 512:
+                size &= 0xFFFFFFFF
+            entries.append((name, entry_type, left, right, child, start, size))
+        self._entries = entries
+        self._raw_entries = [raw[offset:offset + 128] for offset in range(0, len(entries) * 128, 128)]
+
+        # 경로 -> 디렉터리 엔트리 인덱스
+        self._paths = {}
+        self._walk(entries[0][4], "")
+
+    def _walk(self, index, prefix):
+        # 형제 트리를 명시적 스택으로 순회 (깊은 재귀 방지)
+        stack = [index]
+        while stack:
+            index = stack.pop()
+            if index == NOSTREAM or index >= len(self._entries):
+                continue
+            name, entry_type, left, right, child, _, _ = self._entries[index]
+            stack.extend((right, left))
+            path = prefix + name
+            if entry_type == 1:  # storage
+                self._paths[path] = index
+                self._walk(child, path + "/")
+            elif entry_type == 2:  # stream
+                self._paths[path] = index
+
+    def _read_mini_fat(self):
+        self._mini_fat = []
+        if self._num_mini_fat_sectors and self._first_mini_fat_sector < ENDOFCHAIN:
+            raw = self._read_chain(self._first_mini_fat_sector)
+            self._mini_fat = list(struct.unpack(f"<{len(raw) // 4}I", raw))
+        self._mini_stream = None
+
+    def _mini_stream_data(self):
+        if self._mini_stream is None:
+            root = self._entries[0]
+            self._mini_stream = self._read_chain(root[5])[:root[6]] if root[6] else b""
+        return self._mini_stream
+
+    def list_streams(self):
+        """모든 스트림 경로 목록 ('BodyText/Section0' 형식)"""
+        return [p for p, i in self._paths.items() if self._entries[i][1] == 2]
+
+    def exists(self, path):
+        return path in self._paths
+
+    def _entry(self, path):
+        if path not in self._paths:
+            raise KeyError(f"스트림을 찾을 수 없습니다: {path}")
+        entry = self._entries[self._paths[path]]
+        if entry[1] != 2:
+            raise KeyError(f"스트림이 아닙니다: {path}")
+        return entry
+
+    def entry_index(self, path):
+        """경로의 디렉터리 엔트리 인덱스"""
+        if path not in self._paths:
+            raise KeyError(f"스트림을 찾을 수 없습니다: {path}")
+        return self._paths[path]
+
+    def raw_directory(self):
+        """디렉터리 엔트리 원본(128바이트) 목록. 순서는 파일의 엔트리 인덱스와 같습니다. (hwp5_writer에서 사용)"""
+        return list(self._raw_entries)
+
+    def stream_size(self, path):
+        return self._entry(path)[6]
+
+    def read_stream(self, path):
+        """스트림 전체를 bytes로 반환합니다."""
+        return b"".join(self.iter_stream_chunks(path))
+
+    def iter_stream_chunks(self, path):
+        """
+        스트림을 섹터 단위로 나누어 반환합니다.
+        큰 스트림도 한 번에 메모리에 올리지 않고 순서대로 읽을 수 있습니다.
+        """
+        _, _, _, _, _, start, size = self._entry(path)
+        if size == 0:
+            return
+
+        if size < self.mini_stream_cutoff:
+            mini = self._mini_stream_data()
+            mss = self.mini_sector_size
+            data = b"".join(mini[s * mss:(s + 1) * mss] for s in self._chain(start, self._mini_fat))
+            yield data[:size]
+            return
+
+        remaining = size
+        for sector in self._chain(start, self._fat):
+            chunk = self._read_sector(sector)
+            yield chunk[:remaining]
+            remaining -= len(chunk)
+            if remaining <= 0:
+                break
+
+
+# ---------------------------------------------------------------------
+# 레코드 / 문단 해석
+# ---------------------------------------------------------------------
+
+class Record:
+    """HWP 레코드 (태그, 레벨, 데이터)와 하위 레코드"""
+    __slots__ = ("tag_id", "level", "payload", "children")
+
+    def __init__(self, tag_id, level, payload):
+        self.tag_id = tag_id
+        self.level = level
+        self.payload = payload
+        self.children = []
+
+    def child(self, tag_id):
+        for rec in self.children:
+            if rec.tag_id == tag_id:
+                return rec
+        return None
+
+
+def iter_records(data):
+    """바이트 데이터에서 (tag_id, level, payload) 레코드를 순서대로 반환"""
+    offset = 0
+    end = len(data)
+    while offset + 4 <= end:
+        header = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        tag_id = header & 0x3FF
+        level = (header >> 10) & 0x3FF
+        size = header >> 20
+        if size == 0xFFF:
+            size = struct.unpack_from("<I", data, offset)[0]
+            offset += 4
+        yield tag_id, level, data[offset:offset + size]
+        offset += size
+
+
+def iter_records_from_chunks(chunks):
+    """
+    바이트 조각(chunk) 스트림에서 레코드를 점진적으로 해석합니다.
+    완성된 레코드만 반환하고 소비한 앞부분은 버퍼에서 바로 지웁니다.
+    """
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        offset = 0
+        end = len(buf)
+        while offset + 4 <= end:
+            header = struct.unpack_from("<I", buf, offset)[0]
+            size = header >> 20
+            body = offset + 4
+            if size == 0xFFF:
+                if body + 4 > end:
+                    break
+                size = struct.unpack_from("<I", buf, body)[0]
+                body += 4
+            if body + size > end:
+                break
+            yield header & 0x3FF, (header >> 10) & 0x3FF, bytes(buf[body:body + size])
+            offset = body + size
+        del buf[:offset]
+
+
+def iter_record_trees(records):
+    """
+    레벨 정보로 레코드 트리를 만들면서, 최상위 레코드가 완성되는 즉시 반환합니다.
+    메모리에는 현재 만들고 있는 최상위 레코드 하나만 유지됩니다.
+    """
+    root = None
+    stack = []
+    for tag_id, level, payload in records:
+        rec = Record(tag_id, level, payload)
+        while stack and stack[-1].level >= level:
+            stack.pop()
+        if stack:
+            stack[-1].children.append(rec)
+        else:
+            if root is not None:
+                yield root
+            root = rec
+        stack.append(rec)
+    if root is not None:
+        yield root
+
+
+def build_record_tree(records):
+    """레벨 정보로 레코드 트리를 만들고 최상위 레코드 목록을 반환합니다."""
+    return list(iter_record_trees(records))
+
+
+def ctrl_id_of(payload):
+    """CTRL_HEADER 데이터의 컨트롤 ID('tbl ', '%clk' 등)"""
+    if len(payload) < 4:
+        return ""
+    return payload[3::-1].decode("latin-1")
+
+
+def decode_para_text(payload):
+    """
+    PARA_TEXT를 해석합니다.
+
+    Returns:
+        list: ("text", str) 또는 ("ctrl", code, ctrl_id) 토큰 목록
+    """
+    count = len(payload) // 2
+    chars = struct.unpack(f"<{count}H", payload[:count * 2])
+    tokens = []
+    buf = []
+    i = 0
+    while i < count:
+        code = chars[i]
+        if code >= 32:
+            buf.append(chr(code))
+            i += 1
+            continue
+
+        if code in CHAR_CONTROLS:
+            if code == 10:
+                buf.append("\n")
+            elif code in (24, 30, 31):
+                buf.append("-" if code == 24 else " ")
+            i += 1
+            continue
+
+        if code == 9:
+            buf.append("\t")
+        if code in EXTENDED_CONTROLS or code == CTRL_FIELD_END:
+            if buf:
+                tokens.append(("text", _fix_surrogates("".join(buf))))
+                buf = []
+            ctrl_id = ""
+            if i + 3 <= count:
+                ctrl_id = struct.pack("<HH", *chars[i + 1:i + 3])[::-1].decode("latin-1")
+            tokens.append(("ctrl", code, ctrl_id))
+        i += 8
+
+    if buf:
+        tokens.append(("text", _fix_surrogates("".join(buf))))
+    return tokens
+
+
+def text_positions(payload, raw_positions):
+    """
+    PARA_TEXT의 WCHAR 위치(PARA_CHAR_SHAPE 등에서 쓰는 값)를 decode_para_text 결과 텍스트의 위치로 바꿉니다.
+    확장/인라인 제어 문자는 8 WCHAR를 차지하지만 텍스트에서는 0자(탭은 1자)이므로 위치가 달라집니다.
+    """
+    count = len(payload) // 2
+    chars = struct.unpack(f"<{count}H", payload[:count * 2])
+    targets = sorted(set(raw_positions))
+    mapped = {}
+    t = 0
+    pos = 0
+    i = 0
+    while t < len(targets):
+        while t < len(targets) and targets[t] <= i:
+            mapped[targets[t]] = pos
+            t += 1
+        if i >= count:
+            break
+        code = chars[i]
+        if code >= 32 or code in CHAR_CONTROLS:
+            if code >= 32 or code in (10, 24, 30, 31):
+                pos += 1
+            i += 1
+        else:
+            if code == 9:
+                pos += 1
+            i += 8
+    for raw in targets[t:]:
+        mapped[raw] = pos
+    return [mapped[raw] for raw in raw_positions]
+
+
+def _fix_surrogates(text):
+    if any(0xD800 <= ord(c) <= 0xDFFF for c in text):
+        return text.encode("utf-16-le", "surrogatepass").decode("utf-16-le", "replace")
+    return text
+
+
+def read_bstr(payload, offset):
+    """WORD 길이 + WCHAR 배열 문자열을 읽고 (문자열, 다음 오프셋)을 반환"""
+    length = struct.unpack_from("<H", payload, offset)[0]
+    offset += 2
+    text = payload[offset:offset + length * 2].decode("utf-16-le", "replace")
+    return text, offset + length * 2
+
+
+def field_name_of(ctrl_rec):
+    """누름틀 컨트롤의 필드 이름 (CTRL_DATA 파라미터 셋에 저장됨)"""
+    data = ctrl_rec.child(HWPTAG_CTRL_DATA)
+    if data is None or len(data.payload) < 12:
+        return ""
+    payload = data.payload
+    # ParameterSet: id(2) count(2) dummy(2) + item: id(2) type(2) ...
+    count = struct.unpack_from("<h", payload, 2)[0]
+    offset = 6
+    for _ in range(max(count, 0)):
+        if offset + 4 > len(payload):
+            break
+        item_id, item_type = struct.unpack_from("<HH", payload, offset)
+        offset += 4
+        if item_type != 1:  # PIT_BSTR 이외의 항목은 여기서 다루지 않음
+            break
+        value, offset = read_bstr(payload, offset)
+        if item_id == 0x4000:
+            return value
+    return ""
+
+
+class Paragraph:
+    """문단 레코드 묶음을 해석한 결과"""
+    __slots__ = ("text", "tokens", "para_shape_id", "style_id",
+                 "char_shape_runs", "controls", "fields", "_text_payload")
+
+    def __init__(self, header):
+        payload = header.payload
+        self.para_shape_id = struct.unpack_from("<H", payload, 8)[0] if len(payload) >= 10 else 0
+        self.style_id = payload[10] if len(payload) >= 11 else 0
+
+        text_rec = header.child(HWPTAG_PARA_TEXT)
+        self._text_payload = text_rec.payload if text_rec else b""
+        self.tokens = decode_para_text(self._text_payload) if text_rec else []
+
+        runs_rec = header.child(HWPTAG_PARA_CHAR_SHAPE)
+        self.char_shape_runs = []
+        if runs_rec:
+            n = len(runs_rec.payload) // 8
+            values = struct.unpack(f"<{n * 2}I", runs_rec.payload[:n * 8])
+            self.char_shape_runs = list(zip(values[0::2], values[1::2]))
+
+        self.controls = [r for r in header.children if r.tag_id == HWPTAG_CTRL_HEADER]
+        self._resolve_fields()
+
+    def _resolve_fields(self):
+        """
+        텍스트와 컨트롤을 짝지어 누름틀 필드 값을 구합니다.
+        필드 안에 필드가 들어 있을 수 있으므로 열린 필드를 스택으로 관리하고, 텍스트는 열린 필드 모두에 더합니다.
+        결과는 필드가 시작한 순서(GetFieldList와 같은 순서)입니다.
+        """
+        parts = []
+        fields = []
+        open_fields = []  # (fields 안의 자리 | None, 텍스트 조각 목록)
+        ctrl_iter = iter(self.controls)
+        for token in self.tokens:
+            if token[0] == "text":
+                parts.append(token[1])
+                for _, field_parts in open_fields:
+                    field_parts.append(token[1])
+                continue
+
+            code = token[1]
+            ctrl = None
+            if code in EXTENDED_CONTROLS:
+                ctrl = next(ctrl_iter, None)
+            if code == CTRL_FIELD_START:
+                # 누름틀이 아닌 필드도 끝 표시와 짝을 맞추기 위해 스택에 넣음
+                slot = None
+                if ctrl is not None and ctrl_id_of(ctrl.payload) == CTRL_ID_CLICK_HERE:
+                    slot = len(fields)
+                    fields.append((field_name_of(ctrl), ""))
+                open_fields.append((slot, []))
+            elif code == CTRL_FIELD_END and open_fields:
+                slot, field_parts = open_fields.pop()
+                if slot is not None:
+                    fields[slot] = (fields[slot][0], "".join(field_parts))
+        self.fields = fields
+        self.text = "".join(parts)
+
+    def text_char_shape_runs(self):
+        """글자 모양 구간을 (text 기준 위치, 글자 모양 ID) 목록으로 반환"""
+        if not self.char_shape_runs:
+            return []
+        offsets = text_positions(self._text_payload, [start for start, _ in self.char_shape_runs])
+        return [(offset, shape_id) for offset, (_, shape_id) in zip(offsets, self.char_shape_runs)]
+
+    def tables(self):
+        """문단에 포함된 표 컨트롤 목록"""
+        return [c for c in self.controls if ctrl_id_of(c.payload) == CTRL_ID_TABLE]
+
+
+def parse_table(ctrl_rec):
+    """
+    표 컨트롤에서 행/열 수와 셀 목록을 구합니다.
+
+    Returns:
+        dict: {"rows", "cols", "cells": [{"row", "col", "row_span", "col_span", "paragraphs"}]}
+    """
+    rows = cols = 0
+    cells = []
+    current = None
+    for rec in ctrl_rec.children:
+        if rec.tag_id == HWPTAG_TABLE and len(rec.payload) >= 8:
+            rows, cols = struct.unpack_from("<HH", rec.payload, 4)
+        elif rec.tag_id == HWPTAG_LIST_HEADER and len(rec.payload) >= 16:
+            col, row, col_span, row_span = struct.unpack_from("<4H", rec.payload, 8)
+            current = {"row": row, "col": col, "row_span": row_span,
+                       "col_span": col_span, "paragraphs": []}
+            cells.append(current)
+        elif rec.tag_id == HWPTAG_PARA_HEADER and current is not None:
+            current["paragraphs"].append(Paragraph(rec))
+    return {"rows": rows, "cols": cols, "cells": cells}
+
+
+# ---------------------------------------------------------------------
+# 문서 단위 API
+# ---------------------------------------------------------------------
+
+class Hwp5File:
+    """한/글 없이 HWP5 문서를 읽는 클래스"""
+    SECTION_KIND = "hwp5"
+
+    def __init__(self, file_path):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+        self.file_path = file_path
+        self.cfb = CompoundFileReader(file_path)
+        try:
+            self._read_file_header()
+        except Exception:
+            self.cfb.close()
+            raise
+        self._doc_info = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.cfb.close()
+
+    def _read_file_header(self):
+        if not self.cfb.exists("FileHeader"):
+            raise HwpFormatError(f"HWP 문서가 아닙니다: {self.file_path}")
+        header = self.cfb.read_stream("FileHeader")
+        if not header.startswith(HWP_SIGNATURE):
+            raise HwpFormatError(f"HWP 문서 서명이 올바르지 않습니다: {self.file_path}")
+
+        version = struct.unpack_from("<I", header, 32)[0]
+        self.version = ((version >> 24) & 0xFF, (version >> 16) & 0xFF,
+                        (version >> 8) & 0xFF, version & 0xFF)
+        flags = struct.unpack_from("<I", header, 36)[0]
+        self.compressed = bool(flags & 0x01)
+        self.password_protected = bool(flags & 0x02)
+        self.distributed = bool(flags & 0x04)
+        if self.password_protected or self.distributed:
+            raise HwpFormatError("암호가 걸렸거나 배포용으로 저장된 문서는 읽을 수 없습니다")
+
+    def _read_stream(self, path):
+        return b"".join(self._iter_stream(path))
+
+    def _iter_stream(self, path):
+        """스트림을 (압축 문서라면 압축을 풀면서) 조각 단위로 반환"""
+        if not self.compressed:
+            yield from self.cfb.iter_stream_chunks(path)
+            return
+        decompressor = zlib.decompressobj(-15)
+        for chunk in self.cfb.iter_stream_chunks(path):
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    @property
+    def doc_info(self):
+        """DocInfo에서 글꼴 / 글자 모양 / 문단 모양 목록"""
+        if self._doc_info is None:
+            self._doc_info = DocInfo(iter_records(self._read_stream("DocInfo")))
+        return self._doc_info
+
+    def section_names(self):
+        sections = [p for p in self.cfb.list_streams() if p.startswith("BodyText/Section")]
+        return sorted(sections, key=lambda p: int(p[len("BodyText/Section"):] or 0))
+
+    def section_records(self, section_name):
+        """구역 스트림의 레코드를 압축을 풀어가며 하나씩 반환"""
+        return iter_records_from_chunks(self._iter_stream(section_name))
+
+    def section_digest(self, section_name):
+        """구역 스트림의 내용 해시. 압축을 풀지 않고 저장된 바이트 그대로 계산합니다."""
+        h = hashlib.sha256(b"compressed" if self.compressed else b"raw")
+        for chunk in self.cfb.iter_stream_chunks(section_name):
+            h.update(chunk)
+        return h.hexdigest()
+
+    def section_paragraphs(self, section_name):
+        """구역 하나의 최상위 문단을 Paragraph로 해석해 반환"""
+        for rec in iter_record_trees(self.section_records(section_name)):
+            if rec.tag_id == HWPTAG_PARA_HEADER:
+                yield Paragraph(rec)
+
+    def visit(self, collectors, use_cache=True):
+        """
+        문서를 한 번 순회하며 지정한 수집기들의 결과를 모읍니다. (doc_visitor 참고)
+        구역 스트림이 지난번과 같으면 해석해 둔 문단을 재사용합니다. (section_cache 참고)
+        use_cache=False면 구역 캐시를 쓰지 않고 모두 새로 해석합니다.
+        """
+        return section_cache.visit(self, parse_table, collectors, use_cache=use_cache)
+
+    def iter_paragraphs(self):
+        """모든 구역의 최상위 문단 레코드 트리를 순서대로 반환"""
+        for _, header in self.iter_section_paragraphs():
+            yield header
+
+    def iter_section_paragraphs(self):
+        """(구역 번호, 최상위 문단 레코드 트리)를 문서 순서대로 반환"""
+        for index, section_name in enumerate(self.section_names()):
+            for rec in iter_record_trees(self.section_records(section_name)):
+                if rec.tag_id == HWPTAG_PARA_HEADER:
+                    yield index, rec
+
+
+class DocInfo:
+    """
+    DocInfo 스트림의 글꼴 / 글자 모양 / 문단 모양 표.
+    스트림을 한 번 읽어 ID 순서대로 열 단위 배열(array)에 담아 두므로
+    어떤 문단의 서식이든 ID로 바로(O(1)) 찾을 수 있습니다.
+    """
+
+    LANG_COUNT = 7
+
+    def __init__(self, records):
+        self.face_names = []
+        self.face_counts = [0] * self.LANG_COUNT
+
+        # 글자 모양 (인덱스 = 글자 모양 ID). 글꼴 ID는 언어 7개씩 연속으로 저장
+        self.char_face_ids = array("H")
+        self.char_heights = array("i")
+        self.char_attrs = array("I")
+
+        # 문단 모양 (인덱스 = 문단 모양 ID)
+        self.para_attrs = array("I")
+        self.para_left_margins = array("i")
+        self.para_right_margins = array("i")
+        self.para_indents = array("i")
+        self.para_top_margins = array("i")
+        self.para_bottom_margins = array("i")
+        self.para_line_spacings = array("i")
+
+        for tag_id, _, payload in records:
+            if tag_id == HWPTAG_ID_MAPPINGS and len(payload) >= 32:
+                self.face_counts = list(struct.unpack_from("<7i", payload, 4))
+            elif tag_id == HWPTAG_FACE_NAME and len(payload) >= 3:
+                self.face_names.append(sys.intern(read_bstr(payload, 1)[0]))
+            elif tag_id == HWPTAG_CHAR_SHAPE and len(payload) >= 50:
+                self.char_face_ids.extend(struct.unpack_from("<7H", payload, 0))
+                height, attr = struct.unpack_from("<iI", payload, 42)
+                self.char_heights.append(height)
+                self.char_attrs.append(attr)
+            elif tag_id == HWPTAG_PARA_SHAPE and len(payload) >= 28:
+                attr1, left, right, indent, top, bottom, spacing = struct.unpack_from("<I6i", payload, 0)
+                if len(payload) >= 54:
+                    spacing = struct.unpack_from("<I", payload, 50)[0]
+                self.para_attrs.append(attr1)
+                self.para_left_margins.append(left)
+                self.para_right_margins.append(right)
+                self.para_indents.append(indent)
+                self.para_top_margins.append(top)
+                self.para_bottom_margins.append(bottom)
+                self.para_line_spacings.append(spacing)
+
+        # 언어별 글꼴 목록이 face_names 안에서 시작하는 위치
+        self._face_offsets = [0] * self.LANG_COUNT
+        for lang in range(1, self.LANG_COUNT):
+            self._face_offsets[lang] = self._face_offsets[lang - 1] + self.face_counts[lang - 1]
+
+        # 변환한 서식 dict는 ID별로 한 번만 만들고, 내용이 같으면 같은 객체를 공유
+        self._char_formats = [None] * len(self.char_heights)
+        self._para_formats = [None] * len(self.para_attrs)
+        self._interned = {}
+
+    @property
+    def char_shape_count(self):
+        return len(self.char_heights)
+
+    @property
+    def para_shape_count(self):
+        return len(self.para_attrs)
+
+    def _intern(self, fmt):
+        key = tuple(fmt.items())
+        return self._interned.setdefault(key, fmt)
+
+    def face_name(self, lang, face_id):
+        """언어별 글꼴 목록(한글=0, 영문=1 ...)에서 글꼴 이름을 찾습니다."""
+        index = self._face_offsets[lang] + face_id
+        if 0 <= index < len(self.face_names):
+            return self.face_names[index]
+        return ""
+
+    def fonts_used(self):
+        return list(dict.fromkeys(n for n in self.face_names if n))
+
+    def char_format(self, shape_id):
+        """글자 모양 ID를 COM 추출과 같은 형태의 dict로 변환 (공유 객체이므로 수정하지 말 것)"""
+        if not 0 <= shape_id < len(self._char_formats):
+            return None
+        fmt = self._char_formats[shape_id]
+        if fmt is None:
+            attr = self.char_attrs[shape_id]
+            fmt = self._intern({
+                "font_name": self.face_name(0, self.char_face_ids[shape_id * self.LANG_COUNT]),
+                "font_size": self.char_heights[shape_id] / 100.0,
+                "is_bold": int(bool(attr & 0x02)),
+                "is_italic": int(bool(attr & 0x01)),
+                "underline": (attr >> 2) & 0x3,
+            })
+            self._char_formats[shape_id] = fmt
+        return fmt
+
+    def para_format(self, shape_id):
+        """문단 모양 ID를 COM 추출과 같은 형태의 dict로 변환 (공유 객체이므로 수정하지 말 것)"""
+        if not 0 <= shape_id < len(self._para_formats):
+            return None
+        fmt = self._para_formats[shape_id]
+        if fmt is None:
+            fmt = self._intern({
+                "alignment": (self.para_attrs[shape_id] >> 2) & 0x7,
+                "left_margin": self.para_left_margins[shape_id],
+                "line_spacing": self.para_line_spacings[shape_id],
+            })
+            self._para_formats[shape_id] = fmt
+        return fmt
+
+
+def _walk_paragraphs(header, depth=0):
+    """문단과 표 셀 안의 문단까지 문서 순서대로 (Paragraph, 표 안 여부) 반환"""
+    para = Paragraph(header)
+    yield para, depth > 0
+    for ctrl in para.controls:
+        if ctrl_id_of(ctrl.payload) != CTRL_ID_TABLE:
+            continue
+        for rec in ctrl.children:
+            if rec.tag_id == HWPTAG_PARA_HEADER:
+                yield from _walk_paragraphs(rec, depth + 1)
+
+
+def read_text_and_fields(file_path):
+    """
+    GetTextFile("TEXT")에 해당하는 전체 텍스트와 누름틀 값 dict를 한 번에 읽습니다.
+    표 안의 문단을 포함한 모든 문단을 문서 순서대로 "\r\n"으로 연결합니다.
+    """
+    with Hwp5File(file_path) as doc:
+        visited = doc.visit(["full_text", "fields"])
+    return visited["full_text"], visited["fields"]
+
+
+def extract_hwp_structure(file_path: str, use_cache: bool = True) -> dict:
+    """
+    extractor.extract_hwp_structure의 네이티브 버전.
+    한/글 없이 문서의 제목, 문단, 누름틀, 표 정보를 추출합니다.
+    """
+    with Hwp5File(file_path) as doc:
+        return doc_visitor.structure_result(file_path, doc.visit(doc_visitor.STRUCTURE_COLLECTORS, use_cache))
+
+
+def extract_hwp_structure_with_style(file_path: str, use_cache: bool = True) -> dict:
+    """
+    extractor.extract_hwp_structure_with_style의 네이티브 버전.
+    문단마다 첫 글자의 글꼴/크기/굵기를 함께 기록합니다.
+    """
+    with Hwp5File(file_path) as doc:
+        return doc_visitor.style_result(file_path, doc.visit(doc_visitor.STYLE_COLLECTORS, use_cache))
+
+
+def extract_hwp_with_formatting(file_path: str, use_cache: bool = True) -> dict:
+    """
+    extractor.extract_hwp_with_formatting의 네이티브 버전.
+    서식 정보는 DocInfo의 글꼴 / 글자 모양 / 문단 모양 표에서 구합니다.
+    """
+    with Hwp5File(file_path) as doc:
+        return doc_visitor.formatting_result(file_path, doc.visit(doc_visitor.FORMATTING_COLLECTORS, use_cache))
+
+
+def iter_elements(file_path):
+    """
+    문서를 처음부터 끝까지 한 번 읽으며 요소를 하나씩 반환하는 제너레이터.
+    구역 스트림은 조각 단위로 압축을 풀고 최상위 문단 단위로 해석하므로,
+    문서 크기와 관계없이 메모리 사용량이 일정하게 유지됩니다.
+
+    반환 요소:
+        {"type": "paragraph", "section", "index", "text"}
+        {"type": "table", "section", "index", "rows", "cols", "cells", "cell_details"}
+        {"type": "field", "section", "index", "name", "value"}
+    """
+    with Hwp5File(file_path) as doc:
+        para_index = 0
+        table_index = 0
+        for section, header in doc.iter_section_paragraphs():
+            for para, in_table in _walk_paragraphs(header):
+                if not in_table:
+                    yield {"type": "paragraph", "section": section,
+                           "index": para_index, "text": para.text.strip()}
+                    para_index += 1
+                for name, value in para.fields:
+                    if name:
+                        yield {"type": "field", "section": section, "index": para_index - 1,
+                               "name": name, "value": value.strip()}
+                for ctrl in para.tables():
+                    table = parse_table(ctrl)
+                    yield {"type": "table", "section": section, "index": table_index,
+                           "rows": table["rows"], "cols": table["cols"],
+                           "cells": _cell_grid(table), "cell_details": _cell_details(table)}
+                    table_index += 1
+
+
+def is_hwp5_file(file_path):
+    """파일이 OLE 기반 HWP5 문서인지 확인"""
+    try:
+        with open(file_path, "rb") as f:
+            return f.read(8) == CFB_SIGNATURE
+    except OSError:
+        return False
@@ -0,0 +1,549 @@
+import os
+import struct
+import tempfile
+import zlib
+
+import hwp5_reader
+from hwp5_reader import (
+    CFB_SIGNATURE, CHAR_CONTROLS, CTRL_FIELD_END, CTRL_FIELD_START, CTRL_ID_CLICK_HERE, ENDOFCHAIN,
+    EXTENDED_CONTROLS, FREESECT, HWPTAG_BEGIN, HWPTAG_CTRL_DATA, HWPTAG_CTRL_HEADER, HWPTAG_PARA_CHAR_SHAPE,
+    HWPTAG_PARA_HEADER, HWPTAG_PARA_LINE_SEG, HWPTAG_PARA_TEXT, HwpFormatError, Record, ctrl_id_of,
+    field_name_of,
+)
+
+# =====================================================================
+# HWP5 누름틀 채우기 (한/글 없이)
+#  - 템플릿을 한 번 읽어 두고, 누름틀이 있는 문단의 레코드만 고쳐 새 문서를 만듭니다.
+#  - 바뀐 구역 스트림만 다시 압축하고, 나머지 스트림은 원본 바이트를 그대로 복사합니다.
+# =====================================================================
+
+HWPTAG_PARA_RANGE_TAG = HWPTAG_BEGIN + 54
+
+# 구역 스트림 안의 누름틀 컨트롤 ID ('%clk'가 뒤집혀 저장됨). 누름틀이 없는 구역을 빠르게 거르는 데 사용
+CLICK_HERE_BYTES = CTRL_ID_CLICK_HERE.encode("latin-1")[::-1]
+
+DEFAULT_COMPRESS_LEVEL = int(os.environ.get("HWP_WRITER_COMPRESS_LEVEL", "6"))
+
+# --- 복합 파일 쓰기 (버전 3, 512바이트 섹터) ---
+SECTOR_SIZE = 512
+MINI_SECTOR_SIZE = 64
+MINI_STREAM_CUTOFF = 4096
+FATSECT = 0xFFFFFFFD
+DIFSECT = 0xFFFFFFFC
+HEADER_DIFAT_COUNT = 109
+EMPTY_DIR_ENTRY = bytes(64) + struct.pack("<HBB3I", 0, 0, 0, FREESECT, FREESECT, FREESECT) + bytes(48)
+
+
+# ---------------------------------------------------------------------
+# OLE 복합 파일 쓰기
+# ---------------------------------------------------------------------
+
+def _pad(data, size):
+    return data + bytes(-len(data) % size)
+
+
+def build_compound_file(directory, streams):
+    """
+    디렉터리 엔트리 원본과 스트림 데이터로 새 복합 파일을 만듭니다.
+    엔트리의 이름, 트리 연결, CLSID, 시각은 그대로 두고 시작 섹터와 크기만 새로 씁니다.
+
+    Args:
+        directory (list[bytes]): CompoundFileReader.raw_directory() 결과 (0번이 루트)
+        streams (dict): {엔트리 인덱스: 스트림 데이터}
+
+    Returns:
+        bytes: 파일 전체
+    """
+    sectors = []  # 헤더 뒤에 놓일 섹터 데이터
+    fat = []
+    placed = {}  # 엔트리 인덱스 -> (시작 섹터, 크기)
+
+    def allocate(data):
+        if not data:
+            return ENDOFCHAIN
+        first = len(sectors)
+        data = _pad(data, SECTOR_SIZE)
+        count = len(data) // SECTOR_SIZE
+        sectors.extend(data[i * SECTOR_SIZE:(i + 1) * SECTOR_SIZE] for i in range(count))
+        fat.extend(range(first + 1, first + count))
+        fat.append(ENDOFCHAIN)
+        return first
+
+    # 작은 스트림은 미니 스트림에, 나머지는 일반 섹터에
+    mini_stream = bytearray()
+    mini_fat = []
+    for index in sorted(streams):
+        data = streams[index]
+        if not data:
+            placed[index] = (ENDOFCHAIN, 0)
+        elif len(data) < MINI_STREAM_CUTOFF:
+            first = len(mini_stream) // MINI_SECTOR_SIZE
+            count = -(-len(data) // MINI_SECTOR_SIZE)
+            mini_fat.extend(range(first + 1, first + count))
+            mini_fat.append(ENDOFCHAIN)
+            mini_stream += _pad(data, MINI_SECTOR_SIZE)
+            placed[index] = (first, len(data))
+        else:
+            placed[index] = (allocate(data), len(data))
+
+    placed[0] = (allocate(bytes(mini_stream)), len(mini_stream))
+    mini_fat_start = ENDOFCHAIN
+    if mini_fat:
+        mini_fat += [FREESECT] * (-len(mini_fat) % (SECTOR_SIZE // 4))
+        mini_fat_start = allocate(struct.pack(f"<{len(mini_fat)}I", *mini_fat))
+
+    entries = []
+    for index, raw in enumerate(directory):
+        entry = bytearray(raw)
+        if index in placed or entry[66] == 2:
+            # 트리에서 닿지 않는 스트림 엔트리는 빈 스트림으로
+            start, size = placed.get(index, (ENDOFCHAIN, 0))
+            struct.pack_into("<IQ", entry, 116, start, size)
+        entries.append(bytes(entry))
+    entries += [EMPTY_DIR_ENTRY] * (-len(entries) % (SECTOR_SIZE // 128))
+    directory_start = allocate(b"".join(entries))
+
+    # FAT / DIFAT 섹터 수는 자기 자신도 FAT에 기록되므로 값이 안정될 때까지 다시 계산
+    per_sector = SECTOR_SIZE // 4
+    fat_count = difat_count = 0
+    while True:
+        total = len(sectors) + fat_count + difat_count
+        need_fat = -(-total // per_sector)
+        need_difat = -(-max(need_fat - HEADER_DIFAT_COUNT, 0) // (per_sector - 1))
+        if (need_fat, need_difat) == (fat_count, difat_count):
+            break
+        fat_count, difat_count = need_fat, need_difat
+
+    fat_sectors = list(range(len(sectors), len(sectors) + fat_count))
+    difat_sectors = list(range(len(sectors) + fat_count, len(sectors) + fat_count + difat_count))
+    fat += [FATSECT] * fat_count + [DIFSECT] * difat_count
+    fat += [FREESECT] * (fat_count * per_sector - len(fat))
+    fat_bytes = struct.pack(f"<{len(fat)}I", *fat)
+    sectors.extend(fat_bytes[i * SECTOR_SIZE:(i + 1) * SECTOR_SIZE] for i in range(fat_count))
+
+    extra = fat_sectors[HEADER_DIFAT_COUNT:]
+    for i, _ in enumerate(difat_sectors):
+        values = extra[i * (per_sector - 1):(i + 1) * (per_sector - 1)]
+        values += [FREESECT] * (per_sector - 1 - len(values))
+        values.append(difat_sectors[i + 1] if i + 1 < difat_count else ENDOFCHAIN)
+        sectors.append(struct.pack(f"<{per_sector}I", *values))
+
+    header = bytearray(SECTOR_SIZE)
+    header[0:8] = CFB_SIGNATURE
+    struct.pack_into("<5H", header, 0x18, 0x3E, 3, 0xFFFE, 9, 6)
+    header_difat = fat_sectors[:HEADER_DIFAT_COUNT]
+    header_difat += [FREESECT] * (HEADER_DIFAT_COUNT - len(header_difat))
+    struct.pack_into("<9I", header, 0x2C - 4, 0, fat_count, directory_start, 0, MINI_STREAM_CUTOFF,
+                     mini_fat_start, len(mini_fat) // per_sector,
+                     difat_sectors[0] if difat_sectors else ENDOFCHAIN, difat_count)
+    struct.pack_into(f"<{HEADER_DIFAT_COUNT}I", header, 0x4C, *header_difat)
+    return bytes(header) + b"".join(sectors)
+
+
+# ---------------------------------------------------------------------
+# 레코드 쓰기
+# ---------------------------------------------------------------------
+
+def encode_record(tag_id, level, payload):
+    """(태그, 레벨, 데이터)를 레코드 바이트로 만듭니다. 4095바이트 이상은 확장 크기 헤더를 씁니다."""
+    size = len(payload)
+    if size >= 0xFFF:
+        return struct.pack("<II", tag_id | (level << 10) | (0xFFF << 20), size) + payload
+    return struct.pack("<I", tag_id | (level << 10) | (size << 20)) + payload
+
+
+def iter_records_with_offsets(data):
+    """iter_records와 같지만 각 레코드의 (시작, 끝) 바이트 위치도 함께 반환"""
+    offset = 0
+    end = len(data)
+    while offset + 4 <= end:
+        start = offset
+        header = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        size = header >> 20
+        if size == 0xFFF:
+            size = struct.unpack_from("<I", data, offset)[0]
+            offset += 4
+        yield start, offset + size, header & 0x3FF, (header >> 10) & 0x3FF, data[offset:offset + size]
+        offset += size
+
+
+def encode_field_text(value):
+    """
+    누름틀에 넣을 값을 PARA_TEXT 글자(WCHAR) 목록으로 바꿉니다.
+    줄바꿈은 문단 안 줄 나눔(10)으로, 탭은 공백으로 넣고 나머지 제어 문자는 버립니다.
+    """
+    text = str(value).replace("\r\n", "\n").replace("\r", "\n").replace("\t", " ")
+    text = "".join(c for c in text if c == "\n" or ord(c) >= 32)
+    data = text.encode("utf-16-le", "surrogatepass")
+    return list(struct.unpack(f"<{len(data) // 2}H", data))
+
+
+def _map_position(pos, start, end, new_len):
+    """[start, end) 구간을 new_len 글자로 바꾼 뒤의 위치"""
+    if pos <= start:
+        return pos
+    if pos >= end:
+        return pos + new_len - (end - start)
+    return start + min(pos - start, new_len)
+
+
+def shift_char_shape_runs(runs, start, end, new_len):
+    """
+    [start, end) 구간을 new_len 글자로 바꾼 뒤의 글자 모양 구간 (위치, 글자 모양 ID).
+    새 값은 start에 적용되던 글자 모양을 따르고, 구간 뒤 글자는 원래 모양을 유지합니다.
+    """
+    delta = new_len - (end - start)
+    shape_at_end = None
+    shifted = []
+    for pos, shape_id in runs:
+        if pos <= end:
+            shape_at_end = shape_id
+        if pos <= start:
+            shifted.append((pos, shape_id))
+        elif pos >= end:
+            shifted.append((pos + delta, shape_id))
+    if shape_at_end is not None and not any(pos == end for pos, _ in runs) \
+            and any(start < pos < end for pos, _ in runs):
+        # 구간 안에서 시작한 모양이 구간 뒤 글자에도 적용되던 경우, 새 값 뒤에 다시 시작
+        shifted.append((end + delta, shape_at_end))
+    shifted.sort(key=lambda run: run[0])
+    # 같은 위치의 구간은 뒤의 것만 (길이가 0인 구간 제거)
+    result = []
+    for pos, shape_id in shifted:
+        if result and result[-1][0] == pos:
+            result[-1] = (pos, shape_id)
+        else:
+            result.append((pos, shape_id))
+    return result
+
+
+# ---------------------------------------------------------------------
+# 누름틀 문단 / 구역
+# ---------------------------------------------------------------------
+
+class _Field:
+    """문단 안의 필드 하나 (WCHAR 위치). 누름틀이 아닌 필드는 name이 None"""
+    __slots__ = ("name", "pos", "end", "ctrl_no", "children", "ctrl_nos", "has_objects")
+
+    def __init__(self, name, pos, ctrl_no):
+        self.name = name
+        self.pos = pos              # 필드 시작 제어 문자 위치 (내용은 pos + 8부터)
+        self.end = None             # 필드 끝 제어 문자 위치
+        self.ctrl_no = ctrl_no
+        self.children = []          # 바로 안에 든 필드
+        self.ctrl_nos = []          # 내용 안의 모든 컨트롤 번호 (안쪽 필드 포함)
+        self.has_objects = False    # 필드가 아닌 확장 컨트롤(표, 그림 등)이 내용에 있는지 (안쪽 필드 포함)
+
+    @property
+    def start(self):
+        return self.pos + 8
+
+
+class _FieldParagraph:
+    """누름틀을 포함한 문단 하나: 고칠 레코드의 위치와 필드 구간"""
+
+    def __init__(self, header_index, records):
+        _, _, _, level, payload = records[header_index]
+        self.header_index = header_index
+        self.header = payload
+        self.text_index = self.shape_index = self.line_seg_index = self.range_index = None
+        controls = []
+        self.control_records = []  # 컨트롤마다 (CTRL_HEADER 레코드 인덱스, 하위 레코드 끝 인덱스)
+        i = header_index + 1
+        while i < len(records) and records[i][3] > level:
+            _, _, tag_id, rec_level, rec_payload = records[i]
+            if rec_level == level + 1:
+                if tag_id == HWPTAG_PARA_TEXT:
+                    self.text_index = i
+                elif tag_id == HWPTAG_PARA_CHAR_SHAPE:
+                    self.shape_index = i
+                elif tag_id == HWPTAG_PARA_LINE_SEG:
+                    self.line_seg_index = i
+                elif tag_id == HWPTAG_PARA_RANGE_TAG:
+                    self.range_index = i
+                elif tag_id == HWPTAG_CTRL_HEADER:
+                    controls.append(Record(tag_id, rec_level, rec_payload))
+                    self.control_records.append([i, i + 1])
+            elif controls and self.control_records[-1][1] == i:
+                if rec_level == level + 2 and tag_id == HWPTAG_CTRL_DATA:
+                    controls[-1].children.append(Record(tag_id, rec_level, rec_payload))
+                self.control_records[-1][1] = i + 1
+            i += 1
+
+        text = records[self.text_index][4] if self.text_index is not None else b""
+        self.chars = list(struct.unpack(f"<{len(text) // 2}H", text[:len(text) // 2 * 2]))
+        shapes = records[self.shape_index][4] if self.shape_index is not None else b""
+        n = len(shapes) // 8
+        values = struct.unpack(f"<{n * 2}I", shapes[:n * 8])
+        self.runs = list(zip(values[0::2], values[1::2]))
+        ranges = records[self.range_index][4] if self.range_index is not None else b""
+        n = len(ranges) // 12
+        self.range_tags = [struct.unpack_from("<3I", ranges, k * 12) for k in range(n)]
+        self.roots = self._find_fields(controls)
+        self.fields = [f for f in self._walk(self.roots) if f.name is not None]
+
+    def _find_fields(self, controls):
+        """
+        문단의 필드를 중첩 구조(트리)로 찾습니다. 제어 문자는 본문 해석과 같이 8 WCHAR 단위로 건너뛰므로
+        확장 컨트롤의 부가 데이터를 제어 문자로 잘못 읽지 않습니다. 끝이 없는 필드는 버립니다.
+        """
+        roots = []
+        stack = []
+        ctrl_no = 0
+        chars = self.chars
+        i = 0
+        while i < len(chars):
+            code = chars[i]
+            if code >= 32 or code in CHAR_CONTROLS:
+                i += 1
+                continue
+            if code in EXTENDED_CONTROLS:
+                ctrl = controls[ctrl_no] if ctrl_no < len(controls) else None
+                for field in stack:
+                    field.ctrl_nos.append(ctrl_no)
+                if code == CTRL_FIELD_START:
+                    name = None
+                    if ctrl is not None and ctrl_id_of(ctrl.payload) == CTRL_ID_CLICK_HERE:
+                        name = field_name_of(ctrl) or None
+                    field = _Field(name, i, ctrl_no)
+                    (stack[-1].children if stack else roots).append(field)
+                    stack.append(field)
+                else:
+                    for field in stack:
+                        field.has_objects = True
+                ctrl_no += 1
+            elif code == CTRL_FIELD_END and stack:
+                stack.pop().end = i
+            i += 8
+
+        def closed(fields):
+            result = []
+            for field in fields:
+                if field.end is not None:
+                    field.children = closed(field.children)
+                    result.append(field)
+            return result
+        return closed(roots)
+
+    def _walk(self, fields):
+        for field in fields:
+            yield field
+            yield from self._walk(field.children)
+
+    def visible_text(self, start, end):
+        """[start, end) 구간에서 화면에 보이는 텍스트 (컨트롤 제외)"""
+        parts = []
+        chars = self.chars
+        i = start
+        while i < end:
+            code = chars[i]
+            if code >= 32:
+                parts.append(code)
+            elif code == 10:
+                parts.append(code)
+            if code >= 32 or code in CHAR_CONTROLS:
+                i += 1
+            else:
+                i += 8
+        return struct.pack(f"<{len(parts)}H", *parts).decode("utf-16-le", "surrogatepass")
+
+    def _field_text(self, field, values):
+        if field.name is not None and field.name in values:
+            return str(values[field.name])
+        return self.visible_text(field.start, field.end)
+
+    def _content(self, field, text, values, removed):
+        """
+        field 내용을 text로 바꾼 WCHAR 목록. 안쪽 필드는 그 필드의 값(없으면 현재 내용)이 text 안에 있으면
+        그 자리에 필드 그대로 남기고, 없으면 필드를 지웁니다. (지운 컨트롤 번호는 removed에 추가)
+        """
+        if field.has_objects:
+            raise HwpFormatError(f"누름틀 '{field.name}' 안에 개체가 있어 한/글 없이 채울 수 없습니다")
+        chars = []
+        cursor = 0
+        for child in field.children:
+            child_text = self._field_text(child, values)
+            at = text.find(child_text, cursor)
+            if at < 0:
+                if child.name in values and str(values[child.name]):
+                    raise HwpFormatError(
+                        f"누름틀 '{child.name}'은(는) '{field.name}' 안에 있어, "
+                        f"'{field.name}' 값에 '{child_text}'이(가) 없으면 함께 채울 수 없습니다")
+                removed.append(child.ctrl_no)
+                removed.extend(child.ctrl_nos)
+                continue
+            chars += encode_field_text(text[cursor:at])
+            chars += self.chars[child.pos:child.start]
+            chars += self._content(child, child_text, values, removed)
+            chars += self.chars[child.end:child.end + 8]
+            cursor = at + len(child_text)
+        chars += encode_field_text(text[cursor:])
+        return chars
+
+    def _targets(self, fields, values):
+        """채울 필드: values에 있는 가장 바깥 누름틀 (그 안의 필드는 바깥 필드와 함께 처리)"""
+        targets = []
+        for field in fields:
+            if field.name is not None and field.name in values:
+                targets.append(field)
+            else:
+                targets += self._targets(field.children, values)
+        return targets
+
+    def render(self, values):
+        """
+        값을 채운 레코드 데이터. {레코드 인덱스: 새 데이터 | None(레코드 삭제)}
+        채울 필드가 없으면 빈 dict.
+        """
+        targets = self._targets(self.roots, values)
+        if not targets:
+            return {}
+        chars = list(self.chars)
+        runs = list(self.runs)
+        range_tags = list(self.range_tags)
+        mask = struct.unpack_from("<I", self.header, 4)[0]
+        removed = []
+        # 뒤쪽 필드부터 바꿔야 앞쪽 위치가 그대로 유지됨
+        for field in sorted(targets, key=lambda f: f.pos, reverse=True):
+            start, end = field.start, field.end
+            new = self._content(field, str(values[field.name]), values, removed)
+            if 10 in new:
+                mask |= 1 << 10
+            chars[start:end] = new
+            runs = shift_char_shape_runs(runs, start, end, len(new))
+            range_tags = [(_map_position(s, start, end, len(new)), _map_position(e, start, end, len(new)), tag)
+                          for s, e, tag in range_tags]
+
+        header = bytearray(self.header)
+        nchars = struct.unpack_from("<I", header, 0)[0]
+        struct.pack_into("<II", header, 0, (nchars & 0x80000000) | len(chars), mask)
+        if len(header) >= 18:
+            # 글자 모양 수, 영역 태그 수, 줄 정보 수 (줄 정보는 지워서 한/글이 열 때 다시 배치하게 함)
+            struct.pack_into("<3H", header, 12, len(runs), len(range_tags), 0)
+        patch = {
+            self.header_index: bytes(header),
+            self.text_index: struct.pack(f"<{len(chars)}H", *chars),
+        }
+        if self.shape_index is not None:
+            patch[self.shape_index] = b"".join(struct.pack("<II", pos, shape_id) for pos, shape_id in runs)
+        if self.range_index is not None:
+            patch[self.range_index] = b"".join(struct.pack("<3I", *tag) for tag in range_tags)
+        if self.line_seg_index is not None:
+            patch[self.line_seg_index] = None
+        # 내용과 함께 지운 안쪽 필드의 컨트롤 레코드 (하위 레코드 포함)
+        for ctrl_no in removed:
+            first, last = self.control_records[ctrl_no]
+            for index in range(first, last):
+                patch[index] = None
+        return patch
+
+
+class _FieldSection:
+    """누름틀이 있는 구역 스트림: 압축을 푼 원본과 누름틀 문단 목록"""
+
+    def __init__(self, entry_index, data):
+        self.entry_index = entry_index
+        self.data = data
+        self.records = list(iter_records_with_offsets(data))
+        self.paragraphs = []
+        for i, (_, _, tag_id, _, payload) in enumerate(self.records):
+            if tag_id == HWPTAG_PARA_HEADER:
+                para = _FieldParagraph(i, self.records)
+                if para.fields and para.text_index is not None:
+                    self.paragraphs.append(para)
+
+    def field_names(self):
+        return [field.name for para in self.paragraphs for field in para.fields]
+
+    def render(self, values):
+        """값을 채운 구역 데이터 (압축 전). 바뀐 내용이 없으면 None."""
+        patch = {}
+        for para in self.paragraphs:
+            patch.update(para.render(values))
+        if not patch:
+            return None
+        parts = []
+        position = 0
+        for index in sorted(patch):
+            start, end, tag_id, level, _ = self.records[index]
+            parts.append(self.data[position:start])
+            if patch[index] is not None:
+                parts.append(encode_record(tag_id, level, patch[index]))
+            position = end
+        parts.append(self.data[position:])
+        return b"".join(parts)
+
+
+# ---------------------------------------------------------------------
+# 문서 단위 API
+# ---------------------------------------------------------------------
+
+class Hwp5Template:
+    """
+    한/글 없이 누름틀을 채우는 HWP5 템플릿.
+    파일을 한 번 읽어 스트림 원본과 누름틀 위치를 기억해 두므로, 같은 템플릿으로 여러 문서를 만들 때는
+    값마다 누름틀 문단만 고치고 바뀐 구역만 다시 압축합니다.
+
+        template = Hwp5Template("templates/알림장.hwp")
+        template.save("output/알림장_0001.hwp", {"문서제목 자동생성 필드": "..."})
+    """
+
+    def __init__(self, file_path, compress_level=DEFAULT_COMPRESS_LEVEL):
+        self.file_path = file_path
+        self.compress_level = compress_level
+        with hwp5_reader.Hwp5File(file_path) as doc:
+            self.compressed = doc.compressed
+            cfb = doc.cfb
+            self._directory = cfb.raw_directory()
+            self._streams = {cfb.entry_index(path): cfb.read_stream(path) for path in cfb.list_streams()}
+            self._sections = []
+            for path in doc.section_names():
+                data = doc._read_stream(path)
+                if CLICK_HERE_BYTES in data:
+                    section = _FieldSection(cfb.entry_index(path), data)
+                    if section.paragraphs:
+                        self._sections.append(section)
+        self.field_names = list(dict.fromkeys(name for s in self._sections for name in s.field_names()))
+
+    def _compress(self, data):
+        if not self.compressed:
+            return data
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+        return compressor.compress(data) + compressor.flush()
+
+    def render(self, values):
+        """
+        누름틀 값을 채운 문서 파일 전체(bytes). values에 없는 누름틀은 템플릿 내용을 그대로 둡니다.
+        템플릿에 없는 이름이나, 바깥 누름틀 값에 밀려 쓸 수 없는 안쪽 누름틀 값이 있으면 HwpFormatError.
+        """
+        values = {name: "" if value is None else value for name, value in values.items()}
+        unknown = [name for name in values if name not in self.field_names]
+        if unknown:
+            raise HwpFormatError(f"템플릿에 없는 누름틀입니다: {', '.join(unknown)}")
+        streams = dict(self._streams)
+        for section in self._sections:
+            data = section.render(values)
+            if data is not None:
+                streams[section.entry_index] = self._compress(data)
+        return build_compound_file(self._directory, streams)
+
+    def save(self, output_path, values):
+        """누름틀을 채워 output_path에 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+        data = self.render(values)
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return output_path
+
+
+def fill_fields(template_path, output_path, values):
+    """템플릿의 누름틀을 values로 채워 output_path에 저장합니다. (한 번만 쓸 때)"""
+    return Hwp5Template(template_path).save(output_path, values)
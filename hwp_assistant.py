@@ -1,40 +1,95 @@
-import win32com.client as win32
-import subprocess
 import json
 import sys
 import os
 import re
-import win32clipboard as cb, win32con
-import pythoncom
+from concurrent.futures import ThreadPoolExecutor
+
+import com_pool
+import context_loader
+import extraction_cache
+import line_index
+import llm_cache
+import llm_client
+import mail_merge
+import style_analysis
+import style_registry
+import template_index
+from hwp_backends import create_backend, ReadOnlyBackendError
+
+try:
+    import win32com.client as win32
+    import win32clipboard as cb, win32con
+    import pythoncom
+except ImportError:
+    # native / memory 백엔드는 pywin32 없이도 동작
+    win32 = cb = win32con = pythoncom = None
 
 class HWPAssistant:
-    def __init__(self):
+    def __init__(self, backend="com", llm=None):
+        """
+        Args:
+            backend (str | DocumentBackend): 'com'(기본, 편집 가능), 'native'(읽기 전용, 한/글 불필요),
+                'memory'(메모리 내 편집) 또는 직접 만든 백엔드 객체.
+            llm (LLMClient): Gemini 호출에 쓸 클라이언트. 없으면 첫 호출 때 전역 클라이언트를 사용.
+        """
         try:
             pythoncom.CoInitialize()
         except:
             pass
 
-        self.hwp = None
+        self.backend = create_backend(backend)
         self.is_opened = False
         self.current_file = ""
         self.document_context = ""
+        self._llm = llm
+        self.use_llm_cache = llm_cache.CACHE_ENABLED
+        self.last_llm_cache = None  # 마지막 call_gemini의 캐시 결과: "hit" | "miss" | "bypass"
+        self._line_index = None  # 문서 스냅샷별 줄 번호 → 위치 색인 (COM 백엔드)
+        self._prepared_styles = {}  # 스타일 내용 키 -> 이 HwpObject용 PreparedStyle
+        context_loader.get_loader().preload()
+
+    @property
+    def llm(self):
+        """프로세스 안에서 재사용하는 LLM 클라이언트 (GUI 시작을 늦추지 않도록 처음 쓸 때 생성)"""
+        if self._llm is None:
+            self._llm = llm_client.get_client()
+        return self._llm
+
+    @property
+    def hwp(self):
+        """COM 백엔드의 HwpObject (다른 백엔드에서는 None)"""
+        return self.backend.hwp
+
+    @hwp.setter
+    def hwp(self, value):
+        self.backend.hwp = value
+
+    def _can_edit(self, action):
+        """현재 백엔드가 편집을 지원하는지 확인"""
+        if self.backend.read_only:
+            print(f"❌ '{self.backend.name}' 백엔드는 읽기 전용이라 {action}을(를) 할 수 없습니다.")
+            return False
+        return True
+
+    def _can_use_com(self, action):
+        """현재 백엔드에 한/글 HwpObject가 있는지 확인 (표 삽입, 서식 적용 등 COM 전용 기능)"""
+        if not self.backend.supports_com or self.hwp is None:
+            print(f"❌ '{self.backend.name}' 백엔드에서는 {action}을(를) 할 수 없습니다. 한/글(COM) 백엔드가 필요합니다.")
+            return False
+        return True
 
     def open_file(self, file_path):
         if self.is_opened:
             print("⚠️  이미 파일이 열려있습니다. 'close' 명령으로 먼저 닫아주세요.")
             return False
         try:
-            if self.hwp is None:
-                pythoncom.CoInitialize()
-                self.hwp = win32.gencache.EnsureDispatch("HWPFrame.HwpObject")
-                self.hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
-                self.hwp.XHwpWindows.Item(0).Visible = True
-
-            self.hwp.Open(file_path)
+            self.backend.open(file_path)
             self.is_opened = True
             self.current_file = os.path.abspath(file_path)
             
-            full_text = self.hwp.GetTextFile("TEXT", "")
+            # 열 때의 텍스트 스냅샷은 파일 내용이 같으면 캐시에서 바로 가져옴
+            full_text = extraction_cache.get_cache().get_or_compute(
+                file_path, f"text-{self.backend.name}", self.backend.get_text)
             self.document_context = f"""
 ### 현재 문서 컨텍스트
 - **파일명**: {os.path.basename(file_path)}
@@ -43,11 +98,12 @@ class HWPAssistant:
 {full_text[:1000]}...
 """
             print(f"✅ 파일이 열렸습니다: {file_path}")
-            print("🖥️  HWP 창이 화면에 표시되었습니다. 이제 텍스트를 선택하고 명령을 내리세요.")
+            if self.hwp:
+                print("🖥️  HWP 창이 화면에 표시되었습니다. 이제 텍스트를 선택하고 명령을 내리세요.")
             return True
         except Exception as e:
             print(f"❌ 파일 열기 실패: {e}")
-            if self.hwp: self.hwp.Quit()
+            self.backend.close()
             return False
 
     def _detect_document_type(self, text):
@@ -59,79 +115,56 @@ class HWPAssistant:
     def get_selected_text(self):
         if not self.is_opened: return ""
         try:
-            self.hwp.InitScan(0x01, 0x00ff); texts = []
-            while True:
-                status, txt = self.hwp.GetText()
-                if status == 0: break
-                texts.append(txt)
-            self.hwp.ReleaseScan(); return "".join(texts).strip()
+            return self.backend.get_selected_text()
         except Exception: return ""
 
     def replace_selected_text(self, new_text):
-        if not self.is_opened: return False
+        if not self.is_opened or not self._can_edit("텍스트 교체"): return False
         try:
-            pset = self.hwp.HParameterSet.HInsertText
-            pset.Text = new_text
-            self.hwp.HAction.Execute("InsertText", pset.HSet)
-            return True
+            return self.backend.replace_selected_text(new_text)
         except Exception as e:
             print(f"❌ 텍스트 교체 실패: {e}", file=sys.stderr); return False
 
     def _find_context_file(self, filename):
-        """컨텍스트 파일을 여러 경로에서 찾기"""
-        # 1. 현재 작업 디렉토리
-        if os.path.exists(filename):
-            return filename
-        
-        # 2. 스크립트가 있는 디렉토리
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        script_path = os.path.join(script_dir, filename)
-        if os.path.exists(script_path):
-            return script_path
-        
-        # 3. 열린 HWP 파일과 같은 디렉토리
-        if self.current_file:
-            hwp_dir = os.path.dirname(self.current_file)
-            hwp_path = os.path.join(hwp_dir, filename)
-            if os.path.exists(hwp_path):
-                return hwp_path
-        
-        # 4. 일반적인 컨텍스트 파일 경로들
-        common_paths = [
-            os.path.join(os.getcwd(), "context", filename),
-            os.path.join(os.getcwd(), "instructions", filename),
-            os.path.join(script_dir, "context", filename),
-            os.path.join(script_dir, "instructions", filename)
-        ]
-        
-        for path in common_paths:
-            if os.path.exists(path):
-                return path
-        
-        return None
+        """컨텍스트 파일을 여러 경로에서 찾기 (탐색 결과는 context_loader가 기억)"""
+        return context_loader.get_loader().resolve(filename, self.current_file)
 
-    def call_gemini(self, user_request, context_data, mode="default"):
+    def call_gemini(self, user_request, context_data, mode="default", use_cache=None, stream=False):
         """
         다양한 작업 모드를 지원하는 통합 Gemini 호출 메서드.
+        응답 캐시 결과("hit" | "miss" | "bypass")는 self.last_llm_cache에 남깁니다.
 
         Args:
             user_request (str): 사용자의 원본 요청 문자열.
             context_data (str): AI가 참고할 주된 데이터 (선택된 텍스트, 문서 전체 등).
             mode (str): 작업 모드 ('default', 'template_analysis', 'template_apply').
+            use_cache (bool): False면 응답 캐시를 건너뛰고 새로 호출. None이면 self.use_llm_cache를 따름.
+            stream (bool): True면 응답 조각을 도착하는 대로 내보내는 제너레이터를 반환.
+                중간에 close()하면 요청을 취소하며, 실패는 LLMError로 전달됩니다.
+        """
+        response, self.last_llm_cache = self._call_gemini(user_request, context_data, mode, use_cache, stream)
+        return response
+
+    def _call_gemini(self, user_request, context_data, mode="default", use_cache=None, stream=False):
+        """
+        call_gemini의 본체. 공유 상태를 바꾸지 않으므로 여러 스레드에서 동시에 불러도 됩니다.
+
+        Returns:
+            tuple: (응답, 캐시 결과 "hit" | "miss" | "bypass")
         """
-        
         # --- 1. 시스템 지침(Instruction) 결정 ---
         instruction_map = {
             "template_analysis": "instructions/template_analysis.md",
             "template_apply": "instructions/template_application.md",
+            "document_style_analysis": "instructions/document_style_analysis.md",
             "default": "instructions/default_modification.md" # 기본 수정 지침
         }
+        loader = context_loader.get_loader()
         instruction_path = self._find_context_file(instruction_map.get(mode, "default_modification.md"))
         system_instruction = ""
         if instruction_path:
             try:
-                with open(instruction_path, 'r', encoding='utf-8') as f:
-                    system_instruction = f.read()
+                system_instruction = loader.read(instruction_path)
                 print(f"✅ 시스템 지침 로드: {instruction_path}")
             except Exception as e:
                 print(f"⚠️ 시스템 지침 파일 읽기 오류: {e}")
@@ -144,9 +177,9 @@ class HWPAssistant:
                 actual_path = self._find_context_file(filename)
                 if actual_path:
                     try:
-                        with open(actual_path, 'r', encoding='utf-8') as f:
-                            user_context += f"\n--- 사용자 제공 컨텍스트: {os.path.basename(actual_path)} ---\n"
-                            user_context += f.read()
+                        content = loader.read(actual_path)
+                        user_context += f"\n--- 사용자 제공 컨텍스트: {os.path.basename(actual_path)} ---\n"
+                        user_context += content
                         print(f"📎 추가 컨텍스트 로드: {actual_path}")
                     except Exception as e:
                         print(f"⚠️ 컨텍스트 파일 읽기 오류: {e}")
@@ -168,16 +201,52 @@ class HWPAssistant:
     ---
     너의 임무는 위의 모든 정보를 종합하여, '시스템 지침'에 명시된 대로 **오직 최종 결과물만** 출력하는 것이다.
     """
-        # --- 4. Gemini CLI 호출 ---
+        # --- 4. 응답 캐시 확인 (같은 모드/지침/컨텍스트/데이터/요청이면 재사용) ---
+        if use_cache is None:
+            use_cache = self.use_llm_cache
+        # 키에 모델 이름이 들어가므로 클라이언트를 먼저 정함
+        llm = self.llm
+        cache = llm_cache.get_cache()
+        cache_key = llm_cache.make_key(mode, system_instruction, user_context, context_data, user_request,
+                                       model=llm.model_name)
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached:
+                print(f"💾 캐시된 Gemini 응답 사용 ({cache.summary()})")
+                return (iter([cached]) if stream else cached), "hit"
+            status = "miss"
+        else:
+            status = "bypass"
+
+        if stream:
+            return self._stream_gemini(llm, prompt, cache, cache_key, mode), status
+
+        # --- 5. Gemini 호출 (SDK/REST 연결 재사용, 실패 시 CLI) ---
         try:
-            command = 'gemini --model gemini-2.5-flash'
-            result = subprocess.run(command, input=prompt, text=True, capture_output=True, encoding='utf-8', shell=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                print(f"❌ Gemini 호출 실패: {result.stderr.strip()}"); return None
+            response = llm.generate(prompt)
+            if response:
+                try:
+                    cache.put(cache_key, response, mode)
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"⚠️ Gemini 응답 캐시 저장 실패: {e}")
+            return response, status
+        except llm_client.LLMError as e:
+            print(f"❌ Gemini 호출 실패: {e}"); return None, status
         except Exception as e:
-            print(f"❌ Gemini 호출 오류: {e}"); return None
+            print(f"❌ Gemini 호출 오류: {e}"); return None, status
+
+    def _stream_gemini(self, llm, prompt, cache, cache_key, mode):
+        """응답 조각을 그대로 내보내고, 끝까지 받은 응답만 캐시에 저장 (취소된 응답은 저장하지 않음)"""
+        pieces = []
+        for piece in llm.stream(prompt):
+            pieces.append(piece)
+            yield piece
+        response = "".join(pieces).strip()
+        if response:
+            try:
+                cache.put(cache_key, response, mode)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"⚠️ Gemini 응답 캐시 저장 실패: {e}")
 
 
     
@@ -208,7 +277,7 @@ class HWPAssistant:
 
     def insert_table(self, markdown_table: str) -> bool:
         """마크다운 표를 HWP 문서에 삽입"""
-        if not self.is_opened or not markdown_table:
+        if not self.is_opened or not markdown_table or not self._can_use_com("표 삽입"):
             return False
 
         # 1) 마크다운 파싱
@@ -274,8 +343,8 @@ class HWPAssistant:
         if not self.is_opened:
             return None
         
-        # 전체 텍스트 추출
-        full_text = self.hwp.GetTextFile("TEXT", "")
+        # 전체 텍스트 추출 (읽기 작업이므로 네이티브 백엔드에서도 동작)
+        full_text = self.backend.get_text()
         
         # 문서 구조 정보 수집
         structure_info = {
@@ -329,24 +398,41 @@ class HWPAssistant:
             print(f"❌ 템플릿 저장 실패: {e}")
             return False
 
-    def create_document_from_template(self, template_name, field_values):
-        """템플릿을 바탕으로 새 문서 생성 (누름틀 제거 포함)"""
-        template_path = os.path.join(os.getcwd(), "templates", f"{template_name}.hwp")
-        
+    def create_document_from_template(self, template_name, field_values, output_format="hwp"):
+        """
+        템플릿을 바탕으로 새 문서 생성 (누름틀 제거 포함)
+
+        output_format이 "hwpx"이고 templates/에 같은 이름의 .hwpx 템플릿이 있으면
+        한/글 없이 zip을 흘려 쓰며 바로 채웁니다. (hwpx_writer)
+        """
+        templates_dir = os.path.join(os.getcwd(), "templates")
+        template_path = os.path.join(templates_dir, f"{template_name}.hwp")
+        hwpx_template_path = os.path.join(templates_dir, f"{template_name}.hwpx")
+        ext = ".hwpx" if output_format == "hwpx" else ".hwp"
+
+        if os.path.exists(hwpx_template_path) and (ext == ".hwpx" or not os.path.exists(template_path)):
+            if ext != ".hwpx":
+                print("⚠️ HWPX 템플릿만 있어 HWPX로 저장합니다.")
+            return self._create_document_native(hwpx_template_path, template_name, field_values)
+
         if not os.path.exists(template_path):
             print(f"❌ 템플릿 파일이 없습니다: {template_path}")
             return False
         
+        if not self.backend.supports_com:
+            if ext == ".hwpx":
+                print("❌ HWP 템플릿을 HWPX로 저장하려면 한/글이 필요합니다. HWPX 템플릿을 추가하세요.")
+                return False
+            # 한/글 없이 누름틀을 직접 채워 저장
+            return self._create_document_native(template_path, template_name, field_values)
+
         try:
             # 기존에 열린 파일이 있다면 닫기
             if self.is_opened:
                 self.close_file()
 
-            if not self.hwp:
-                pythoncom.CoInitialize()
-                self.hwp = win32.gencache.EnsureDispatch("HWPFrame.HwpObject")
-                self.hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
-                self.hwp.XHwpWindows.Item(0).Visible = True
+            if not self._can_edit("템플릿 문서 생성"):
+                return False
 
             # 템플릿 파일 열기
             if not self.open_file(template_path):
@@ -355,18 +441,19 @@ class HWPAssistant:
             
             # 1단계: 필드 값 적용
             print("🔄 누름틀에 값을 입력합니다...")
+            failed = []
             for field_name, field_value in field_values.items():
                 #merged_field_name = field_name+" 자동생성 필드"
                 merged_field_name = field_name
                 try:
-                    # ✨ hwp 객체 상태 재확인
-                    if not self.hwp:
-                        raise Exception("HWP 객체가 None입니다")
-                        
-                    self.hwp.PutFieldText(merged_field_name, str(field_value))
+                    self.backend.put_field_text(merged_field_name, str(field_value))
                     print(f"✅ 필드 '{field_name}' -> '{field_value}' 적용 완료")
                 except Exception as e:
                     print(f"⚠️ 필드 '{field_name}' 적용 실패: {e}")
+                    failed.append(field_name)
+            if failed:
+                print(f"❌ 누름틀 {len(failed)}개를 채우지 못해 문서를 저장하지 않았습니다: {', '.join(failed)}")
+                return False
 
             
             # 2단계: 모든 누름틀 제거 (텍스트는 유지)
@@ -374,15 +461,8 @@ class HWPAssistant:
             #self._remove_all_fields()
             
             # 3단계: 새로운 파일로 저장
-            import datetime
-            output_dir = os.path.join(os.getcwd(), "output")
-            os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, f"{template_name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.hwp")
-            
-            if not self.hwp:
-                raise Exception("저장 중 HWP 객체가 None입니다")
-                
-            self.hwp.SaveAs(output_path)
+            output_path = self._template_output_path(template_name, ext)
+            self.backend.save_as(output_path, "HWPX" if ext == ".hwpx" else None)
             print(f"📄 완성된 문서 저장: {output_path}")
 
             return True
@@ -390,9 +470,44 @@ class HWPAssistant:
             print(f"❌ 템플릿 문서 생성 실패: {e}")
             return False
 
+    def _template_output_path(self, template_name, ext):
+        """output/템플릿_날짜_시각.ext (같은 초에 여러 번 만들어도 덮어쓰지 않도록 겹치면 _2, _3 ... 을 붙임)"""
+        import datetime
+        output_dir = os.path.join(os.getcwd(), "output")
+        os.makedirs(output_dir, exist_ok=True)
+        return mail_merge.unique_path(os.path.join(
+            output_dir, f"{template_name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"))
+
+    def _create_document_native(self, template_path, template_name, field_values):
+        """한/글 없이 템플릿의 누름틀을 채워 템플릿과 같은 형식의 새 파일로 저장 (hwp5_writer / hwpx_writer)"""
+        try:
+            template = mail_merge.load_native_template(template_path)
+            unknown = [name for name in field_values if name not in template.field_names]
+            if unknown:
+                print(f"⚠️ 템플릿에 없는 필드는 건너뜁니다: {', '.join(unknown)}")
+            output_path = self._template_output_path(template_name, os.path.splitext(template_path)[1])
+            template.save(output_path, {k: str(v) for k, v in field_values.items()})
+            print(f"📄 완성된 문서 저장: {output_path}")
+            return True
+        except Exception as e:
+            print(f"❌ 템플릿 문서 생성 실패: {e}")
+            return False
+
+    def mail_merge(self, template_name, data_path, **kwargs):
+        """
+        CSV/JSONL 파일의 행마다 템플릿 문서를 하나씩 만듭니다. (mail_merge.merge_file 참고)
+        열려 있는 문서와 상관없이 별도의 한/글 인스턴스 풀이나 네이티브 writer에서 실행됩니다.
+        """
+        summary = mail_merge.merge_file(template_name, data_path, **kwargs)
+        print(f"📄 편지 병합: 성공 {summary['succeeded']}개, 실패 {summary['failed']}개, "
+              f"건너뜀 {summary['skipped']}개")
+        return summary
+
     # 모든 누름틀 삭제 예시
     def _remove_all_fields(self):
         """문서 내 모든 누름틀 제거 (텍스트는 유지) - 팝업 차단 강화"""
+        if not self._can_use_com("누름틀 제거"):
+            return False
         try:
             # ✨ 강화된 팝업 차단 설정
             self.hwp.SetMessageBoxMode(0x00010001)  # 기본 팝업 차단
@@ -432,7 +547,7 @@ class HWPAssistant:
 
     def convert_text_to_field(self, search_text: str, field_name: str):
         """search_text를 찾아 CreateField()로 누름틀 변환 (가장 안정적인 방법)"""
-        if not self.is_opened:
+        if not self.is_opened or not self._can_use_com("누름틀 변환"):
             return False
         
         try:
@@ -472,179 +587,241 @@ class HWPAssistant:
             self.hwp.SetMessageBoxMode(0)
 
     def get_field_list_from_file(self, template_name):
-        """템플릿 파일에서 누름틀 필드 목록을 가져옵니다."""
+        """템플릿 파일에서 누름틀 필드 목록을 가져옵니다. (templates/ 색인을 먼저 사용)"""
+        try:
+            return template_index.get_index().fields(template_name)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            print(f"⚠️ 템플릿 색인을 사용할 수 없어 문서에서 직접 읽습니다: {e}")
+
         template_path = os.path.join(os.getcwd(), "templates", f"{template_name}.hwp")
         
         if not os.path.exists(template_path):
             raise FileNotFoundError(f"템플릿 파일이 없습니다: {template_path}")
+
+        # COM이 아닌 백엔드는 현재 문서를 건드리지 않고 파일을 직접 읽음
+        if self.backend.name != "com":
+            return self.backend.read_field_list(template_path)
         
-        # 현재 열린 파일이 있다면 상태 저장 후 닫기
-        was_opened = self.is_opened
-        original_file = self.current_file
-        
-        if was_opened:
-            self.hwp.Save() # 혹시 모를 변경사항 저장
-            self.hwp.Quit()
-            self.is_opened = False
-
-        # 임시로 템플릿 파일 열기
-        self.hwp = win32.gencache.EnsureDispatch("HWPFrame.HwpObject")
-        self.hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
-        self.hwp.XHwpWindows.Item(0).Visible = False # 화면에 보이지 않게 처리
-        self.hwp.Open(template_path)
-        
-        # 필드 목록 가져오기
-        field_list_raw = self.hwp.GetFieldList(0, "")
-        fields = [f.strip() for f in field_list_raw.split('\x02') if f.strip()]
-        
-        # 임시 파일 닫기
-        self.hwp.Quit()
-        
-        # 원래 파일이 있었다면 다시 열기
-        if was_opened:
-            self.open_file(original_file)
-        else:
-            self.hwp = None # hwp 객체 초기화
-            
-        return fields
+        # 미리 띄워 둔 숨김 인스턴스에서 읽으므로 사용자가 열어 둔 문서는 그대로 둠
+        def read_fields(hwp):
+            field_list_raw = hwp.GetFieldList(0, "")
+            return [f.strip() for f in field_list_raw.split('\x02') if f.strip()]
+
+        return extraction_cache.get_cache().get_or_compute(
+            template_path, "fields-com", lambda: com_pool.get_pool().run_document(template_path, read_fields))
 
 
     def get_style_list(self):
-        """'styles' 폴더에서 사용 가능한 스타일(.json) 목록을 반환합니다."""
-        style_dir = os.path.join(os.getcwd(), "styles")
-        if not os.path.exists(style_dir):
-            os.makedirs(style_dir)
-            return []
-        
+        """'styles' 폴더에서 사용 가능한 스타일(.json) 목록을 반환합니다. (폴더가 바뀌었을 때만 다시 읽음)"""
         try:
-            styles = [f[:-5] for f in os.listdir(style_dir) if f.endswith('.json')]
-            return styles
+            return style_registry.get_registry().names()
         except Exception as e:
             print(f"❌ 스타일 목록 로딩 실패: {e}")
             return []
 
-    def apply_style_to_selection(self, style_data):
-        """JSON 데이터를 바탕으로 선택 영역에 스타일을 적용합니다."""
+    def _prepared_style(self, style):
+        """이 HwpObject에 맞춰 액션/파라미터 셋을 채워 둔 스타일 (스타일 내용이 같으면 재사용)"""
+        prepared = self._prepared_styles.get(style.key)
+        if prepared is None:
+            prepared = self._prepared_styles[style.key] = style_registry.PreparedStyle(self.hwp, style)
+        return prepared
+
+    def apply_style_to_selection(self, style):
+        """
+        선택 영역에 스타일을 적용합니다.
+
+        Args:
+            style: 스타일 이름(styles/<이름>.json), 스타일 JSON dict 또는 style_registry.CompiledStyle
+        """
         if not self.is_opened:
             print("❌ 스타일을 적용할 파일이 열려있지 않습니다.")
             return False
+        if not self._can_use_com("스타일 적용"):
+            return False
             
         try:
-            # --- 1. 글자 모양 적용 (CharShape) ---
-            if "CharShape" in style_data:
-                char_action = self.hwp.CreateAction("CharShape")
-                char_set = char_action.CreateSet()
-                char_action.GetDefault(char_set)
-                
-                for key, value in style_data["CharShape"].items():
-                    char_set.SetItem(key, value)
-                    
-                char_action.Execute(char_set)
-                print("✅ 글자 모양 적용 완료")
-
-            # --- 2. 문단 모양 적용 (ParaShape) ---
-            if "ParaShape" in style_data:
-                para_action = self.hwp.CreateAction("ParagraphShape")
-                para_set = para_action.CreateSet()
-                para_action.GetDefault(para_set)
-                
-                for key, value in style_data["ParaShape"].items():
-                    para_set.SetItem(key, value)
-                    
-                para_action.Execute(para_set)
-                print("✅ 문단 모양 적용 완료")
-                
+            compiled = style_registry.compile_style(style)
+            if compiled is None:
+                print(f"❌ 스타일을 찾을 수 없습니다: {style}")
+                return False
+            # 글자 모양(CharShape) / 문단 모양(ParaShape) 파라미터 셋은 처음 한 번만 만들고 Execute만 반복
+            for section in self._prepared_style(compiled).execute():
+                print(f"✅ {'글자' if section == 'CharShape' else '문단'} 모양 적용 완료")
             return True
         except Exception as e:
             print(f"❌ 스타일 적용 실패: {e}")
             return False
- 
 
+    def analyze_document_structure(self, chunked=None, max_chars=None, concurrency=None):
+        """
+        문서 구조를 분석하여 스타일 적용 계획을 생성
+
+        Args:
+            chunked (bool): True면 문단 경계에서 나눈 조각을 동시에 분석해 합침.
+                None이면 번호 붙은 텍스트가 max_chars를 넘을 때만 나눔.
+            max_chars (int): 조각 하나의 최대 길이 (기본 HWP_STYLE_CHUNK_CHARS)
+            concurrency (int): 동시에 보낼 Gemini 요청 수 (기본 HWP_STYLE_CONCURRENCY)
 
-    def analyze_document_structure(self):
-        """문서 구조를 분석하여 스타일 적용 계획을 생성"""
+        Returns:
+            str: Gemini 응답 (나눠 분석한 경우 합친 {"style_plan": [...]} JSON)
+        """
         if not self.is_opened:
             return None
         
         try:
-            # 전체 텍스트와 줄 정보 가져오기
-            full_text = self.hwp.GetTextFile("TEXT", "")
-            lines = full_text.split('\n')
-            
-            # 줄 번호와 함께 텍스트 정보 구성
-            numbered_text = []
-            for i, line in enumerate(lines, 1):
-                if line.strip():  # 빈 줄 제외
-                    numbered_text.append(f"줄 {i}: {line.strip()}")
+            # 전체 텍스트와 줄 정보 가져오기 (빈 줄 제외, 줄 번호는 문서 기준)
+            full_text = self.backend.get_text()
+            index = self.get_line_index(full_text)
+            # COM 백엔드는 스타일 적용 때 쓰는 색인과 같은 줄로 번호를 매김
+            lines, blanks = style_analysis.numbered_lines(index.text if index else full_text)
+            analysis_text = style_analysis.format_lines(lines)
+            max_chars = max_chars or style_analysis.DEFAULT_CHUNK_CHARS
             
-            analysis_text = '\n'.join(numbered_text)
-            
-            # Gemini에게 구조 분석 요청
             analysis_request = "이 문서의 구조를 분석하여 각 부분에 적절한 스타일을 제안해줘."
-            result = self.call_gemini(
-                analysis_request, 
-                analysis_text, 
-                mode="document_style_analysis"
-            )
-            
-            return result
+            if chunked is None:
+                chunked = len(analysis_text) > max_chars
+            chunks = style_analysis.split_chunks(lines, blanks, max_chars) if chunked else []
+            if len(chunks) <= 1:
+                # Gemini에게 구조 분석 요청 (한 번에)
+                return self.call_gemini(analysis_request, analysis_text, mode="document_style_analysis")
+            
+            return self._analyze_document_chunks(analysis_request, chunks, blanks,
+                                                 concurrency or style_analysis.DEFAULT_CONCURRENCY)
         except Exception as e:
             print(f"❌ 문서 구조 분석 실패: {e}")
             return None
 
-    def select_text_by_line_range(self, start_line, end_line):
-        """지정된 줄 범위의 텍스트를 선택"""
+    def _analyze_document_chunks(self, analysis_request, chunks, blanks, concurrency):
+        """
+        조각별 분석(map)을 동시에 실행하고 줄 번호를 되돌려 하나의 계획으로 합침(reduce).
+        캐시 결과는 조각마다 받아 두었다가 모두 끝난 뒤 한 번만 last_llm_cache에 남깁니다.
+        (모든 조각이 같으면 그 값, 하나라도 새로 호출했으면 "miss")
+        """
+        print(f"📚 긴 문서를 {len(chunks)}개 조각으로 나눠 분석합니다 (동시 {concurrency}개)")
+
+        def analyze(index, chunk):
+            local, line_map = style_analysis.localize(chunk)
+            request = (f"{analysis_request}\n(긴 문서의 {index + 1}/{len(chunks)}번째 부분입니다. "
+                       f"줄 번호는 이 부분 안에서 1부터 매겼습니다.)")
+            result, status = self._call_gemini(request, style_analysis.format_lines(local),
+                                               mode="document_style_analysis")
+            plan = style_analysis.parse_style_plan(result)
+            if plan is None:
+                print(f"⚠️ {index + 1}번째 조각 분석 결과를 해석하지 못했습니다")
+                return [], status
+            return style_analysis.renumber(plan, line_map), status
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            results = list(executor.map(analyze, range(len(chunks)), chunks))
+        plans = [plan for plan, _ in results]
+        statuses = {status for _, status in results}
+        self.last_llm_cache = statuses.pop() if len(statuses) == 1 else "miss"
+
+        if not any(plans):
+            return None
+        merged = style_analysis.merge_plans(plans, blanks)
+        print(f"✅ 조각 분석 결과 병합: {sum(len(p) for p in plans)}개 → {len(merged)}개 구간")
+        return json.dumps({"style_plan": merged}, ensure_ascii=False)
+
+    def get_line_index(self, full_text=None):
+        """
+        줄 번호 → (list, para, pos) 색인. 문서 텍스트가 지난번과 같으면 다시 만들지 않습니다.
+        한/글이 없는 백엔드에서는 None.
+        """
+        if not self.hwp:
+            return None
+        if full_text is None:
+            full_text = self.backend.get_text()
+        snapshot = line_index.snapshot_key(self.current_file, full_text)
+        if self._line_index is None or self._line_index.snapshot != snapshot:
+            self._line_index = line_index.build(self.hwp, snapshot)
+            print(f"📑 줄 위치 색인 생성: {len(self._line_index)}줄")
+        return self._line_index
+
+    def _select_segment(self, segment):
+        """한 목록 안의 구간을 SetPos + SelectText로 선택"""
+        list_id, start_para, start_pos, end_para, end_pos = segment
+        self.hwp.SetPos(list_id, start_para, start_pos)
+        return bool(self.hwp.SelectText(start_para, start_pos, end_para, end_pos))
+
+    def select_text_by_line_range(self, start_line, end_line, index=None):
+        """
+        지정된 줄 범위의 텍스트를 선택 (줄 번호는 analyze_document_structure와 같은 색인 기준)
+        표 안팎에 걸친 범위는 한 번에 선택할 수 없으므로 선택하지 않고 False를 반환합니다.
+        이때는 apply_smart_styles처럼 get_line_index().segments()의 구간마다 선택하세요.
+        """
         try:
-            # 문서 처음으로 이동
-            self.hwp.HAction.Run("MoveDocBegin")
-            
-            # 시작 줄로 이동
-            for i in range(start_line - 1):
-                self.hwp.HAction.Run("MoveDown")
-            
-            # 줄 선택 시작
-            self.hwp.HAction.Run("MoveLineBegin")
-            self.hwp.HAction.Run("SelectMode")
-            
-            # 끝 줄까지 선택
-            for i in range(end_line - start_line):
-                self.hwp.HAction.Run("MoveDown")
-            self.hwp.HAction.Run("MoveLineEnd")
-            
-            return True
+            index = index or self.get_line_index()
+            if index is None:
+                print("❌ 줄 범위 선택은 한/글(COM) 백엔드에서만 할 수 있습니다.")
+                return False
+            segments = index.segments(start_line, end_line)
+            if not segments:
+                print(f"⚠️ {start_line}~{end_line}행은 문서 범위를 벗어났습니다")
+                return False
+            if len(segments) > 1:
+                print(f"⚠️ {start_line}~{end_line}행은 표 안팎 {len(segments)}개 구간에 걸쳐 있어 한 번에 선택할 수 없습니다")
+                return False
+            return self._select_segment(segments[0])
         except Exception as e:
             print(f"❌ 텍스트 선택 실패: {e}")
             return False
 
+    @staticmethod
+    def _style_action_count(index, ranges, styles):
+        """구간마다 선택(SetPos + SelectText)과 스타일 섹션별 Execute에 드는 COM 호출 수"""
+        return sum(len(index.segments(r["start_line"], r["end_line"])) * (2 + len(styles[r["style"]].payloads))
+                   for r in ranges)
+
     def apply_smart_styles(self, style_plan, style_mapping):
-        """스타일 계획에 따라 자동으로 스타일 적용"""
+        """
+        스타일 계획에 따라 자동으로 스타일 적용.
+        겹치거나 이어지는 같은 스타일 구간은 style_analysis.coalesce_plan으로 먼저 합쳐,
+        문서 순서대로 구간마다 한 번씩만 선택해 적용합니다.
+        """
         try:
             success_count = 0
-            
-            for plan_item in style_plan:
-                start_line = plan_item['start_line']
-                end_line = plan_item['end_line']
-                style_type = plan_item['style_type']
-                
-                # 해당 범위 선택
-                if not self.select_text_by_line_range(start_line, end_line):
-                    continue
-                
-                # 매핑된 스타일 적용
-                if style_type in style_mapping:
-                    style_file = style_mapping[style_type]
-                    style_path = os.path.join(os.getcwd(), "styles", f"{style_file}.json")
-                    
-                    with open(style_path, 'r', encoding='utf-8') as f:
-                        style_data = json.load(f)
-                    
-                    if self.apply_style_to_selection(style_data):
-                        print(f"✅ {start_line}~{end_line}행에 '{style_type}' 스타일 적용 완료")
-                        success_count += 1
-                
-                # 선택 해제
-                self.hwp.HAction.Run("Cancel")
-            
+            index = self.get_line_index()
+            if index is None:
+                print("❌ 스타일 자동 적용은 한/글(COM) 백엔드에서만 할 수 있습니다.")
+                return False
+            registry = style_registry.get_registry()
+            styles = {}
+
+            def style_of(item):
+                name = style_mapping.get(item.get('style_type'))
+                if name is None:
+                    return None
+                if name not in styles:
+                    styles[name] = registry.get(name)
+                    if styles[name] is None:
+                        print(f"⚠️ '{name}' 스타일이 없어 해당 구간을 건너뜁니다")
+                return name if styles[name] is not None else None
+
+            items = style_analysis.normalize_plan(style_plan, style_of)
+            blanks = {n for n, line in enumerate(index.lines, 1) if not line.text.strip()}
+            ranges = style_analysis.coalesce_plan(items, blanks)
+            # 이전 방식: 항목마다 선택 후 Cancel / 정리 후: 합친 구간마다 선택, 마지막에 Cancel 한 번
+            before = self._style_action_count(index, items, styles) + len(style_plan)
+            after = self._style_action_count(index, ranges, styles) + 1
+            print(f"📊 스타일 계획 정리: {len(style_plan)}개 항목 → {len(ranges)}개 구간, "
+                  f"COM 호출 약 {before}회 → {after}회")
+            
+            for item in ranges:
+                start_line, end_line = item['start_line'], item['end_line']
+                # 표 안팎에 걸친 범위는 목록 구간마다 선택해 적용
+                applied = False
+                for segment in index.segments(start_line, end_line):
+                    if self._select_segment(segment) and self.apply_style_to_selection(styles[item['style']]):
+                        applied = True
+                if applied:
+                    print(f"✅ {start_line}~{end_line}행에 '{item['style_type']}' 스타일 적용 완료")
+                    success_count += 1
+            
+            # 선택 해제
+            self.hwp.HAction.Run("Cancel")
             print(f"🎉 총 {success_count}개 구간에 스타일이 적용되었습니다!")
             return success_count > 0
             
@@ -654,9 +831,9 @@ class HWPAssistant:
 
     def close_file(self):
         """안전한 파일 닫기"""
-        if self.hwp and self.is_opened:
+        if self.is_opened:
             try:
-                self.hwp.Quit()
+                self.backend.close()
                 print("📁 파일이 닫혔고, HWP 프로세스가 종료되었습니다.")
             except Exception as e:
                 print(f"⚠️ 파일 닫기 중 오류: {e}")
@@ -664,6 +841,8 @@ class HWPAssistant:
                 self.hwp = None
                 self.is_opened = False
                 self.current_file = ""
+                self._line_index = None
+                self._prepared_styles.clear()
 
 
 def extract_json_from_markdown(text):
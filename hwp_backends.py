@@ -0,0 +1,237 @@
+import json
+
+import extraction_cache
+import hwp5_reader
+import hwpx_reader
+
+try:
+    import win32com.client as win32
+    import pythoncom
+except ImportError:
+    # 한/글이 없는 환경에서는 네이티브 / 메모리 백엔드만 사용할 수 있음
+    win32 = None
+    pythoncom = None
+
+
+class ReadOnlyBackendError(RuntimeError):
+    """읽기 전용 백엔드에서 편집 기능을 호출했을 때 발생합니다."""
+
+
+class DocumentBackend:
+    """
+    HWPAssistant가 문서를 다루는 공통 인터페이스.
+    읽기 작업(텍스트, 누름틀)은 모든 백엔드가 지원하고,
+    편집 작업은 read_only가 False인 백엔드만 지원합니다.
+    표 삽입, 서식 적용, 누름틀 만들기처럼 HwpObject를 직접 쓰는 기능은 supports_com이 True인 백엔드만 지원합니다.
+    """
+    name = "base"
+    read_only = True
+    supports_com = False
+
+    # COM 전용 기능(표 삽입, 서식 적용 등)에서 사용할 HwpObject. COM 백엔드만 값이 있음
+    hwp = None
+
+    def open(self, file_path):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def get_text(self):
+        """GetTextFile("TEXT", "")에 해당하는 전체 텍스트"""
+        raise NotImplementedError
+
+    def get_field_list(self):
+        raise NotImplementedError
+
+    def get_field_text(self, field_name):
+        raise NotImplementedError
+
+    def read_field_list(self, file_path):
+        """현재 문서를 건드리지 않고 다른 파일의 누름틀 이름 목록을 읽습니다."""
+        return list(read_document(file_path)[1].keys())
+
+    def get_selected_text(self):
+        return ""
+
+    def replace_selected_text(self, new_text):
+        self._deny("텍스트 교체")
+
+    def put_field_text(self, field_name, value):
+        self._deny("누름틀 입력")
+
+    def save_as(self, file_path, file_format=None):
+        """file_format: "HWP", "HWPX" 등 (없으면 백엔드 기본값)"""
+        self._deny("다른 이름으로 저장")
+
+    def _deny(self, action):
+        raise ReadOnlyBackendError(f"'{self.name}' 백엔드는 {action}을(를) 지원하지 않습니다")
+
+
+def read_document(file_path):
+    """확장자에 맞는 네이티브 리더로 (전체 텍스트, 누름틀 dict)를 읽습니다. 결과는 추출 캐시에 저장됩니다."""
+    def parse():
+        if hwpx_reader.is_hwpx_file(file_path):
+            return hwpx_reader.read_text_and_fields(file_path)
+        return hwp5_reader.read_text_and_fields(file_path)
+
+    text, fields = extraction_cache.get_cache().get_or_compute(file_path, "text_fields-native", parse)
+    return text, fields
+
+
+class ComBackend(DocumentBackend):
+    """한/글 COM(HWPFrame.HwpObject)을 사용하는 편집 가능한 백엔드"""
+    name = "com"
+    read_only = False
+    supports_com = True
+
+    def __init__(self, visible=True):
+        if win32 is None:
+            raise RuntimeError("COM 백엔드를 사용하려면 pywin32와 한/글이 필요합니다")
+        self.visible = visible
+        self.hwp = None
+
+    def ensure_hwp(self):
+        """HwpObject가 없으면 새로 실행합니다."""
+        if self.hwp is None:
+            pythoncom.CoInitialize()
+            self.hwp = win32.gencache.EnsureDispatch("HWPFrame.HwpObject")
+            self.hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModule")
+            self.hwp.XHwpWindows.Item(0).Visible = self.visible
+        return self.hwp
+
+    def open(self, file_path):
+        return self.ensure_hwp().Open(file_path)
+
+    def close(self):
+        if self.hwp:
+            try:
+                self.hwp.Quit()
+            finally:
+                self.hwp = None
+
+    def get_text(self):
+        return self.hwp.GetTextFile("TEXT", "")
+
+    def get_field_list(self):
+        field_list_raw = self.hwp.GetFieldList(0, "")
+        return [f.strip() for f in field_list_raw.split('\x02') if f.strip()]
+
+    def get_field_text(self, field_name):
+        return self.hwp.GetFieldText(field_name)
+
+    def get_selected_text(self):
+        self.hwp.InitScan(0x01, 0x00ff); texts = []
+        while True:
+            status, txt = self.hwp.GetText()
+            if status == 0: break
+            texts.append(txt)
+        self.hwp.ReleaseScan(); return "".join(texts).strip()
+
+    def replace_selected_text(self, new_text):
+        pset = self.hwp.HParameterSet.HInsertText
+        pset.Text = new_text
+        self.hwp.HAction.Execute("InsertText", pset.HSet)
+        return True
+
+    def put_field_text(self, field_name, value):
+        self.hwp.PutFieldText(field_name, value)
+
+    def save_as(self, file_path, file_format=None):
+        if file_format:
+            return self.hwp.SaveAs(file_path, file_format, "")
+        return self.hwp.SaveAs(file_path)
+
+
+class NativeBackend(DocumentBackend):
+    """한/글 없이 HWP5/HWPX 파일을 직접 해석하는 읽기 전용 백엔드"""
+    name = "native"
+
+    def __init__(self):
+        self.text = ""
+        self.fields = {}
+
+    def open(self, file_path):
+        self.text, self.fields = read_document(file_path)
+        return True
+
+    def close(self):
+        self.text = ""
+        self.fields = {}
+
+    def get_text(self):
+        return self.text
+
+    def get_field_list(self):
+        return list(self.fields.keys())
+
+    def get_field_text(self, field_name):
+        return self.fields.get(field_name, "")
+
+
+class MemoryBackend(NativeBackend):
+    """
+    문서 내용을 메모리에만 두고 편집하는 백엔드.
+    파일 없이 텍스트로 시작하거나(load_text), 파일을 네이티브로 읽은 뒤 편집할 수 있습니다.
+    저장 시에는 텍스트와 누름틀 값을 JSON으로 기록합니다. (.hwp / .hwpx 이름으로는 저장하지 않음)
+    """
+    name = "memory"
+    read_only = False
+
+    def __init__(self, text="", fields=None):
+        super().__init__()
+        self.load_text(text, fields)
+
+    def open(self, file_path):
+        # 캐시에서 온 결과를 바꾸지 않도록 복사해 둠
+        text, fields = read_document(file_path)
+        self.load_text(text, fields)
+        return True
+
+    def load_text(self, text, fields=None):
+        self.text = text
+        self.fields = dict(fields or {})
+        self.selection = ""
+
+    def select(self, text):
+        """교체 대상이 될 선택 영역을 지정합니다."""
+        self.selection = text if text in self.text else ""
+        return bool(self.selection)
+
+    def get_selected_text(self):
+        return self.selection
+
+    def replace_selected_text(self, new_text):
+        if not self.selection:
+            return False
+        self.text = self.text.replace(self.selection, new_text, 1)
+        self.selection = new_text
+        return True
+
+    def put_field_text(self, field_name, value):
+        if field_name not in self.fields:
+            raise KeyError(f"누름틀을 찾을 수 없습니다: {field_name}")
+        self.fields[field_name] = value
+
+    def save_as(self, file_path, file_format=None):
+        if file_format or file_path.lower().endswith((".hwp", ".hwpx")):
+            raise ValueError(f"'{self.name}' 백엔드는 한/글 문서 형식으로 저장할 수 없습니다 (JSON으로만 저장): {file_path}")
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({"text": self.text, "fields": self.fields}, f, ensure_ascii=False, indent=2)
+        return True
+
+
+BACKENDS = {
+    "com": ComBackend,
+    "native": NativeBackend,
+    "memory": MemoryBackend,
+}
+
+
+def create_backend(backend="com"):
+    """이름 또는 DocumentBackend 객체로 백엔드를 준비합니다."""
+    if isinstance(backend, DocumentBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드입니다: {backend} (사용 가능: {', '.join(BACKENDS)})")
+    return BACKENDS[backend]()
@@ -0,0 +1,390 @@
+import hashlib
+import os
+import re
+import struct
+import zipfile
+import xml.etree.ElementTree as ET
+
+import doc_visitor
+import section_cache
+from doc_visitor import _cell_details, _cell_grid
+
+# =====================================================================
+# HWPX(OWPML) 리더
+#  - zip 안의 Contents/header.xml을 한 번 읽어 글꼴/글자 모양/문단 모양 표를 만들고
+#  - Contents/sectionN.xml은 iterparse로 최상위 문단 단위로 흘려 읽습니다.
+#  - 네임스페이스 버전(2011/2016 등)에 상관없이 로컬 태그 이름으로 해석합니다.
+# =====================================================================
+
+HEADER_PATH = "Contents/header.xml"
+SECTION_PATTERN = re.compile(r"^Contents/section(\d+)\.xml$")
+
+# hh:align horizontal 값 -> HWP5 ParaShape 정렬 값
+ALIGNMENTS = {"JUSTIFY": 0, "LEFT": 1, "RIGHT": 2, "CENTER": 3,
+              "DISTRIBUTE": 4, "DISTRIBUTE_SPACE": 5}
+UNDERLINES = {"NONE": 0, "BOTTOM": 1, "CENTER": 2, "TOP": 3}
+FONT_LANGS = ["HANGUL", "LATIN", "HANJA", "JAPANESE", "OTHER", "SYMBOL", "USER"]
+
+FIELD_CLICK_HERE = "CLICK_HERE"
+
+ZIP_LOCAL_HEADER_SIZE = 30
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+def _local(tag):
+    """'{namespace}name' 형태의 태그에서 name만 반환"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def is_hwpx_file(file_path):
+    """파일이 zip 기반 HWPX 문서인지 확인"""
+    return zipfile.is_zipfile(file_path) and file_path.lower().endswith(".hwpx")
+
+
+class HwpxHeader:
+    """header.xml의 글꼴 / 글자 모양 / 문단 모양 (hwp5_reader.DocInfo와 같은 인터페이스)"""
+
+    def __init__(self, source):
+        self.fonts = {lang: {} for lang in FONT_LANGS}
+        self.char_shapes = {}
+        self.para_shapes = {}
+        self._parse(source)
+
+    def _parse(self, source):
+        lang = None
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            name = _local(elem.tag)
+            if event == "start":
+                if name == "fontface":
+                    lang = elem.get("lang", "HANGUL")
+                continue
+
+            if name == "font" and lang in self.fonts:
+                self.fonts[lang][_int(elem.get("id"))] = elem.get("face", "")
+            elif name == "charPr":
+                self.char_shapes[_int(elem.get("id"))] = self._char_shape(elem)
+                elem.clear()
+            elif name == "paraPr":
+                self.para_shapes[_int(elem.get("id"))] = self._para_shape(elem)
+                elem.clear()
+
+    @staticmethod
+    def _char_shape(elem):
+        shape = {"height": _int(elem.get("height"), 1000), "font_ref": 0,
+                 "bold": False, "italic": False, "underline": 0}
+        for child in elem.iter():
+            name = _local(child.tag)
+            if name == "fontRef":
+                shape["font_ref"] = _int(child.get("hangul"))
+            elif name == "bold":
+                shape["bold"] = True
+            elif name == "italic":
+                shape["italic"] = True
+            elif name == "underline":
+                shape["underline"] = UNDERLINES.get(child.get("type", "NONE"), 0)
+        return shape
+
+    @staticmethod
+    def _para_shape(elem):
+        shape = {"alignment": 0, "left_margin": 0, "line_spacing": 0}
+        seen = set()
+        # hp:switch 안의 case/default 중 처음 나온 값을 사용
+        for child in elem.iter():
+            name = _local(child.tag)
+            if name in seen:
+                continue
+            if name == "align":
+                shape["alignment"] = ALIGNMENTS.get(child.get("horizontal", "JUSTIFY"), 0)
+            elif name == "left":
+                shape["left_margin"] = _int(child.get("value"))
+            elif name == "lineSpacing":
+                shape["line_spacing"] = _int(child.get("value"))
+            else:
+                continue
+            seen.add(name)
+        return shape
+
+    def fonts_used(self):
+        names = []
+        for lang in FONT_LANGS:
+            names.extend(self.fonts[lang].values())
+        return list(dict.fromkeys(n for n in names if n))
+
+    def char_format(self, shape_id):
+        shape = self.char_shapes.get(shape_id)
+        if shape is None:
+            return None
+        return {
+            "font_name": self.fonts["HANGUL"].get(shape["font_ref"], ""),
+            "font_size": shape["height"] / 100.0,
+            "is_bold": int(shape["bold"]),
+            "is_italic": int(shape["italic"]),
+            "underline": shape["underline"],
+        }
+
+    def para_format(self, shape_id):
+        shape = self.para_shapes.get(shape_id)
+        if shape is None:
+            return None
+        return dict(shape)
+
+
+class HwpxParagraph:
+    """hp:p 요소를 해석한 결과 (hwp5_reader.Paragraph와 같은 속성)"""
+    __slots__ = ("text", "para_shape_id", "style_id", "char_shape_runs", "fields", "table_list")
+
+    def __init__(self, elem):
+        self.para_shape_id = _int(elem.get("paraPrIDRef"))
+        self.style_id = _int(elem.get("styleIDRef"))
+        self.char_shape_runs = []
+        self.fields = []
+        self.table_list = []
+
+        parts = []
+        length = 0
+        open_fields = []  # 필드 안의 필드를 위한 스택: (self.fields 안의 자리 | None, 텍스트 조각 목록)
+        for run in elem:
+            if _local(run.tag) != "run":
+                continue
+            self.char_shape_runs.append((length, _int(run.get("charPrIDRef"))))
+            for child in run:
+                name = _local(child.tag)
+                if name == "t":
+                    text = _run_text(child)
+                    parts.append(text)
+                    length += len(text)
+                    for _, field_parts in open_fields:
+                        field_parts.append(text)
+                elif name == "ctrl":
+                    for ctrl in child:
+                        ctrl_name = _local(ctrl.tag)
+                        if ctrl_name == "fieldBegin":
+                            slot = None
+                            if ctrl.get("type") == FIELD_CLICK_HERE:
+                                slot = len(self.fields)
+                                self.fields.append((ctrl.get("name", ""), ""))
+                            open_fields.append((slot, []))
+                        elif ctrl_name == "fieldEnd" and open_fields:
+                            slot, field_parts = open_fields.pop()
+                            if slot is not None:
+                                self.fields[slot] = (self.fields[slot][0], "".join(field_parts))
+                elif name == "tbl":
+                    self.table_list.append(_parse_table(child))
+        self.text = "".join(parts)
+
+    def text_char_shape_runs(self):
+        """HWPX의 글자 모양 구간은 처음부터 텍스트 기준 위치"""
+        return self.char_shape_runs
+
+    def tables(self):
+        return self.table_list
+
+
+def _run_text(t_elem):
+    """hp:t 요소의 텍스트 (탭/줄바꿈 요소 포함)"""
+    parts = [t_elem.text or ""]
+    for child in t_elem:
+        name = _local(child.tag)
+        if name == "tab":
+            parts.append("\t")
+        elif name == "lineBreak":
+            parts.append("\n")
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _parse_table(tbl_elem):
+    """hp:tbl 요소를 hwp5_reader.parse_table과 같은 형태로 변환"""
+    table = {"rows": _int(tbl_elem.get("rowCnt")), "cols": _int(tbl_elem.get("colCnt")), "cells": []}
+    for tr in tbl_elem:
+        if _local(tr.tag) != "tr":
+            continue
+        for tc in tr:
+            if _local(tc.tag) != "tc":
+                continue
+            cell = {"row": 0, "col": 0, "row_span": 1, "col_span": 1, "paragraphs": []}
+            for child in tc:
+                name = _local(child.tag)
+                if name == "cellAddr":
+                    cell["row"] = _int(child.get("rowAddr"))
+                    cell["col"] = _int(child.get("colAddr"))
+                elif name == "cellSpan":
+                    cell["row_span"] = _int(child.get("rowSpan"), 1)
+                    cell["col_span"] = _int(child.get("colSpan"), 1)
+                elif name == "subList":
+                    cell["paragraphs"] = [HwpxParagraph(p) for p in child if _local(p.tag) == "p"]
+            table["cells"].append(cell)
+    return table
+
+
+def _walk_paragraphs(para, depth=0):
+    """문단과 표 셀 안의 문단까지 문서 순서대로 (HwpxParagraph, 표 안 여부) 반환"""
+    yield para, depth > 0
+    for table in para.tables():
+        for cell in table["cells"]:
+            for cell_para in cell["paragraphs"]:
+                yield from _walk_paragraphs(cell_para, depth + 1)
+
+
+def entry_data_offset(f, info):
+    """zip 항목의 압축된 데이터가 시작하는 위치 (로컬 헤더의 이름/추가 필드 길이는 중앙 디렉터리와 다를 수 있음)"""
+    f.seek(info.header_offset)
+    header = f.read(ZIP_LOCAL_HEADER_SIZE)
+    if len(header) < ZIP_LOCAL_HEADER_SIZE or header[:4] != b"PK\x03\x04":
+        raise ValueError(f"손상된 zip 항목입니다: {info.filename}")
+    name_len, extra_len = struct.unpack_from("<HH", header, 26)
+    return info.header_offset + ZIP_LOCAL_HEADER_SIZE + name_len + extra_len
+
+
+class HwpxFile:
+    """한/글 없이 HWPX 문서를 읽는 클래스"""
+    SECTION_KIND = "hwpx"
+
+    def __init__(self, file_path):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+        self.file_path = file_path
+        self.zip = zipfile.ZipFile(file_path)
+        self._header = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.zip.close()
+
+    @property
+    def header(self):
+        """header.xml은 문서당 한 번만 읽습니다."""
+        if self._header is None:
+            with self.zip.open(HEADER_PATH) as f:
+                self._header = HwpxHeader(f)
+        return self._header
+
+    # hwp5_reader.Hwp5File과 같은 이름으로도 접근할 수 있게 함
+    doc_info = header
+
+    def section_names(self):
+        sections = []
+        for name in self.zip.namelist():
+            match = SECTION_PATTERN.match(name)
+            if match:
+                sections.append((int(match.group(1)), name))
+        return [name for _, name in sorted(sections)]
+
+    def section_digest(self, section_name):
+        """구역 XML의 내용 해시. 압축을 풀지 않고 zip에 저장된 바이트 그대로 계산합니다."""
+        info = self.zip.getinfo(section_name)
+        h = hashlib.sha256(f"{info.compress_type}:{info.file_size}:".encode("ascii"))
+        with open(self.file_path, "rb") as f:
+            f.seek(entry_data_offset(f, info))
+            remaining = info.compress_size
+            while remaining > 0:
+                chunk = f.read(min(DIGEST_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError(f"손상된 zip 항목입니다: {section_name}")
+                h.update(chunk)
+                remaining -= len(chunk)
+        return h.hexdigest()
+
+    def section_paragraphs(self, section_name):
+        """
+        구역 하나의 최상위 HwpxParagraph를 문서 순서대로 반환합니다.
+        iterparse로 최상위 hp:p가 끝날 때마다 해석하고 바로 메모리에서 지웁니다.
+        """
+        with self.zip.open(section_name) as f:
+            depth = 0
+            root = None
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if root is None:
+                    root = elem
+                if _local(elem.tag) != "p":
+                    continue
+                if event == "start":
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 0:
+                    yield HwpxParagraph(elem)
+                    root.clear()
+
+    def iter_section_paragraphs(self):
+        """(구역 번호, HwpxParagraph)를 문서 순서대로 반환합니다."""
+        for index, section_name in enumerate(self.section_names()):
+            for para in self.section_paragraphs(section_name):
+                yield index, para
+
+    def visit(self, collectors, use_cache=True):
+        """
+        문서를 한 번 순회하며 지정한 수집기들의 결과를 모읍니다. (표는 문단 해석 때 이미 dict로 변환됨)
+        구역 XML이 지난번과 같으면 해석해 둔 문단을 재사용합니다. (section_cache 참고)
+        use_cache=False면 구역 캐시를 쓰지 않고 모두 새로 해석합니다.
+        """
+        return section_cache.visit(self, lambda table: table, collectors, use_cache=use_cache)
+
+    def iter_paragraphs(self):
+        for _, para in self.iter_section_paragraphs():
+            yield para
+
+
+def read_text_and_fields(file_path):
+    """
+    GetTextFile("TEXT")에 해당하는 전체 텍스트와 누름틀 값 dict를 한 번에 읽습니다.
+    표 안의 문단을 포함한 모든 문단을 문서 순서대로 "\r\n"으로 연결합니다.
+    """
+    with HwpxFile(file_path) as doc:
+        visited = doc.visit(["full_text", "fields"])
+    return visited["full_text"], visited["fields"]
+
+
+def extract_hwpx_structure(file_path: str, use_cache: bool = True) -> dict:
+    """HWPX 문서의 제목, 문단, 누름틀, 표 정보를 추출합니다."""
+    with HwpxFile(file_path) as doc:
+        return doc_visitor.structure_result(file_path, doc.visit(doc_visitor.STRUCTURE_COLLECTORS, use_cache))
+
+
+def extract_hwpx_structure_with_style(file_path: str, use_cache: bool = True) -> dict:
+    """HWPX 문서의 문단별 텍스트와 첫 글자 서식을 추출합니다."""
+    with HwpxFile(file_path) as doc:
+        return doc_visitor.style_result(file_path, doc.visit(doc_visitor.STYLE_COLLECTORS, use_cache))
+
+
+def extract_hwpx_with_formatting(file_path: str, use_cache: bool = True) -> dict:
+    """
+    extractor.extract_hwp_with_formatting과 같은 형태로 HWPX 문서를 추출합니다.
+    서식 정보는 header.xml의 charPr / paraPr 표에서 구합니다.
+    """
+    with HwpxFile(file_path) as doc:
+        return doc_visitor.formatting_result(file_path, doc.visit(doc_visitor.FORMATTING_COLLECTORS, use_cache))
+
+
+def iter_elements(file_path):
+    """hwp5_reader.iter_elements의 HWPX 버전 (문단/표/누름틀을 하나씩 반환)"""
+    with HwpxFile(file_path) as doc:
+        para_index = 0
+        table_index = 0
+        for section, top in doc.iter_section_paragraphs():
+            for para, in_table in _walk_paragraphs(top):
+                if not in_table:
+                    yield {"type": "paragraph", "section": section,
+                           "index": para_index, "text": para.text.strip()}
+                    para_index += 1
+                for name, value in para.fields:
+                    if name:
+                        yield {"type": "field", "section": section, "index": para_index - 1,
+                               "name": name, "value": value.strip()}
+                for table in para.tables():
+                    yield {"type": "table", "section": section, "index": table_index,
+                           "rows": table["rows"], "cols": table["cols"],
+                           "cells": _cell_grid(table), "cell_details": _cell_details(table)}
+                    table_index += 1
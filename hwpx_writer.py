@@ -0,0 +1,405 @@
+import io
+import os
+import struct
+import tempfile
+import xml.parsers.expat
+import zipfile
+import zlib
+from xml.sax.saxutils import escape
+
+from hwpx_reader import FIELD_CLICK_HERE, SECTION_PATTERN
+
+# =====================================================================
+# HWPX 누름틀 채우기 (한/글 없이)
+#  - 템플릿 zip을 처음부터 끝까지 흘려 쓰면서, 채울 누름틀이 있는 구역 XML만 고쳐 다시 압축합니다.
+#  - 나머지 항목은 압축된 바이트를 그대로 복사합니다. (압축 해제/재압축 없음)
+#  - 구역 XML은 다시 직렬화하지 않고 누름틀 내용 부분만 바이트 단위로 바꿔, 나머지는 원본 그대로 둡니다.
+# =====================================================================
+
+DEFAULT_COMPRESS_LEVEL = int(os.environ.get("HWP_WRITER_COMPRESS_LEVEL", "6"))
+COPY_CHUNK_SIZE = 1024 * 1024
+
+CLICK_HERE_BYTES = FIELD_CLICK_HERE.encode("ascii")
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+CENTRAL_HEADER = struct.Struct("<IBBHHHHHIIIHHHHHII")
+END_OF_CENTRAL_DIR = struct.Struct("<IHHHHIIH")
+LOCAL_HEADER_SIGNATURE = 0x04034B50
+CENTRAL_HEADER_SIGNATURE = 0x02014B50
+END_OF_CENTRAL_DIR_SIGNATURE = 0x06054B50
+FLAG_DATA_DESCRIPTOR = 0x08
+ZIP32_LIMIT = 0xFFFFFFFF
+
+
+def _local(qname):
+    return qname.rsplit(":", 1)[-1]
+
+
+def _prefix(qname):
+    return qname.rsplit(":", 1)[0] + ":" if ":" in qname else ""
+
+
+def _tag_end(data, start):
+    """data[start]의 '<'로 시작하는 태그가 끝난 다음 위치 (속성 값 안의 '>'는 건너뜀)"""
+    quote = None
+    i = start + 1
+    while i < len(data):
+        c = data[i]
+        if quote is not None:
+            if c == quote:
+                quote = None
+        elif c in (0x22, 0x27):  # " '
+            quote = c
+        elif c == 0x3E:  # >
+            return i + 1
+        i += 1
+    raise ValueError("XML 태그가 끝나지 않았습니다")
+
+
+def encode_field_xml(value, prefix):
+    """누름틀 값을 hp:t 요소 안에 넣을 XML로 바꿉니다. 줄바꿈/탭은 lineBreak/tab 요소로 넣습니다."""
+    text = str(value).replace("\r\n", "\n").replace("\r", "\n")
+    text = "".join(c for c in text if c in "\n\t" or ord(c) >= 32)
+    lines = []
+    for line in text.split("\n"):
+        lines.append(f"<{prefix}tab/>".join(escape(part) for part in line.split("\t")))
+    return f"<{prefix}lineBreak/>".join(lines).encode("utf-8")
+
+
+# ---------------------------------------------------------------------
+# 구역 XML
+# ---------------------------------------------------------------------
+
+class _FieldSectionXml:
+    """
+    누름틀이 있는 구역 XML: 누름틀마다 내용(hp:t)의 바이트 위치와,
+    누름틀을 가진 문단의 줄 배치 정보(hp:linesegarray) 위치를 기억합니다.
+    """
+
+    def __init__(self, name, data):
+        if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+            raise ValueError(f"UTF-8이 아닌 구역 XML은 지원하지 않습니다: {name}")
+        self.name = name
+        self.data = data
+        # {"name", "texts", "insert_at", "after_at", "ctrls", "prefix", "para", "begin", "end_at", "nested", "parent", "current"}
+        self.fields = []
+        self.linesegs = {}  # 문단 번호 -> (시작, 끝)
+        self._scan()
+
+    def _scan(self):
+        data = self.data
+        parser = xml.parsers.expat.ParserCreate()
+        paragraphs = []  # 열린 hp:p의 문단 번호
+        counter = [0]
+        open_fields = []
+        pending_ctrl = []  # fieldBegin이 들어 있는 hp:ctrl이 끝날 때 내용 삽입 위치를 정할 누름틀
+        pending_end = []  # fieldEnd가 들어 있는 hp:ctrl이 끝날 때 필드 뒤 위치를 정할 필드
+        in_text = [0]  # 열린 hp:t 깊이
+        elements = []  # (태그 이름, 시작 위치, 시작 태그 끝)
+
+        def start(qname, attrs):
+            begin = parser.CurrentByteIndex
+            tag_end = _tag_end(data, begin)
+            elements.append((qname, begin, tag_end))
+            name = _local(qname)
+            if name == "p":
+                paragraphs.append(counter[0])
+                counter[0] += 1
+            elif name == "t":
+                in_text[0] += 1
+            elif name in ("tab", "lineBreak") and in_text[0]:
+                for field in open_fields:
+                    field["current"].append("\t" if name == "tab" else "\n")
+            elif name == "fieldBegin":
+                field = {"name": attrs.get("name", ""), "id": attrs.get("id"), "texts": [],
+                         "insert_at": None, "prefix": _prefix(qname),
+                         "para": paragraphs[-1] if paragraphs else None,
+                         "click_here": attrs.get("type") == FIELD_CLICK_HERE,
+                         "begin": begin, "end_at": None, "after_at": None, "ctrls": [], "nested": [],
+                         "parent": open_fields[-1] if open_fields else None, "current": []}
+                open_fields.append(field)
+                pending_ctrl.append(field)
+            elif name == "fieldEnd" and open_fields:
+                ref = attrs.get("beginIDRef")
+                index = next((k for k in range(len(open_fields) - 1, -1, -1)
+                              if ref is None or open_fields[k]["id"] == ref), len(open_fields) - 1)
+                field = open_fields.pop(index)
+                field["end_at"] = begin
+                pending_end.append(field)
+                if open_fields:
+                    open_fields[-1]["nested"].append(field)
+                if field["click_here"] and field["name"]:
+                    self.fields.append(field)
+
+        def end(qname):
+            _, begin, tag_end = elements.pop()
+            name = _local(qname)
+            position = parser.CurrentByteIndex
+            self_closing = data[tag_end - 2:tag_end] == b"/>"
+            close_end = tag_end if self_closing else _tag_end(data, position)
+            if name == "p":
+                paragraphs.pop()
+            elif name == "ctrl" and (pending_ctrl or pending_end):
+                for field in pending_ctrl:
+                    field["insert_at"] = close_end
+                    field["ctrls"].append((begin, close_end))
+                for field in pending_end:
+                    field["after_at"] = close_end
+                    field["ctrls"].append((begin, close_end))
+                pending_ctrl.clear()
+                pending_end.clear()
+            if name == "t":
+                in_text[0] -= 1
+            if name == "t" and open_fields and paragraphs \
+                    and paragraphs[-1] == open_fields[-1]["para"]:
+                # 필드 안의 필드는 가장 안쪽 필드의 내용으로 봄
+                open_fields[-1]["texts"].append({
+                    "qname": qname, "start": begin, "tag_end": tag_end,
+                    "end": tag_end if self_closing else position, "self_closing": self_closing})
+            elif name == "linesegarray" and paragraphs:
+                self.linesegs[paragraphs[-1]] = (begin, close_end)
+
+        def text(content):
+            if in_text[0]:
+                for field in open_fields:
+                    field["current"].append(content)
+
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = text
+        parser.Parse(data, True)
+        self.fields.sort(key=lambda field: field["begin"])
+
+    def field_names(self):
+        return [field["name"] for field in self.fields]
+
+    def _write_texts(self, field, texts, value, insert_at, edits):
+        """필드 내용의 hp:t 묶음에 값을 넣습니다: 첫 hp:t에 값, 나머지는 비움. hp:t가 없으면 새로 넣음"""
+        if texts:
+            for k, t in enumerate(texts):
+                content = encode_field_xml(value, _prefix(t["qname"])) if k == 0 else b""
+                if not t["self_closing"]:
+                    edits[t["tag_end"]] = (t["end"], content)
+                elif content:
+                    open_tag = self.data[t["start"]:t["tag_end"] - 2].rstrip() + b">"
+                    edits[t["start"]] = (t["tag_end"], open_tag + content + f"</{t['qname']}>".encode())
+        elif value:
+            if insert_at is None:
+                raise ValueError(f"누름틀 '{field['name']}'에 값을 넣을 위치를 찾을 수 없습니다")
+            prefix = field["prefix"]
+            content = f"<{prefix}t>".encode() + encode_field_xml(value, prefix) + f"</{prefix}t>".encode()
+            edits[insert_at] = (insert_at, content)
+
+    def _fill(self, field, value, values, edits):
+        """
+        필드 내용을 value로 바꾸는 편집을 edits에 더합니다. 안쪽 필드는 그 값(없으면 현재 내용)이
+        value 안에 있으면 그 자리에 그대로 두고, 바깥 내용만 안쪽 필드 앞뒤로 나눠 넣습니다.
+        """
+        value = str(value)
+        children = sorted(field["nested"], key=lambda child: child["begin"])
+        pieces = []
+        kept = []
+        cursor = 0
+        for child in children:
+            given = child["click_here"] and child["name"] in values
+            child_text = str(values[child["name"]]) if given else "".join(child["current"])
+            at = value.find(child_text, cursor)
+            if at < 0:
+                if given and child_text:
+                    raise ValueError(f"누름틀 '{child['name']}'은(는) '{field['name']}' 안에 있어, "
+                                     f"'{field['name']}' 값에 '{child_text}'이(가) 없으면 함께 채울 수 없습니다")
+                # 값에 남지 않는 안쪽 필드는 필드째 지움
+                self._remove(child, edits)
+                continue
+            pieces.append(value[cursor:at])
+            kept.append(child)
+            cursor = at + len(child_text)
+            if given:
+                self._fill(child, child_text, values, edits)
+        pieces.append(value[cursor:])
+        for k, piece in enumerate(pieces):
+            low = field["begin"] if k == 0 else kept[k - 1]["end_at"]
+            high = kept[k]["begin"] if k < len(kept) else len(self.data)
+            texts = [t for t in field["texts"] if low <= t["start"] < high]
+            insert_at = field["insert_at"] if k == 0 else kept[k - 1]["after_at"]
+            self._write_texts(field, texts, piece, insert_at, edits)
+        # 줄 배치 정보는 지워서 한/글이 열 때 다시 배치하게 함
+        if field["para"] in self.linesegs:
+            start, end = self.linesegs[field["para"]]
+            edits[start] = (end, b"")
+
+    def _remove(self, field, edits):
+        """필드의 hp:ctrl(시작/끝)을 지우고 내용 hp:t를 비웁니다. (안쪽 필드 포함)"""
+        if len(field["ctrls"]) != 2:
+            raise ValueError(f"누름틀 '{field['name']}'을(를) 지울 위치를 찾을 수 없습니다")
+        for start, end in field["ctrls"]:
+            edits[start] = (end, b"")
+        self._write_texts(field, field["texts"], "", None, edits)
+        for child in field["nested"]:
+            self._remove(child, edits)
+
+    def render(self, values):
+        """값을 채운 구역 XML. 바뀐 내용이 없으면 None."""
+        edits = {}
+        for field in self.fields:
+            if field["name"] not in values:
+                continue
+            # 값을 채우는 바깥 누름틀이 있으면 그 안에서 함께 처리됨
+            parent = field["parent"]
+            while parent is not None and not (parent["click_here"] and parent["name"] in values):
+                parent = parent["parent"]
+            if parent is None:
+                self._fill(field, values[field["name"]], values, edits)
+        if not edits:
+            return None
+        parts = []
+        position = 0
+        for start in sorted(edits):
+            end, content = edits[start]
+            parts.append(self.data[position:start])
+            parts.append(content)
+            position = end
+        parts.append(self.data[position:])
+        return b"".join(parts)
+
+
+# ---------------------------------------------------------------------
+# zip 쓰기
+# ---------------------------------------------------------------------
+
+def _dos_datetime(date_time):
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class _ZipEntry:
+    """템플릿 zip 항목 하나: 원본 중앙 디렉터리 정보와 압축 데이터 위치"""
+    __slots__ = ("info", "name", "data_offset")
+
+    def __init__(self, info, name, data_offset):
+        self.info = info
+        self.name = name
+        self.data_offset = data_offset
+
+
+class HwpxTemplate:
+    """
+    한/글 없이 누름틀을 채우는 HWPX 템플릿. (hwp5_writer.Hwp5Template과 같은 인터페이스)
+    템플릿의 zip 항목 위치와 누름틀이 있는 구역 XML만 기억해 두고, 저장할 때마다 템플릿 파일에서
+    나머지 항목의 압축 데이터를 그대로 복사합니다.
+    """
+
+    def __init__(self, file_path, compress_level=DEFAULT_COMPRESS_LEVEL):
+        self.file_path = file_path
+        self.compress_level = compress_level
+        self._entries = []
+        self._sections = {}
+        with zipfile.ZipFile(file_path) as zf, open(file_path, "rb") as f:
+            self.comment = zf.comment
+            for info in zf.infolist():
+                if info.flag_bits & 0x01:
+                    raise ValueError(f"암호화된 항목이 있는 HWPX는 지원하지 않습니다: {info.filename}")
+                f.seek(info.header_offset)
+                header = f.read(LOCAL_HEADER.size)
+                if len(header) < LOCAL_HEADER.size or LOCAL_HEADER.unpack(header)[0] != LOCAL_HEADER_SIGNATURE:
+                    raise ValueError(f"손상된 zip 항목입니다: {info.filename}")
+                name_len, extra_len = LOCAL_HEADER.unpack(header)[9:]
+                name = f.read(name_len)
+                self._entries.append(_ZipEntry(info, name, info.header_offset + LOCAL_HEADER.size + name_len + extra_len))
+
+                if SECTION_PATTERN.match(info.filename):
+                    data = zf.read(info)
+                    if CLICK_HERE_BYTES in data:
+                        section = _FieldSectionXml(info.filename, data)
+                        if section.fields:
+                            self._sections[info.filename] = section
+        self.field_names = list(dict.fromkeys(
+            name for section in self._sections.values() for name in section.field_names()))
+
+    def _compress(self, data, method):
+        if method == zipfile.ZIP_STORED:
+            return data
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+        return compressor.compress(data) + compressor.flush()
+
+    def write(self, fp, values):
+        """
+        누름틀 값을 채운 HWPX를 파일 객체 fp에 씁니다. values에 없는 누름틀은 템플릿 내용을 그대로 둡니다.
+        템플릿에 없는 이름이 있으면 ValueError.
+        """
+        values = {name: "" if value is None else value for name, value in values.items()}
+        unknown = [name for name in values if name not in self.field_names]
+        if unknown:
+            raise ValueError(f"템플릿에 없는 누름틀입니다: {', '.join(unknown)}")
+        central = []
+        offset = 0
+        with open(self.file_path, "rb") as src:
+            for entry in self._entries:
+                info = entry.info
+                method = info.compress_type
+                extract_version = info.extract_version
+                section = self._sections.get(info.filename)
+                data = section.render(values) if section is not None else None
+                if data is not None:
+                    if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                        method, extract_version = zipfile.ZIP_DEFLATED, 20
+                    crc, size = zlib.crc32(data), len(data)
+                    data = self._compress(data, method)
+                    compress_size = len(data)
+                else:
+                    crc, size, compress_size = info.CRC, info.file_size, info.compress_size
+                if max(offset, size, compress_size) >= ZIP32_LIMIT:
+                    raise ValueError("4GB가 넘는 HWPX는 지원하지 않습니다")
+
+                flags = info.flag_bits & ~FLAG_DATA_DESCRIPTOR
+                dos_time, dos_date = _dos_datetime(info.date_time)
+                fp.write(LOCAL_HEADER.pack(LOCAL_HEADER_SIGNATURE, extract_version, flags, method,
+                                           dos_time, dos_date, crc, compress_size, size, len(entry.name), 0))
+                fp.write(entry.name)
+                if data is not None:
+                    fp.write(data)
+                else:
+                    # 압축된 데이터를 그대로 복사
+                    src.seek(entry.data_offset)
+                    remaining = compress_size
+                    while remaining > 0:
+                        chunk = src.read(min(COPY_CHUNK_SIZE, remaining))
+                        if not chunk:
+                            raise ValueError(f"zip 항목 데이터가 잘렸습니다: {info.filename}")
+                        fp.write(chunk)
+                        remaining -= len(chunk)
+                central.append(CENTRAL_HEADER.pack(
+                    CENTRAL_HEADER_SIGNATURE, info.create_version, info.create_system, extract_version, flags,
+                    method, dos_time, dos_date, crc, compress_size, size, len(entry.name), 0, len(info.comment),
+                    0, info.internal_attr, info.external_attr, offset) + entry.name + info.comment)
+                offset += LOCAL_HEADER.size + len(entry.name) + compress_size
+
+        directory = b"".join(central)
+        fp.write(directory)
+        fp.write(END_OF_CENTRAL_DIR.pack(END_OF_CENTRAL_DIR_SIGNATURE, 0, 0, len(central), len(central),
+                                         len(directory), offset, len(self.comment)) + self.comment)
+
+    def render(self, values):
+        """누름틀 값을 채운 문서 파일 전체(bytes)"""
+        buffer = io.BytesIO()
+        self.write(buffer, values)
+        return buffer.getvalue()
+
+    def save(self, output_path, values):
+        """누름틀을 채워 output_path에 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.write(f, values)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return output_path
+
+
+def fill_fields(template_path, output_path, values):
+    """HWPX 템플릿의 누름틀을 values로 채워 output_path에 저장합니다. (한 번만 쓸 때)"""
+    return HwpxTemplate(template_path).save(output_path, values)
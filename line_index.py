@@ -0,0 +1,122 @@
+"""
+스타일 분석 줄 번호 → 한/글 위치(list, para, pos) 색인.
+
+열린 문서를 InitScan/GetText로 한 번 훑으면서 텍스트 덩어리마다 MovePos(moveScanPos)로 실제 위치를 구해
+줄(문단, 문단 안 줄바꿈)마다 시작/끝 위치를 기록합니다.
+analyze_document_structure는 이 색인의 줄로 번호를 매기고, 스타일을 적용할 때는 줄 범위를
+SetPos + SelectText 한두 번으로 선택하므로 MoveDown을 줄 수만큼 반복하지 않습니다.
+
+색인은 문서 텍스트 스냅샷(GetTextFile 결과 해시)마다 한 번만 만듭니다.
+"""
+import hashlib
+import re
+
+# GetText 상태 값: 0 텍스트 없음, 1 리스트의 끝, 2 일반 텍스트, 3 다음 문단, 4 컨트롤 안으로, 5 컨트롤 밖으로
+SCAN_STOP_STATES = (0, 1, 101, 102)
+MOVE_SCAN_POS = 201  # 마지막 GetText로 얻은 텍스트의 시작 위치로 캐럿 이동
+
+_LINE_BREAK = re.compile(r"(\r\n|\r|\n)")
+
+
+def _wlen(text):
+    """한/글 위치 단위(UTF-16 글자 수)로 센 길이"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def snapshot_key(file_path, text):
+    """문서 스냅샷 키. 파일 경로와 전체 텍스트가 같으면 위치도 같다고 봅니다."""
+    return hashlib.sha1(f"{file_path}\0{text}".encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class LineSpan:
+    """색인의 한 줄: 목록 ID와 시작/끝 (문단, 글자 위치)"""
+    __slots__ = ("list_id", "start_para", "start_pos", "end_para", "end_pos", "text")
+
+    def __init__(self, list_id, para, pos, text=""):
+        self.list_id = list_id
+        self.start_para = self.end_para = para
+        self.start_pos = self.end_pos = pos
+        self.text = text
+
+
+class LineIndex:
+    """
+    줄 번호(1부터) → LineSpan 목록.
+
+        index = line_index.build(hwp)
+        lines, blanks = style_analysis.numbered_lines(index.text)
+        for list_id, spara, spos, epara, epos in index.segments(3, 10): ...
+    """
+
+    def __init__(self, lines, snapshot=None):
+        self.lines = lines
+        self.snapshot = snapshot
+        self.text = "\n".join(line.text for line in lines)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def segments(self, start_line, end_line):
+        """
+        줄 범위를 같은 목록(본문, 표 셀 등) 안에서 이어지는 구간으로 나눕니다.
+        SelectText는 한 목록 안에서만 선택할 수 있기 때문입니다. 범위를 벗어난 줄 번호는 잘라냅니다.
+
+        Returns:
+            list: [(list_id, start_para, start_pos, end_para, end_pos), ...]
+        """
+        start_line, end_line = max(1, start_line), min(len(self.lines), end_line)
+        segments = []
+        for line in self.lines[start_line - 1:end_line]:
+            last = segments[-1] if segments else None
+            if last and last[0] == line.list_id:
+                last[3], last[4] = line.end_para, line.end_pos
+            else:
+                segments.append([line.list_id, line.start_para, line.start_pos, line.end_para, line.end_pos])
+        return [tuple(segment) for segment in segments]
+
+
+def build(hwp, snapshot=None):
+    """열린 문서를 한 번 훑어 LineIndex를 만듭니다. 캐럿 위치는 원래대로 돌려놓습니다."""
+    saved_pos = hwp.GetPos()
+    lines = []
+    current = None
+    hwp.InitScan()
+    try:
+        while True:
+            state, text = hwp.GetText()
+            if state in SCAN_STOP_STATES:
+                break
+            if not text:
+                continue
+            hwp.MovePos(MOVE_SCAN_POS)
+            list_id, para, pos = hwp.GetPos()
+            # 표 등 다른 목록으로 넘어가면 열려 있던 줄은 거기서 끝남
+            if current is not None and current.list_id != list_id:
+                lines.append(current)
+                current = None
+
+            parts = _LINE_BREAK.split(text)
+            for i in range(0, len(parts), 2):
+                piece = parts[i]
+                separator = parts[i + 1] if i + 1 < len(parts) else None
+                if current is None:
+                    if not piece and separator is None:
+                        break
+                    current = LineSpan(list_id, para, pos)
+                current.text += piece
+                pos += _wlen(piece)
+                current.end_para, current.end_pos = para, pos
+                if separator is None:
+                    break  # 줄이 다음 덩어리로 이어짐 (컨트롤 사이 등)
+                lines.append(current)
+                current = None
+                if separator == "\n":
+                    pos += 1  # 문단 안 줄바꿈
+                else:
+                    para, pos = para + 1, 0
+        if current is not None:
+            lines.append(current)
+    finally:
+        hwp.ReleaseScan()
+        hwp.SetPos(*saved_pos)
+    return LineIndex(lines, snapshot)
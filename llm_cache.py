@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import extraction_cache
+
+# 프롬프트 형식이 바뀌면 올려서 예전 응답을 무효화
+LLM_CACHE_VERSION = 1
+
+DEFAULT_TTL_SECONDS = float(os.environ.get("HWP_LLM_CACHE_TTL_HOURS", "168")) * 3600
+DEFAULT_MAX_BYTES = int(os.environ.get("HWP_LLM_CACHE_MAX_MB", "64")) * 1024 * 1024
+CACHE_ENABLED = os.environ.get("HWP_LLM_CACHE", "1") != "0"
+
+
+def make_key(mode, instruction, user_context, context_data, user_request, model=""):
+    """
+    응답을 결정하는 입력 전체의 SHA-256.
+    지침/@파일은 경로가 아니라 내용으로 들어가므로 파일을 고치면 자동으로 다른 키가 됩니다.
+    """
+    payload = json.dumps(
+        [LLM_CACHE_VERSION, model, mode, instruction, user_context, context_data, user_request],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Gemini 응답 디스크 캐시.
+    항목마다 생성 시각을 저장해 TTL이 지나면 버리고, 파일 수정 시각을 마지막 사용 시각으로 써서
+    전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 응답부터 지웁니다.
+    """
+
+    def __init__(self, cache_dir=None, ttl=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = os.path.join(cache_dir or extraction_cache.DEFAULT_CACHE_DIR, "llm")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    # --- 조회 / 저장 ---
+    def get(self, key):
+        """캐시된 응답 텍스트를 반환합니다. 없거나 TTL이 지났으면 None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if self.ttl and time.time() - entry.get("created", 0) > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            with self._lock:
+                self.misses += 1
+                self.expired += 1
+                self._total_bytes = None
+            return None
+
+        try:
+            os.utime(path)  # LRU: 사용 시각 갱신
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry.get("response")
+
+    def put(self, key, response, mode=""):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps({"created": time.time(), "mode": mode, "response": response},
+                          ensure_ascii=False).encode('utf-8')
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data)
+        self._evict_if_needed()
+
+    # --- 용량 관리 ---
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+        return entries
+
+    def _evict_if_needed(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            if self._total_bytes <= self.max_bytes:
+                return
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._total_bytes = total
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._total_bytes = 0
+
+    def stats(self):
+        """이번 실행의 적중/실패 횟수와 현재 캐시 크기"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def summary(self):
+        """GUI 로그용 한 줄 요약"""
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"적중률 {rate:.0%} ({self.hits}/{lookups})"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 전역 LLM 응답 캐시"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
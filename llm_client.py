@@ -0,0 +1,387 @@
+import http.client
+import json
+import os
+import queue
+import subprocess
+import threading
+from urllib.parse import urlsplit, quote
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    # SDK가 없으면 REST / CLI 클라이언트만 사용
+    genai = None
+
+DEFAULT_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
+DEFAULT_BASE_URL = os.environ.get("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+DEFAULT_CLI_COMMAND = f"gemini --model {DEFAULT_MODEL}"
+
+
+class LLMError(RuntimeError):
+    """LLM 호출 실패"""
+
+
+def _api_key():
+    return os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
+
+
+class LLMClient:
+    """프롬프트를 받아 응답 텍스트를 돌려주는 클라이언트의 공통 인터페이스"""
+    name = "base"
+    model_name = ""  # 응답 캐시 키에 들어가는 모델 이름
+
+    def generate(self, prompt):
+        """응답 텍스트를 반환합니다. 실패하면 LLMError를 발생시킵니다."""
+        raise NotImplementedError
+
+    def stream(self, prompt):
+        """
+        응답을 도착하는 대로 조각(str) 단위로 내보내는 제너레이터.
+        중간에 close()하면 진행 중인 요청을 끊습니다. 기본 구현은 전체 응답을 한 번에 내보냅니다.
+        """
+        yield self.generate(prompt)
+
+    def close(self):
+        pass
+
+
+class GeminiSDKClient(LLMClient):
+    """
+    google-generativeai SDK를 프로세스 안에서 계속 재사용하는 클라이언트.
+    모델 객체와 내부 연결을 한 번만 만들므로 요청마다 CLI를 실행하고 TLS를 새로 맺는 비용이 없습니다.
+    """
+    name = "sdk"
+
+    def __init__(self, model=DEFAULT_MODEL, api_key=None):
+        if genai is None:
+            raise LLMError("google-generativeai 패키지가 설치되어 있지 않습니다")
+        api_key = api_key or _api_key()
+        if not api_key:
+            raise LLMError("GEMINI_API_KEY(또는 GOOGLE_API_KEY) 환경변수가 필요합니다")
+        genai.configure(api_key=api_key)
+        self.model_name = model
+        self.model = genai.GenerativeModel(model)
+
+    def generate(self, prompt):
+        try:
+            response = self.model.generate_content(prompt)
+            return response.text.strip()
+        except Exception as e:
+            raise LLMError(f"Gemini SDK 호출 실패: {e}") from e
+
+    def stream(self, prompt):
+        try:
+            response = self.model.generate_content(prompt, stream=True)
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except GeneratorExit:
+            raise
+        except Exception as e:
+            raise LLMError(f"Gemini SDK 스트리밍 실패: {e}") from e
+
+
+class _ConnectionPool:
+    """한 호스트에 대한 keep-alive HTTP 연결 풀 (스레드 안전)"""
+
+    def __init__(self, base_url, size=4, timeout=120):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self.created = 0
+
+    def _new_connection(self):
+        self.created += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def release(self, conn):
+        if self._idle.qsize() < self.size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def request(self, method, path, body, headers):
+        """요청을 보내고 (상태 코드, 응답 바이트)를 반환합니다. 끊어진 연결은 한 번 새로 맺어 재시도합니다."""
+        for attempt in range(2):
+            conn = self.acquire()
+            try:
+                conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self.release(conn)
+            return response.status, data
+
+    def open_stream(self, method, path, body, headers):
+        """
+        응답 본문을 읽지 않은 채 (연결, 응답)을 반환합니다.
+        다 읽었으면 finish_stream(conn, response)로 돌려주고, 중간에 그만두면 conn.close()로 버립니다.
+        """
+        for attempt in range(2):
+            conn = self.acquire()
+            try:
+                conn.request(method, self.prefix + path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+    def finish_stream(self, conn, response):
+        if response.will_close or not response.isclosed():
+            conn.close()
+        else:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class GeminiRESTClient(LLMClient):
+    """
+    Gemini REST API(generateContent)를 연결 풀로 호출하는 클라이언트.
+    base_url을 로컬 대역 서버(llm_stub_server.py)로 바꾸면 오프라인에서 지연 시간을 비교할 수 있습니다.
+    """
+    name = "rest"
+
+    def __init__(self, model=DEFAULT_MODEL, api_key=None, base_url=DEFAULT_BASE_URL,
+                 pool_size=4, timeout=120):
+        self.model_name = model
+        self.api_key = api_key or _api_key() or ""
+        self.pool = _ConnectionPool(base_url, size=pool_size, timeout=timeout)
+
+    def _path(self, method):
+        path = f"/v1beta/models/{quote(self.model_name)}:{method}"
+        if self.api_key:
+            path += f"?key={quote(self.api_key)}"
+        return path
+
+    @staticmethod
+    def _body(prompt):
+        return json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}]}).encode("utf-8")
+
+    @staticmethod
+    def _text_of(payload):
+        """generateContent 응답에서 텍스트만 이어 붙입니다."""
+        parts = []
+        for candidate in payload.get("candidates", [])[:1]:
+            for part in candidate.get("content", {}).get("parts", []):
+                parts.append(part.get("text", ""))
+        return "".join(parts)
+
+    def generate(self, prompt):
+        try:
+            status, data = self.pool.request("POST", self._path("generateContent"), self._body(prompt),
+                                             {"Content-Type": "application/json"})
+        except Exception as e:
+            raise LLMError(f"Gemini REST 호출 실패: {e}") from e
+        if status != 200:
+            raise LLMError(f"Gemini REST 호출 실패 (HTTP {status}): {data[:300].decode('utf-8', 'replace')}")
+        return self._text_of(json.loads(data)).strip()
+
+    def stream(self, prompt):
+        """streamGenerateContent(SSE)의 data: 줄마다 텍스트 조각을 내보냅니다."""
+        path = self._path("streamGenerateContent")
+        path += "&alt=sse" if "?" in path else "?alt=sse"
+        try:
+            conn, response = self.pool.open_stream("POST", path, self._body(prompt),
+                                                   {"Content-Type": "application/json",
+                                                    "Accept": "text/event-stream"})
+        except Exception as e:
+            raise LLMError(f"Gemini REST 스트리밍 실패: {e}") from e
+        finished = False
+        try:
+            if response.status != 200:
+                data = response.read()
+                raise LLMError(f"Gemini REST 스트리밍 실패 (HTTP {response.status}): "
+                               f"{data[:300].decode('utf-8', 'replace')}")
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                text = self._text_of(json.loads(line[5:]))
+                if text:
+                    yield text
+            finished = True
+        except (LLMError, GeneratorExit):
+            raise
+        except Exception as e:
+            raise LLMError(f"Gemini REST 스트리밍 실패: {e}") from e
+        finally:
+            if finished:
+                self.pool.finish_stream(conn, response)
+            else:
+                conn.close()  # 취소/오류: 남은 응답을 읽지 않고 연결을 버림
+
+    def close(self):
+        self.pool.close()
+
+
+class GeminiCLIClient(LLMClient):
+    """기존 방식: 요청마다 gemini CLI를 실행 (대체 경로)"""
+    name = "cli"
+
+    def __init__(self, command=DEFAULT_CLI_COMMAND, model=""):
+        self.command = command
+        self.model_name = model
+
+    def generate(self, prompt):
+        try:
+            result = subprocess.run(self.command, input=prompt, text=True, capture_output=True,
+                                    encoding='utf-8', shell=True)
+        except Exception as e:
+            raise LLMError(f"Gemini CLI 실행 오류: {e}") from e
+        if result.returncode != 0:
+            raise LLMError(f"Gemini CLI 호출 실패: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def stream(self, prompt):
+        """CLI 표준 출력을 줄 단위로 내보냅니다. 중간에 그만두면 프로세스를 종료합니다."""
+        try:
+            process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE, text=True, encoding='utf-8', shell=True)
+        except Exception as e:
+            raise LLMError(f"Gemini CLI 실행 오류: {e}") from e
+        try:
+            process.stdin.write(prompt)
+            process.stdin.close()
+        except BrokenPipeError:
+            # 입력을 다 읽기 전에 종료됨 - 종료 코드로 판단
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        except Exception as e:
+            process.kill()
+            raise LLMError(f"Gemini CLI 실행 오류: {e}") from e
+        try:
+            for line in process.stdout:
+                yield line
+            if process.wait() != 0:
+                raise LLMError(f"Gemini CLI 호출 실패: {process.stderr.read().strip()}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+
+
+class FallbackClient(LLMClient):
+    """앞의 클라이언트가 실패하면 다음 클라이언트로 다시 시도"""
+    name = "fallback"
+
+    def __init__(self, clients):
+        self.clients = list(clients)
+        # 모든 경로가 같은 모델을 부르므로 첫 클라이언트의 모델 이름을 씀
+        self.model_name = self.clients[0].model_name if self.clients else ""
+
+    def generate(self, prompt):
+        errors = []
+        for client in self.clients:
+            try:
+                return client.generate(prompt)
+            except LLMError as e:
+                print(f"⚠️ {client.name} 클라이언트 실패, 다음 방법으로 재시도: {e}")
+                errors.append(str(e))
+        raise LLMError(" / ".join(errors) or "사용 가능한 LLM 클라이언트가 없습니다")
+
+    def stream(self, prompt):
+        """첫 조각이 나오기 전에 실패한 경우에만 다음 클라이언트로 넘어갑니다."""
+        errors = []
+        for client in self.clients:
+            started = False
+            try:
+                for piece in client.stream(prompt):
+                    started = True
+                    yield piece
+                return
+            except LLMError as e:
+                if started:
+                    raise
+                print(f"⚠️ {client.name} 클라이언트 실패, 다음 방법으로 재시도: {e}")
+                errors.append(str(e))
+        raise LLMError(" / ".join(errors) or "사용 가능한 LLM 클라이언트가 없습니다")
+
+    def close(self):
+        for client in self.clients:
+            client.close()
+
+
+def create_client(kind=None, model=DEFAULT_MODEL):
+    """
+    LLM 클라이언트를 만듭니다.
+
+    Args:
+        kind (str): 'auto'(기본), 'sdk', 'rest', 'cli'. 환경변수 HWP_LLM_CLIENT로도 지정 가능.
+            auto는 SDK → REST → CLI 순으로 쓸 수 있는 것을 고르고, CLI를 항상 마지막 대체 경로로 둡니다.
+    """
+    kind = kind or os.environ.get("HWP_LLM_CLIENT", "auto")
+    if kind == "sdk":
+        return GeminiSDKClient(model)
+    if kind == "rest":
+        return GeminiRESTClient(model)
+    if kind == "cli":
+        return GeminiCLIClient(f"gemini --model {model}", model)
+    if kind != "auto":
+        raise ValueError(f"알 수 없는 LLM 클라이언트입니다: {kind}")
+
+    clients = []
+    if _api_key():
+        try:
+            clients.append(GeminiSDKClient(model))
+        except LLMError:
+            clients.append(GeminiRESTClient(model))
+    elif os.environ.get("GEMINI_BASE_URL"):
+        # 로컬 대역 서버 등 키가 필요 없는 엔드포인트
+        clients.append(GeminiRESTClient(model))
+    clients.append(GeminiCLIClient(f"gemini --model {model}", model))
+    return clients[0] if len(clients) == 1 else FallbackClient(clients)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 전역 LLM 클라이언트 (처음 호출 시 한 번만 만듦)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_client()
+        return _client
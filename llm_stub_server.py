@@ -0,0 +1,159 @@
+"""
+Gemini generateContent API를 흉내 내는 로컬 대역 서버.
+네트워크 없이 LLM 호출 경로의 오버헤드(프로세스 실행, 연결 수립)를 비교할 때 사용합니다.
+
+    python llm_stub_server.py --port 8765 --latency 0.05
+    GEMINI_BASE_URL=http://127.0.0.1:8765 HWP_LLM_CLIENT=rest python gui_app.py
+
+    python llm_stub_server.py --bench -n 30   # CLI 실행 / 매번 새 연결 / 연결 재사용 비교
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import llm_client
+
+PATH_PATTERN = re.compile(r"^/v1beta/models/([^/:]+):(generateContent|streamGenerateContent)")
+STREAM_PIECE_CHARS = 8
+
+
+def stub_reply(prompt):
+    """프롬프트 길이와 마지막 줄을 알려 주는 고정 응답"""
+    last_line = next((line.strip() for line in reversed(prompt.splitlines()) if line.strip()), "")
+    return f"[stub] 프롬프트 {len(prompt)}자 수신. 마지막 줄: {last_line[:80]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+    disable_nagle_algorithm = True  # 헤더/본문을 따로 써도 지연 ACK에 걸리지 않게
+    latency = 0.0
+    reply = staticmethod(stub_reply)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _send_stream(self, model, text):
+        """
+        SSE로 응답을 조각내 보냅니다. latency는 전체 생성 시간으로 보고 조각 사이에 나눠 기다리므로
+        첫 조각은 거의 바로 도착합니다.
+        """
+        pieces = [text[i:i + STREAM_PIECE_CHARS] for i in range(0, len(text), STREAM_PIECE_CHARS)] or [""]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(self.latency / len(pieces))
+            event = {"candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}}],
+                     "modelVersion": model}
+            try:
+                self._send_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode("utf-8"))
+            except (BrokenPipeError, ConnectionResetError):
+                return  # 클라이언트가 중간에 취소
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        match = PATH_PATTERN.match(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        if not match:
+            self._send_json(404, {"error": {"message": f"지원하지 않는 경로: {self.path}"}})
+            return
+        try:
+            request = json.loads(raw)
+            prompt = "".join(part.get("text", "")
+                             for content in request.get("contents", [])
+                             for part in content.get("parts", []))
+        except ValueError:
+            self._send_json(400, {"error": {"message": "JSON 본문이 올바르지 않습니다"}})
+            return
+
+        if match.group(2) == "streamGenerateContent":
+            self._send_stream(match.group(1), self.reply(prompt))
+            return
+        time.sleep(self.latency)
+        self._send_json(200, {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": self.reply(prompt)}]}}],
+            "modelVersion": match.group(1),
+        })
+
+
+def start_server(host="127.0.0.1", port=0, latency=0.0):
+    """백그라운드 스레드에서 대역 서버를 시작하고 (server, base_url)을 반환합니다."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"latency": latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def _time_calls(client, prompt, count):
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        client.generate(prompt)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {"mean_ms": round(sum(timings) / len(timings), 2), "p50_ms": round(timings[len(timings) // 2], 2)}
+
+
+def benchmark(count=20, latency=0.0):
+    """같은 대역 서버에 대해 세 가지 호출 방식의 지연 시간을 비교합니다."""
+    server, base_url = start_server(latency=latency)
+    prompt = "### === 사용자 요청 ===\n이 문단을 공문 형식으로 바꿔줘\n" * 20
+    try:
+        pooled = llm_client.GeminiRESTClient(base_url=base_url, pool_size=4)
+        fresh = llm_client.GeminiRESTClient(base_url=base_url, pool_size=0)
+        # CLI 경로: 요청마다 셸 + 프로세스를 띄워 같은 서버를 호출하는 비용
+        cli = llm_client.GeminiCLIClient(
+            f'"{sys.executable}" -c "import sys, llm_client; '
+            f'print(llm_client.GeminiRESTClient(base_url=\'{base_url}\').generate(sys.stdin.read()))"')
+
+        results = {
+            "cli_subprocess": _time_calls(cli, prompt, max(count // 4, 3)),
+            "rest_new_connection": _time_calls(fresh, prompt, count),
+            "rest_pooled": _time_calls(pooled, prompt, count),
+        }
+        results["rest_pooled"]["connections_opened"] = pooled.pool.created
+        results["rest_new_connection"]["connections_opened"] = fresh.pool.created
+        return results
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gemini API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답마다 추가할 지연(초)")
+    parser.add_argument("--bench", action="store_true", help="호출 방식별 지연 시간 비교 후 종료")
+    parser.add_argument("-n", "--count", type=int, default=20, help="벤치마크 반복 횟수")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark(args.count, args.latency), ensure_ascii=False, indent=2))
+        sys.exit(0)
+
+    server = ThreadingHTTPServer((args.host, args.port),
+                                 type("ConfiguredStubHandler", (StubHandler,), {"latency": args.latency}))
+    print(f"🧪 Gemini 대역 서버 실행 중: http://{args.host}:{args.port} (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 대역 서버를 종료합니다.")
@@ -0,0 +1,337 @@
+"""
+템플릿 하나와 CSV/JSONL 데이터로 문서를 여러 개 만드는 편지 병합(메일 머지).
+
+    python mail_merge.py 알림장 students.csv -j 4 --name-field 학생이름
+    python mail_merge.py 알림장 rows.jsonl -o output/알림장_1학기 --skip-existing
+    python mail_merge.py 알림장 students.csv --engine native     # 한/글 없이 (Linux 서버 등)
+    python mail_merge.py 알림장 students.csv --format hwpx       # HWPX로 저장
+
+행마다 출력 파일 이름이 정해져 있으므로(템플릿_0001_이름.hwp) 다시 실행해도 같은 이름이 나오고,
+--skip-existing으로 중간에 멈춘 작업을 이어서 할 수 있습니다.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import com_pool
+import hwp5_reader
+import hwp5_writer
+import hwpx_reader
+import hwpx_writer
+import template_index
+
+DEFAULT_WORKERS = int(os.environ.get("HWP_MERGE_WORKERS", str(com_pool.DEFAULT_POOL_SIZE)))
+DEFAULT_NAME_PATTERN = "{template}_{index:04d}"
+# 한/글(pywin32)이 없으면 네이티브 병합을 기본으로
+DEFAULT_ENGINE = os.environ.get("HWP_MERGE_ENGINE") or ("com" if com_pool.win32 is not None else "native")
+
+_UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+# --- 입력 ---
+
+def read_rows(data_path):
+    """
+    CSV(첫 줄이 누름틀 이름) 또는 JSONL(한 줄에 객체 하나) 파일을 행 목록으로 읽습니다.
+    CSV는 UTF-8(BOM 포함)로 읽고, 실패하면 엑셀 기본 저장 형식인 CP949로 다시 읽습니다.
+    """
+    if data_path.lower().endswith((".jsonl", ".ndjson")):
+        rows = []
+        with open(data_path, 'r', encoding='utf-8-sig') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError(f"{data_path}:{line_no}: JSON 객체가 아닙니다")
+                rows.append(row)
+        return rows
+
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            with open(data_path, 'r', encoding=encoding, newline='') as f:
+                return [dict(row) for row in csv.DictReader(f)]
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"CSV 인코딩을 알 수 없습니다 (UTF-8 또는 CP949): {data_path}")
+
+
+def resolve_template(template_name, templates_dir=None):
+    """템플릿 이름(확장자 없어도 됨)이나 경로를 실제 파일 경로로 바꿉니다."""
+    if os.path.isfile(template_name):
+        return os.path.abspath(template_name)
+    templates_dir = templates_dir or os.path.join(os.getcwd(), "templates")
+    for name in (template_name, template_name + ".hwp", template_name + ".hwpx"):
+        path = os.path.join(templates_dir, name)
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    raise FileNotFoundError(f"템플릿 파일이 없습니다: {template_name}")
+
+
+def template_fields(template_path):
+    """템플릿의 누름틀 이름 (중복 제거, 문서 순서)"""
+    return list(dict.fromkeys(f["name"] for f in template_index.scan_fields(template_path)))
+
+
+# --- 출력 이름 ---
+
+def safe_filename(text):
+    return _UNSAFE_CHARS.sub("_", str(text)).strip(" .") or "_"
+
+
+def output_name(pattern, template, index, row):
+    """
+    행 하나의 출력 파일 이름 (확장자 제외).
+    pattern에는 {template}, {index}(1부터)와 행의 열 이름을 쓸 수 있습니다.
+    """
+    values = {k: safe_filename(v) for k, v in row.items()}
+    values.update(template=template, index=index)
+    return safe_filename(pattern.format_map(values))
+
+
+def unique_path(path):
+    """이미 있는 파일이면 _2, _3 ...을 붙인 경로"""
+    if not os.path.exists(path):
+        return path
+    stem, ext = os.path.splitext(path)
+    n = 2
+    while os.path.exists(f"{stem}_{n}{ext}"):
+        n += 1
+    return f"{stem}_{n}{ext}"
+
+
+def plan_outputs(template_path, rows, output_dir, name_pattern=None, name_field=None, ext=None):
+    """행마다 출력 경로를 정합니다. 이름이 겹치면 ValueError."""
+    template = os.path.splitext(os.path.basename(template_path))[0]
+    ext = ext or os.path.splitext(template_path)[1]
+    if name_pattern is None:
+        name_pattern = DEFAULT_NAME_PATTERN + (f"_{{{name_field}}}" if name_field else "")
+    paths, seen = [], {}
+    for index, row in enumerate(rows, 1):
+        try:
+            name = output_name(name_pattern, template, index, row)
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"{index}번째 행으로 출력 이름을 만들 수 없습니다 ({name_pattern}): {e}") from e
+        path = os.path.join(output_dir, name + ext)
+        key = os.path.normcase(path)
+        if key in seen:
+            raise ValueError(f"출력 이름이 겹칩니다: {name + ext} ({seen[key]}번째, {index}번째 행)")
+        seen[key] = index
+        paths.append(path)
+    return paths
+
+
+# --- 병합 엔진 ---
+
+MERGE_ENGINES = {}
+
+
+def register_engine(name):
+    """병합 엔진 등록 데코레이터. 엔진은 (template_path, workers)로 만들고
+    field_names(엔진이 채울 수 있는 누름틀 이름), submit(values, output_path) -> Future, close()를 제공합니다.
+    submit의 Future는 값이 있는 누름틀을 채우지 못하면 예외로 끝나야 합니다."""
+    def decorator(cls):
+        MERGE_ENGINES[name] = cls
+        return cls
+    return decorator
+
+
+@register_engine("com")
+class ComMergeEngine:
+    """
+    한/글 인스턴스 풀로 병합합니다.
+    인스턴스마다 템플릿을 한 번만 열어 두고, 행마다 모든 누름틀을 한 번의 PutFieldText로 채운 뒤
+    SaveAs로 저장합니다. (빈 값도 다시 써서 이전 행의 값이 남지 않음)
+    쓴 뒤 GetFieldText로 다시 읽어, 값이 있는데 들어가지 않은 누름틀이 있으면 그 행은 실패로 봅니다.
+    """
+
+    def __init__(self, template_path, workers=DEFAULT_WORKERS):
+        self.template_path = template_path
+        self.field_names = template_fields(template_path)
+        self.pool = com_pool.HwpComPool(size=workers)
+        self._opened = {}  # id(hwp) -> hwp (템플릿을 열어 둔 인스턴스)
+
+    def _save_format(self, output_path):
+        return "HWPX" if output_path.lower().endswith(".hwpx") else "HWP"
+
+    def submit(self, values, output_path):
+        def job(hwp):
+            if self._opened.get(id(hwp)) is not hwp:
+                if not hwp.Open(self.template_path):
+                    raise IOError(f"템플릿을 열 수 없습니다: {self.template_path}")
+                self._opened[id(hwp)] = hwp
+            if self.field_names:
+                names = "\x02".join(self.field_names)
+                hwp.PutFieldText(names, "\x02".join(values.get(name, "") for name in self.field_names))
+                written = dict(zip(self.field_names, hwp.GetFieldText(names).split("\x02")))
+                missed = [name for name in self.field_names
+                          if values.get(name) and written.get(name, "").strip() != values[name].strip()]
+                if missed:
+                    raise ValueError(f"누름틀에 값을 쓰지 못했습니다: {', '.join(missed)}")
+            if not hwp.SaveAs(output_path, self._save_format(output_path), ""):
+                raise IOError(f"저장 실패: {output_path}")
+            return output_path
+
+        return self.pool.submit(job)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def load_native_template(template_path):
+    """한/글 없이 채울 수 있는 템플릿 객체 (render/save/field_names 제공)"""
+    if hwpx_reader.is_hwpx_file(template_path):
+        return hwpx_writer.HwpxTemplate(template_path)
+    if hwp5_reader.is_hwp5_file(template_path):
+        return hwp5_writer.Hwp5Template(template_path)
+    raise ValueError(f"네이티브 병합은 HWP5/HWPX 템플릿만 지원합니다: {template_path}")
+
+
+@register_engine("native")
+class NativeMergeEngine:
+    """
+    한/글 없이 hwp5_writer / hwpx_writer로 병합합니다. (Linux 서버 등)
+    템플릿은 한 번만 읽어 스레드들이 함께 쓰고, 행마다 누름틀 문단과 그 구역만 새로 만듭니다.
+    압축과 파일 쓰기는 GIL을 놓기 때문에 스레드로도 겹쳐 실행됩니다.
+    채울 수 없는 값(개체가 든 누름틀, 바깥 누름틀 값과 맞지 않는 안쪽 누름틀 값)은 writer가 예외를 내므로 그 행은 실패합니다.
+    """
+
+    def __init__(self, template_path, workers=DEFAULT_WORKERS):
+        self.template = load_native_template(template_path)
+        # 엔진이 실제로 채우는 템플릿의 누름틀 (중첩된 안쪽 누름틀 포함)
+        self.field_names = list(self.template.field_names)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="hwp-merge")
+
+    def submit(self, values, output_path):
+        # 행마다 템플릿에서 새로 만들므로 이전 행 값이 남지 않음. 행에 없는 누름틀은 템플릿 내용 그대로 둠
+        # (안쪽 누름틀만 채우는 행이 빈 값으로 바깥 누름틀을 지우지 않도록)
+        values = {name: values[name] for name in self.field_names if name in values}
+        return self.executor.submit(self.template.save, output_path, values)
+
+    def close(self):
+        self.executor.shutdown()
+
+
+# --- 실행 ---
+
+def merge(template_name, rows, output_dir=None, workers=DEFAULT_WORKERS, engine=DEFAULT_ENGINE,
+          name_pattern=None, name_field=None, skip_existing=False, templates_dir=None, on_record=None,
+          output_format=None):
+    """
+    템플릿과 행 목록으로 문서를 만듭니다.
+
+    Args:
+        template_name (str): templates/ 안의 템플릿 이름 또는 파일 경로
+        rows (list[dict]): 누름틀 이름 → 값
+        output_dir (str): 출력 폴더 (기본: output/<템플릿 이름>)
+        workers (int): 동시에 쓸 한/글 인스턴스 수
+        engine (str): 병합 엔진 이름 ("com" 또는 "native")
+        name_pattern (str): 출력 이름 형식. 기본 "{template}_{index:04d}" (+ "_{name_field}")
+        skip_existing (bool): 출력 파일이 이미 있으면 그 행은 건너뜀
+        output_format (str): "hwp" 또는 "hwpx" (기본: 템플릿과 같은 형식)
+        on_record (callable): 행이 끝날 때마다 record를 받는 콜백
+
+    Returns:
+        dict: {"total", "succeeded", "failed", "skipped", "elapsed_ms", "records"}
+    """
+    if engine not in MERGE_ENGINES:
+        raise ValueError(f"알 수 없는 병합 엔진입니다: {engine}")
+    template_path = resolve_template(template_name, templates_dir)
+    template = os.path.splitext(os.path.basename(template_path))[0]
+    output_dir = output_dir or os.path.join(os.getcwd(), "output", template)
+    os.makedirs(output_dir, exist_ok=True)
+
+    ext = f".{output_format.lower()}" if output_format else None
+    if engine == "native" and ext and ext != os.path.splitext(template_path)[1].lower():
+        raise ValueError(f"네이티브 병합은 형식을 바꿀 수 없습니다 ({os.path.basename(template_path)} → {ext}). "
+                         f"같은 형식의 템플릿을 쓰거나 com 엔진을 사용하세요")
+    paths = plan_outputs(template_path, rows, output_dir, name_pattern, name_field, ext)
+
+    summary = {"total": len(rows), "succeeded": 0, "failed": 0, "skipped": 0, "records": []}
+    started = time.perf_counter()
+    merger = MERGE_ENGINES[engine](template_path, workers)
+    try:
+        # 열 목록은 엔진이 실제로 채우는 템플릿 기준
+        field_names = set(merger.field_names)
+        unknown = sorted({key for row in rows for key in row} - field_names - {name_field})
+        if unknown:
+            print(f"⚠️ 템플릿에 없는 열은 무시합니다: {', '.join(unknown)}", file=sys.stderr)
+        jobs = []
+        for index, (row, path) in enumerate(zip(rows, paths), 1):
+            if skip_existing and os.path.exists(path):
+                summary["skipped"] += 1
+                continue
+            values = {k: "" if v is None else str(v) for k, v in row.items() if k in field_names}
+            jobs.append((index, path, time.perf_counter(), merger.submit(values, path)))
+
+        # 제출한 순서(행 순서)대로 기록
+        for index, path, submitted, future in jobs:
+            record = {"index": index, "output": path}
+            try:
+                future.result()
+                record["ok"] = True
+                summary["succeeded"] += 1
+            except Exception as e:
+                record.update(ok=False, error=f"{type(e).__name__}: {e}")
+                summary["failed"] += 1
+            record["elapsed_ms"] = round((time.perf_counter() - submitted) * 1000, 2)
+            summary["records"].append(record)
+            if on_record:
+                on_record(record)
+    finally:
+        merger.close()
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return summary
+
+
+def merge_file(template_name, data_path, **kwargs):
+    """CSV/JSONL 파일을 읽어 merge()를 실행합니다."""
+    return merge(template_name, read_rows(data_path), **kwargs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="HWP 템플릿 편지 병합 (CSV/JSONL → 문서 여러 개)")
+    parser.add_argument("template", help="templates/ 안의 템플릿 이름 또는 템플릿 파일 경로")
+    parser.add_argument("data", help="CSV(첫 줄이 누름틀 이름) 또는 JSONL 파일")
+    parser.add_argument("-o", "--output-dir", default=None, help="출력 폴더 (기본: output/<템플릿 이름>)")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="동시에 쓸 한/글 인스턴스 수 (기본: HWP_MERGE_WORKERS 또는 풀 크기)")
+    parser.add_argument("--engine", choices=sorted(MERGE_ENGINES), default=DEFAULT_ENGINE,
+                        help="병합 방식: com(한/글 인스턴스 풀), native(한/글 없이 직접 쓰기)")
+    parser.add_argument("--name", dest="name_pattern", default=None,
+                        help='출력 이름 형식 (예: "{index:03d}_{학생이름}"). 기본: {template}_{index:04d}')
+    parser.add_argument("--name-field", default=None, help="기본 이름 뒤에 붙일 열 (예: 학생이름)")
+    parser.add_argument("--format", dest="output_format", choices=("hwp", "hwpx"), default=None,
+                        help="출력 형식 (기본: 템플릿과 같은 형식)")
+    parser.add_argument("--skip-existing", action="store_true", help="이미 만든 파일은 건너뜀 (이어서 실행)")
+    parser.add_argument("--report", default=None, help="행별 결과를 JSONL로 기록할 파일 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    report = open(args.report, "w", encoding="utf-8") if args.report else sys.stdout
+
+    def write_record(record):
+        report.write(json.dumps(record, ensure_ascii=False) + "\n")
+        report.flush()
+
+    try:
+        summary = merge_file(args.template, args.data, output_dir=args.output_dir, workers=args.workers,
+                             engine=args.engine, name_pattern=args.name_pattern, name_field=args.name_field,
+                             skip_existing=args.skip_existing, on_record=write_record,
+                             output_format=args.output_format)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ 편지 병합 실패: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if args.report:
+            report.close()
+
+    print(f"✅ 편지 병합 완료: 전체 {summary['total']}개, 성공 {summary['succeeded']}개, "
+          f"실패 {summary['failed']}개, 건너뜀 {summary['skipped']}개 "
+          f"({summary['elapsed_ms'] / 1000:.1f}초)", file=sys.stderr)
+    sys.exit(1 if summary["failed"] else 0)
@@ -0,0 +1,157 @@
+"""
+구역(BodyText/SectionN, Contents/sectionN.xml) 단위 추출 캐시.
+
+문서를 처음 읽을 때 구역마다 해석한 문단 모델(텍스트, 누름틀, 글자/문단 모양 ID, 표)을
+구역 스트림 해시로 저장해 두고, 문서가 바뀌어 다시 읽을 때는 해시가 달라진 구역만 압축을 풀고 해석합니다.
+바뀌지 않은 구역은 저장된 모델을 그대로 이어 붙여 doc_visitor 수집기에 다시 흘려보내므로,
+수집기 결과(문단 번호, 표 번호 등)는 처음부터 읽었을 때와 같습니다.
+
+서식 값(글꼴 이름, 크기 등)은 모델에 ID로만 남기고 순회할 때 현재 문서의 서식 표에서 찾으므로,
+DocInfo / header.xml만 바뀐 경우에도 구역 모델은 그대로 재사용됩니다.
+"""
+import collections
+import os
+import threading
+
+import doc_visitor
+import extraction_cache
+
+# 문단 모델 형식이 바뀌면 올려서 예전 구역 캐시를 무효화
+MODEL_VERSION = 2
+
+ENABLED = os.environ.get("HWP_SECTION_CACHE", "1") not in ("0", "false", "no")
+# 프로세스 안에 기억해 둘 구역 모델 수 (디스크 캐시 앞단)
+MEMORY_SECTIONS = int(os.environ.get("HWP_SECTION_CACHE_MEMORY", "64"))
+
+_memory = collections.OrderedDict()  # (종류, 해시) -> 문단 모델 목록
+_lock = threading.Lock()
+# 구역 조회 횟수 (추출 캐시의 적중/실패 횟수와 따로 셈)
+_stats = {"memory_hits": 0, "disk_hits": 0, "parsed": 0}
+
+
+# --- 문단 모델 ---
+
+def paragraph_model(para, parse_table):
+    """리더의 문단 객체를 JSON으로 저장할 수 있는 dict로 바꿉니다. (표 셀 안 문단 포함)"""
+    model = {
+        "text": para.text,
+        "para_shape_id": para.para_shape_id,
+        "style_id": para.style_id,
+        "runs": [list(run) for run in para.char_shape_runs],
+        "text_runs": [list(run) for run in para.text_char_shape_runs()],
+    }
+    if para.fields:
+        model["fields"] = [list(field) for field in para.fields]
+    tables = []
+    for raw in para.tables():
+        table = parse_table(raw)
+        tables.append({
+            "rows": table["rows"],
+            "cols": table["cols"],
+            "cells": [dict(cell, paragraphs=[paragraph_model(p, parse_table) for p in cell["paragraphs"]])
+                      for cell in table["cells"]],
+        })
+    if tables:
+        model["tables"] = tables
+    return model
+
+
+class CachedParagraph:
+    """저장된 문단 모델 (hwp5_reader.Paragraph / HwpxParagraph와 같은 속성)"""
+    __slots__ = ("text", "para_shape_id", "style_id", "char_shape_runs", "fields", "_text_runs", "_tables")
+
+    def __init__(self, model):
+        self.text = model["text"]
+        self.para_shape_id = model["para_shape_id"]
+        self.style_id = model["style_id"]
+        self.char_shape_runs = model["runs"]
+        self.fields = model.get("fields", [])
+        self._text_runs = model["text_runs"]
+        self._tables = [
+            {"rows": table["rows"], "cols": table["cols"],
+             "cells": [dict(cell, paragraphs=[CachedParagraph(p) for p in cell["paragraphs"]])
+                       for cell in table["cells"]]}
+            for table in model.get("tables", ())
+        ]
+
+    def text_char_shape_runs(self):
+        return self._text_runs
+
+    def tables(self):
+        """표는 이미 dict로 해석되어 있음 (visit의 parse_table은 그대로 반환)"""
+        return self._tables
+
+
+# --- 구역 모델 조회 ---
+
+def _remember(key, model):
+    with _lock:
+        _memory[key] = model
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_SECTIONS:
+            _memory.popitem(last=False)
+
+
+def section_model(doc, section_name, parse_table, cache=None):
+    """
+    구역 하나의 문단 모델 목록. 구역 스트림 해시가 같으면 메모리/디스크 캐시에서 가져오고,
+    없으면 그 구역만 해석해 저장합니다.
+    """
+    digest = doc.section_digest(section_name)
+    key = (doc.SECTION_KIND, digest)
+    mode = f"section-{doc.SECTION_KIND}-m{MODEL_VERSION}"
+    with _lock:
+        model = _memory.get(key)
+        if model is not None:
+            _memory.move_to_end(key)
+            _stats["memory_hits"] += 1
+            return model
+    cache = cache or extraction_cache.get_cache()
+    model = cache.get_by_digest(digest, mode, count=False)
+    if model is not None:
+        with _lock:
+            _stats["disk_hits"] += 1
+    else:
+        model = [paragraph_model(para, parse_table) for para in doc.section_paragraphs(section_name)]
+        with _lock:
+            _stats["parsed"] += 1
+        try:
+            cache.put_by_digest(digest, mode, model)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ 구역 캐시 저장 실패: {e}")
+    _remember(key, model)
+    return model
+
+
+def iter_section_paragraphs(doc, parse_table, cache=None):
+    """(구역 번호, CachedParagraph)를 문서 순서대로 반환. 구역은 차례가 왔을 때 가져옵니다."""
+    for index, section_name in enumerate(doc.section_names()):
+        for model in section_model(doc, section_name, parse_table, cache):
+            yield index, CachedParagraph(model)
+
+
+def visit(doc, parse_table, collectors, cache=None, use_cache=True):
+    """
+    구역 캐시를 거쳐 문서를 순회합니다. (리더의 visit()가 호출)
+
+    Args:
+        doc: section_names / section_digest / section_paragraphs / doc_info / SECTION_KIND를 제공하는 문서 객체
+        parse_table: 리더의 표 해석 함수 (새로 해석하는 구역에만 사용)
+        use_cache: False면 메모리/디스크 캐시를 모두 건너뛰고 모든 구역을 새로 해석함 (저장도 하지 않음)
+    """
+    if not (ENABLED and use_cache):
+        paragraphs = ((index, para) for index, name in enumerate(doc.section_names())
+                      for para in doc.section_paragraphs(name))
+        return doc_visitor.visit(doc, paragraphs, parse_table, collectors)
+    return doc_visitor.visit(doc, iter_section_paragraphs(doc, parse_table, cache), lambda table: table, collectors)
+
+
+def stats():
+    """이 프로세스에서 재사용한 구역 수(메모리/디스크)와 새로 해석한 구역 수"""
+    with _lock:
+        return dict(_stats, reused=_stats["memory_hits"] + _stats["disk_hits"], memory_sections=len(_memory))
+
+
+def clear_memory():
+    with _lock:
+        _memory.clear()
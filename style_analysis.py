@@ -0,0 +1,165 @@
+import json
+import os
+import re
+
+# 한 번에 Gemini에 보낼 번호 붙은 텍스트의 최대 길이(문자). 넘으면 문단 경계에서 나눔
+DEFAULT_CHUNK_CHARS = int(os.environ.get("HWP_STYLE_CHUNK_CHARS", "12000"))
+DEFAULT_CONCURRENCY = int(os.environ.get("HWP_STYLE_CONCURRENCY", "4"))
+
+
+def numbered_lines(full_text):
+    """
+    빈 줄을 뺀 (원래 줄 번호, 내용) 목록과 빈 줄 번호 집합.
+    줄 번호는 select_text_by_line_range가 쓰는 문서 전체 기준 번호(1부터)입니다.
+    """
+    lines, blanks = [], set()
+    for i, line in enumerate(full_text.split('\n'), 1):
+        if line.strip():
+            lines.append((i, line.strip()))
+        else:
+            blanks.add(i)
+    return lines, blanks
+
+
+def format_lines(lines):
+    return '\n'.join(f"줄 {number}: {text}" for number, text in lines)
+
+
+def split_chunks(lines, blanks, max_chars=DEFAULT_CHUNK_CHARS):
+    """
+    번호 붙은 줄을 max_chars 이하 조각으로 나눕니다.
+    줄(문단) 중간은 자르지 않고, 조각이 어느 정도 찼으면 빈 줄로 구분된 문단 묶음 경계에서 먼저 끊습니다.
+    """
+    chunks, current, size = [], [], 0
+    soft_limit = max_chars * 0.6
+    for number, text in lines:
+        line_size = len(text) + 12
+        at_block_boundary = current and (number - 1) in blanks
+        if current and (size + line_size > max_chars or (size >= soft_limit and at_block_boundary)):
+            chunks.append(current)
+            current, size = [], 0
+        current.append((number, text))
+        size += line_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def localize(chunk):
+    """조각 안에서 1부터 다시 매긴 줄 목록과 (조각 번호 → 원래 줄 번호) 표"""
+    local = [(i, text) for i, (_, text) in enumerate(chunk, 1)]
+    return local, [number for number, _ in chunk]
+
+
+def parse_style_plan(text):
+    """Gemini 응답에서 style_plan 목록을 꺼냅니다. 형식이 맞지 않으면 None."""
+    if not text:
+        return None
+    match = re.search(r'```(?:json)?\s*(.*?)\s*```', text, re.DOTALL)
+    candidate = match.group(1) if match else text
+    start = min((i for i in (candidate.find('{'), candidate.find('[')) if i >= 0), default=-1)
+    if start < 0:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(candidate[start:])
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        data = data.get("style_plan")
+    return data if isinstance(data, list) else None
+
+
+def renumber(plan, line_map):
+    """조각 기준 줄 번호를 원래 문서 줄 번호로 바꿉니다. 범위를 벗어나면 조각 끝으로 맞춥니다."""
+    renumbered = []
+    last = len(line_map)
+    for item in plan:
+        try:
+            start = int(item.get("start_line", 0))
+            end = int(item.get("end_line", start))
+        except (TypeError, ValueError, AttributeError):
+            continue
+        start, end = max(1, min(start, last)), max(1, min(end, last))
+        if start > end:
+            start, end = end, start
+        renumbered.append(dict(item, start_line=line_map[start - 1], end_line=line_map[end - 1]))
+    return renumbered
+
+
+def merge_plans(plans, blanks=()):
+    """
+    조각별 계획을 하나로 합칩니다. 줄 순서로 정렬하고,
+    조각 경계를 사이에 두고 이어지는(빈 줄만 사이에 있는) 같은 스타일 구간은 하나로 붙입니다.
+    """
+    items = sorted((item for plan in plans for item in plan), key=lambda p: (p["start_line"], p["end_line"]))
+    merged = []
+    for item in items:
+        prev = merged[-1] if merged else None
+        if prev and prev.get("style_type") == item.get("style_type"):
+            gap = range(prev["end_line"] + 1, item["start_line"])
+            if item["start_line"] <= prev["end_line"] + 1 or all(n in blanks for n in gap):
+                prev["end_line"] = max(prev["end_line"], item["end_line"])
+                if "confidence" in item or "confidence" in prev:
+                    prev["confidence"] = min(prev.get("confidence", 1.0), item.get("confidence", 1.0))
+                continue
+        merged.append(dict(item))
+    return merged
+
+
+def normalize_plan(plan, style_of):
+    """
+    스타일 계획 항목을 정수 줄 범위와 실제 적용할 스타일로 정리합니다.
+    style_of(item)이 None을 돌려주는 항목(매핑되지 않았거나 없는 스타일)과 줄 번호가 잘못된 항목은 뺍니다.
+
+    Returns:
+        list: 계획 순서의 {"start_line", "end_line", "style", "style_type", "confidence", "order"}
+    """
+    normalized = []
+    for order, item in enumerate(plan):
+        try:
+            start = int(item["start_line"])
+            end = int(item.get("end_line", start))
+            confidence = float(item.get("confidence", 1.0))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+        style = style_of(item)
+        if style is None:
+            continue
+        if start > end:
+            start, end = end, start
+        normalized.append({"start_line": start, "end_line": end, "style": style,
+                           "style_type": item.get("style_type"), "confidence": confidence, "order": order})
+    return normalized
+
+
+def coalesce_plan(items, blanks=()):
+    """
+    normalize_plan 결과를 겹치지 않는 구간 목록으로 만듭니다.
+
+    - 여러 항목이 겹치는 줄은 confidence가 높은 항목, 같으면 범위가 좁은 항목,
+      그래도 같으면 계획에서 먼저 나온 항목의 스타일을 씁니다.
+    - 같은 스타일로 이어지거나 빈 줄만 사이에 둔 구간은 하나로 합칩니다.
+
+    Returns:
+        list: 문서 순서의 {"start_line", "end_line", "style", "style_type", "sources"(원래 항목 순번)}
+    """
+    points = sorted({item["start_line"] for item in items} | {item["end_line"] + 1 for item in items})
+    rank = lambda item: (-item["confidence"], item["end_line"] - item["start_line"], item["order"])
+    merged = []
+    for start, stop in zip(points, points[1:]):
+        covering = [item for item in items if item["start_line"] <= start and item["end_line"] >= stop - 1]
+        if not covering:
+            continue
+        winner = min(covering, key=rank)
+        prev = merged[-1] if merged else None
+        if prev and prev["style"] == winner["style"]:
+            gap = range(prev["end_line"] + 1, start)
+            if all(n in blanks for n in gap):
+                prev["end_line"] = stop - 1
+                prev["sources"].add(winner["order"])
+                continue
+        merged.append({"start_line": start, "end_line": stop - 1, "style": winner["style"],
+                       "style_type": winner["style_type"], "sources": {winner["order"]}})
+    for item in merged:
+        item["sources"] = sorted(item["sources"])
+    return merged
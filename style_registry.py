@@ -0,0 +1,187 @@
+"""
+styles/*.json 스타일 등록부.
+
+스타일 파일은 처음 쓸 때 한 번만 읽어 검사하고, CharShape / ParaShape 항목을 (이름, 값) 튜플로 미리 만들어 둡니다.
+파일 수정 시각이 바뀌면 그 파일만 다시 읽고(핫 리로드), 폴더 수정 시각이 바뀌면 목록을 다시 만듭니다.
+
+COM 쪽에서는 PreparedStyle이 HwpObject별로 액션과 파라미터 셋을 한 번만 만들어 항목을 채워 두므로,
+같은 스타일을 여러 번 적용해도 Execute만 호출합니다.
+
+    registry = style_registry.get_registry()
+    registry.names()                     # ['보고서_대제목', ...]
+    style = registry.get("보고서_본문")  # CompiledStyle | None
+"""
+import hashlib
+import json
+import os
+import threading
+
+STYLE_DIR_NAME = os.environ.get("HWP_STYLE_DIR", "styles")
+
+# 스타일 JSON의 파라미터 섹션 -> 한/글 액션 이름
+SHAPE_ACTIONS = (("CharShape", "CharShape"), ("ParaShape", "ParagraphShape"))
+
+
+class StyleError(ValueError):
+    """스타일 JSON 형식이 올바르지 않음"""
+
+
+def _check_value(section, key, value):
+    if not isinstance(key, str) or not key:
+        raise StyleError(f"{section}의 항목 이름이 올바르지 않습니다: {key!r}")
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float, str)):
+        return value
+    raise StyleError(f"{section}.{key} 값은 숫자나 문자열이어야 합니다: {value!r}")
+
+
+class CompiledStyle:
+    """검사를 마치고 파라미터 항목을 미리 만들어 둔 스타일"""
+    __slots__ = ("name", "description", "payloads", "key")
+
+    def __init__(self, name, data):
+        if not isinstance(data, dict):
+            raise StyleError("스타일 JSON의 최상위는 객체여야 합니다")
+        self.name = name
+        self.description = str(data.get("description", ""))
+        payloads = []
+        for section, action_name in SHAPE_ACTIONS:
+            items = data.get(section)
+            if items is None:
+                continue
+            if not isinstance(items, dict):
+                raise StyleError(f"{section}은(는) 객체여야 합니다")
+            compiled = tuple((key, _check_value(section, key, value)) for key, value in items.items())
+            if compiled:
+                payloads.append((section, action_name, compiled))
+        if not payloads:
+            raise StyleError("CharShape 또는 ParaShape 항목이 없습니다")
+        self.payloads = tuple(payloads)
+        # 내용이 같으면 키도 같음 (파일이 바뀌면 PreparedStyle 캐시도 자연히 새로 만들어짐)
+        canonical = json.dumps([self.payloads], ensure_ascii=False, sort_keys=True)
+        self.key = hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    def sections(self):
+        return [section for section, _, _ in self.payloads]
+
+
+class PreparedStyle:
+    """HwpObject 하나에 묶인 액션/파라미터 셋 (항목은 만들 때 한 번만 채움)"""
+
+    def __init__(self, hwp, style):
+        self.style = style
+        self.steps = []
+        for section, action_name, items in style.payloads:
+            action = hwp.CreateAction(action_name)
+            pset = action.CreateSet()
+            for key, value in items:
+                pset.SetItem(key, value)
+            self.steps.append((section, action, pset))
+
+    def execute(self):
+        """선택 영역에 적용하고, 적용한 섹션 이름 목록을 반환합니다."""
+        applied = []
+        for section, action, pset in self.steps:
+            action.Execute(pset)
+            applied.append(section)
+        return applied
+
+
+class StyleRegistry:
+    """
+    스타일 폴더 하나의 등록부. 목록은 폴더 수정 시각, 스타일은 파일 수정 시각으로 최신 여부를 확인하므로
+    GUI에서 목록을 새로 고치거나 스타일을 적용할 때 stat 한 번 외에는 파일을 다시 읽지 않습니다.
+    """
+
+    def __init__(self, style_dir):
+        self.style_dir = style_dir
+        self._lock = threading.Lock()
+        self._dir_mtime = None
+        self._names = []
+        # 이름 -> (수정 시각, CompiledStyle | None)
+        self._styles = {}
+        self.errors = {}
+        self.loads = 0
+
+    def _path(self, name):
+        return os.path.join(self.style_dir, f"{name}.json")
+
+    def names(self):
+        """사용 가능한 스타일 이름 목록 (형식이 잘못된 파일은 제외). 폴더가 없으면 만들고 빈 목록."""
+        try:
+            mtime = os.stat(self.style_dir).st_mtime_ns
+        except FileNotFoundError:
+            os.makedirs(self.style_dir, exist_ok=True)
+            return []
+        with self._lock:
+            if mtime == self._dir_mtime:
+                return self._valid(self._names)
+        names = sorted(f[:-5] for f in os.listdir(self.style_dir) if f.endswith(".json"))
+        for name in names:
+            self.get(name)
+        with self._lock:
+            self._dir_mtime, self._names = mtime, names
+            for stale in set(self._styles) - set(names):
+                self._styles.pop(stale, None)
+                self.errors.pop(stale, None)
+            return self._valid(names)
+
+    def _valid(self, names):
+        return [name for name in names if self._styles.get(name, (None, None))[1] is not None]
+
+    def get(self, name):
+        """이름에 해당하는 CompiledStyle. 파일이 없거나 형식이 잘못되었으면 None."""
+        path = self._path(name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._styles.pop(name, None)
+            return None
+        with self._lock:
+            entry = self._styles.get(name)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+        style = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                style = CompiledStyle(name, json.load(f))
+            self.errors.pop(name, None)
+        except (OSError, ValueError) as e:
+            self.errors[name] = str(e)
+            print(f"⚠️ 스타일 '{name}'을(를) 읽을 수 없습니다: {e}")
+        with self._lock:
+            self._styles[name] = (mtime, style)
+            self.loads += 1
+        return style
+
+    def clear(self):
+        with self._lock:
+            self._dir_mtime = None
+            self._names = []
+            self._styles.clear()
+            self.errors.clear()
+
+
+def compile_style(style, name=""):
+    """스타일 이름, dict 또는 CompiledStyle을 CompiledStyle로 바꿉니다. 없는 이름이면 None."""
+    if isinstance(style, CompiledStyle):
+        return style
+    if isinstance(style, str):
+        return get_registry().get(style)
+    return CompiledStyle(name, style)
+
+
+_registries = {}
+_registry_lock = threading.Lock()
+
+
+def get_registry(style_dir=None):
+    """스타일 폴더별 전역 등록부 (기본: 현재 작업 디렉토리의 styles/)"""
+    style_dir = os.path.abspath(style_dir or os.path.join(os.getcwd(), STYLE_DIR_NAME))
+    with _registry_lock:
+        registry = _registries.get(style_dir)
+        if registry is None:
+            registry = _registries[style_dir] = StyleRegistry(style_dir)
+        return registry
@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+
+import extraction_cache
+import hwp5_reader
+import hwpx_reader
+
+INDEX_VERSION = 2
+TEMPLATE_EXTENSIONS = (".hwp", ".hwpx")
+
+
+def scan_fields(file_path):
+    """
+    한/글 없이 문서의 누름틀 이름과 위치를 읽습니다.
+
+    Returns:
+        list: [{"name", "section", "paragraph", "value"}] (문서 순서)
+    """
+    reader = hwpx_reader if hwpx_reader.is_hwpx_file(file_path) else hwp5_reader
+    return [
+        {"name": e["name"], "section": e["section"], "paragraph": e["index"], "value": e["value"]}
+        for e in reader.iter_elements(file_path)
+        if e["type"] == "field"
+    ]
+
+
+class TemplateIndex:
+    """
+    templates/ 폴더의 누름틀 색인.
+    파일마다 수정 시각/크기/내용 해시와 누름틀 목록을 JSON으로 저장해 두고,
+    바뀐 파일만 다시 읽어 갱신합니다. (수정 시각만 바뀌고 내용이 같으면 해시로 걸러냄)
+    """
+
+    def __init__(self, templates_dir=None, index_path=None):
+        self.templates_dir = templates_dir or os.path.join(os.getcwd(), "templates")
+        self.index_path = index_path or os.path.join(extraction_cache.DEFAULT_CACHE_DIR, "template_index.json")
+        self._lock = threading.RLock()
+        self.entries = {}
+        self.load()
+
+    # --- 저장 / 불러오기 ---
+    def load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("templates", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "templates": self.entries}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    # --- 갱신 ---
+    def _template_files(self):
+        if not os.path.isdir(self.templates_dir):
+            return {}
+        return {
+            f: os.path.join(self.templates_dir, f)
+            for f in sorted(os.listdir(self.templates_dir))
+            if f.lower().endswith(TEMPLATE_EXTENSIONS)
+        }
+
+    def _update_entry(self, file_name, file_path):
+        """
+        파일 하나의 색인을 필요할 때만 갱신합니다.
+
+        Returns:
+            str: "unchanged" | "touched"(시각만 바뀜) | "updated" | "added"
+        """
+        st = os.stat(file_path)
+        entry = self.entries.get(file_name)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return "unchanged"
+
+        digest = extraction_cache.file_digest(file_path)
+        if entry and entry["sha256"] == digest:
+            entry["mtime_ns"] = st.st_mtime_ns
+            entry["size"] = st.st_size
+            return "touched"
+
+        self.entries[file_name] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+            "fields": scan_fields(file_path),
+        }
+        return "updated" if entry else "added"
+
+    def refresh(self):
+        """templates/ 전체를 훑어 바뀐 파일만 다시 색인합니다."""
+        counts = {"added": 0, "updated": 0, "touched": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        with self._lock:
+            files = self._template_files()
+            for file_name in list(self.entries):
+                if file_name not in files:
+                    del self.entries[file_name]
+                    counts["removed"] += 1
+            for file_name, file_path in files.items():
+                try:
+                    counts[self._update_entry(file_name, file_path)] += 1
+                except Exception as e:
+                    print(f"⚠️ 템플릿 색인 실패 ({file_name}): {e}")
+                    self.entries.pop(file_name, None)
+                    counts["failed"] += 1
+            if counts["unchanged"] != len(files) or counts["removed"]:
+                self.save()
+        return counts
+
+    def _resolve(self, template_name):
+        """템플릿 이름(확장자 없어도 됨)을 templates/ 안의 파일 이름으로 바꿉니다."""
+        if template_name.lower().endswith(TEMPLATE_EXTENSIONS):
+            return template_name
+        for ext in TEMPLATE_EXTENSIONS:
+            if os.path.exists(os.path.join(self.templates_dir, template_name + ext)):
+                return template_name + ext
+        raise FileNotFoundError(f"템플릿 파일이 없습니다: {template_name}")
+
+    # --- 조회 ---
+    def entry(self, template_name):
+        """템플릿 하나의 색인 항목 (바뀌었으면 그 파일만 다시 읽음)"""
+        file_name = self._resolve(template_name)
+        with self._lock:
+            status = self._update_entry(file_name, os.path.join(self.templates_dir, file_name))
+            if status != "unchanged":
+                self.save()
+            return self.entries[file_name]
+
+    def field_positions(self, template_name):
+        return list(self.entry(template_name)["fields"])
+
+    def fields(self, template_name):
+        """누름틀 이름 목록 (중복 제거, 문서 순서)"""
+        return list(dict.fromkeys(f["name"] for f in self.entry(template_name)["fields"]))
+
+    def templates(self):
+        """색인된 템플릿 이름 목록 (확장자 제외)"""
+        with self._lock:
+            return [os.path.splitext(name)[0] for name in self.entries]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """templates/ 폴더의 전역 색인"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TemplateIndex()
+        return _index
@@ -0,0 +1,19 @@
+"""
+테스트 공통 설정: 저장소 루트의 모듈을 import할 수 있게 하고,
+추출 캐시는 테스트마다 새 임시 폴더를 쓰도록 합니다. (한/글 없이 Linux에서 실행)
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# 모듈이 import될 때 기본 캐시 폴더를 정하므로 import 전에 설정
+os.environ.setdefault("HWP_CACHE_DIR", tempfile.mkdtemp(prefix="hwp_test_cache_"))
+
+TEMPLATES_DIR = os.path.join(ROOT, "templates")
+TARGET_DIR = os.path.join(ROOT, "target")
+
+# 문서제목 누름틀 안에 평가학기 누름틀이 들어 있는 템플릿 (detail, 공문예시, target/sample2)
+NESTED_OUTER = "문서제목 자동생성 필드"
+NESTED_INNER = "평가학기 자동생성 필드"
@@ -0,0 +1,24 @@
+import extraction_cache
+
+
+def test_digest_memo_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache, "MEMORY_DIGESTS", 3)
+    cache = extraction_cache.ExtractionCache(cache_dir=str(tmp_path / "cache"))
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"{i}.hwp"
+        path.write_bytes(f"문서 {i}".encode("utf-8"))
+        paths.append(str(path))
+        assert cache.digest(str(path)) == extraction_cache.file_digest(str(path))
+    assert len(cache._digests) == 3
+    # 가장 최근에 쓴 항목이 남음
+    assert [stamp[0] for stamp in cache._digests] == [str(tmp_path / f"{i}.hwp") for i in (2, 3, 4)]
+
+
+def test_changed_file_gets_new_digest(tmp_path):
+    cache = extraction_cache.ExtractionCache(cache_dir=str(tmp_path / "cache"))
+    path = tmp_path / "a.hwp"
+    path.write_bytes(b"first")
+    first = cache.digest(str(path))
+    path.write_bytes(b"second version")
+    assert cache.digest(str(path)) != first
@@ -0,0 +1,80 @@
+import glob
+import os
+
+import pytest
+
+import hwp5_reader
+import hwp5_writer
+from conftest import NESTED_INNER, NESTED_OUTER, TARGET_DIR, TEMPLATES_DIR
+
+HWP_FILES = sorted(glob.glob(os.path.join(TEMPLATES_DIR, "*.hwp")) + glob.glob(os.path.join(TARGET_DIR, "*.hwp")))
+DETAIL = os.path.join(TEMPLATES_DIR, "detail.hwp")
+
+
+@pytest.fixture(params=HWP_FILES, ids=os.path.basename)
+def hwp_file(request):
+    return request.param
+
+
+def test_reader_section_cache_matches_fresh_parse(hwp_file):
+    with hwp5_reader.Hwp5File(hwp_file) as doc:
+        fresh = doc.visit(["full_text", "fields", "tables"], use_cache=False)
+    with hwp5_reader.Hwp5File(hwp_file) as doc:
+        doc.visit(["full_text"])
+        cached = doc.visit(["full_text", "fields", "tables"])
+    assert cached == fresh
+
+
+def test_writer_lists_the_fields_the_reader_sees(hwp_file):
+    _, fields = hwp5_reader.read_text_and_fields(hwp_file)
+    assert hwp5_writer.Hwp5Template(hwp_file).field_names == list(fields)
+
+
+def test_render_without_values_keeps_text_and_fields(hwp_file, tmp_path):
+    output = str(tmp_path / "out.hwp")
+    hwp5_writer.Hwp5Template(hwp_file).save(output, {})
+    assert hwp5_reader.read_text_and_fields(output) == hwp5_reader.read_text_and_fields(hwp_file)
+
+
+def test_filled_values_read_back(hwp_file, tmp_path):
+    template = hwp5_writer.Hwp5Template(hwp_file)
+    # 바깥 누름틀은 안쪽 누름틀 값을 따라가므로 안쪽만 채움
+    values = {name: f"값 {i}" for i, name in enumerate(template.field_names) if name != NESTED_OUTER}
+    output = str(tmp_path / "out.hwp")
+    template.save(output, values)
+    _, fields = hwp5_reader.read_text_and_fields(output)
+    assert {name: fields.get(name) for name in values} == values
+
+
+def _fill_detail(tmp_path, values):
+    output = str(tmp_path / "detail.hwp")
+    hwp5_writer.Hwp5Template(DETAIL).save(output, values)
+    return hwp5_reader.read_text_and_fields(output)[1]
+
+
+def test_nested_inner_field_updates_outer(tmp_path):
+    fields = _fill_detail(tmp_path, {NESTED_INNER: "2학기"})
+    assert fields[NESTED_INNER] == "2학기"
+    assert fields[NESTED_OUTER] == "2학기 총괄평가 실시 계획 안내"
+
+
+def test_nested_outer_value_keeps_inner_field(tmp_path):
+    fields = _fill_detail(tmp_path, {NESTED_OUTER: "2학기 기말평가 안내", NESTED_INNER: "2학기"})
+    assert fields[NESTED_OUTER] == "2학기 기말평가 안내"
+    assert fields[NESTED_INNER] == "2학기"
+
+
+def test_nested_outer_value_without_inner_text_removes_inner(tmp_path):
+    fields = _fill_detail(tmp_path, {NESTED_OUTER: "새 제목"})
+    assert fields[NESTED_OUTER] == "새 제목"
+    assert NESTED_INNER not in fields
+
+
+def test_conflicting_nested_values_are_rejected():
+    with pytest.raises(hwp5_reader.HwpFormatError):
+        hwp5_writer.Hwp5Template(DETAIL).render({NESTED_OUTER: "새 제목", NESTED_INNER: "2학기"})
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(hwp5_reader.HwpFormatError):
+        hwp5_writer.Hwp5Template(DETAIL).render({"없는 누름틀": "값"})
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+import hwp5_reader
+import hwp_assistant
+import line_index
+import llm_client
+from conftest import NESTED_INNER, TEMPLATES_DIR
+
+DETAIL = os.path.join(TEMPLATES_DIR, "detail.hwp")
+
+
+@pytest.fixture
+def memory_assistant(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assistant = hwp_assistant.HWPAssistant(backend="memory")
+    yield assistant
+    assistant.close_file()
+
+
+def test_com_only_actions_fail_cleanly_on_memory_backend(memory_assistant):
+    assert memory_assistant.open_file(DETAIL)
+    assert memory_assistant.convert_text_to_field("1학기", "학기") is False
+    assert memory_assistant._remove_all_fields() is False
+    assert memory_assistant.insert_table("|a|b|\n|-|-|\n|1|2|") is False
+    assert memory_assistant.apply_style_to_selection("보고서_본문") is False
+
+
+def test_memory_backend_reads_fields_from_opened_file(memory_assistant):
+    assert memory_assistant.open_file(DETAIL)
+    assert NESTED_INNER in memory_assistant.backend.get_field_list()
+    with pytest.raises(ValueError):
+        memory_assistant.backend.save_as("out.hwp")
+
+
+def test_template_document_on_memory_backend_is_a_real_hwp(memory_assistant, tmp_path):
+    os.makedirs(tmp_path / "templates")
+    with open(DETAIL, "rb") as src, open(tmp_path / "templates" / "detail.hwp", "wb") as dst:
+        dst.write(src.read())
+    assert memory_assistant.create_document_from_template("detail", {NESTED_INNER: "2학기"})
+    (output,) = os.listdir(tmp_path / "output")
+    _, fields = hwp5_reader.read_text_and_fields(str(tmp_path / "output" / output))
+    assert fields[NESTED_INNER] == "2학기"
+
+
+class _PlanClient(llm_client.LLMClient):
+    """조각마다 첫 줄을 본문으로 분류하는 가짜 LLM (호출 수를 셈)"""
+    name = "test"
+    model_name = "test-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        return '{"style_plan": [{"start_line": 1, "end_line": 1, "style_type": "본문"}]}'
+
+
+def test_chunked_analysis_records_one_cache_status(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = _PlanClient()
+    assistant = hwp_assistant.HWPAssistant(backend="memory", llm=client)
+    assistant.backend.load_text("\n".join(f"{i}번째 문단 내용입니다" for i in range(40)) + f"\n{tmp_path}")
+    assistant.is_opened = True
+
+    assistant.analyze_document_structure(chunked=True, max_chars=200, concurrency=4)
+    assert assistant.last_llm_cache == "miss"
+    chunk_calls = client.calls
+    assert chunk_calls > 1
+
+    assistant.analyze_document_structure(chunked=True, max_chars=200, concurrency=4)
+    assert assistant.last_llm_cache == "hit"
+    assert client.calls == chunk_calls
+
+    assistant.use_llm_cache = False
+    assistant.analyze_document_structure(chunked=True, max_chars=200, concurrency=4)
+    assert assistant.last_llm_cache == "bypass"
+
+
+class _FakeHwp:
+    """SetPos / SelectText 호출만 기록하는 HwpObject 대역"""
+
+    def __init__(self):
+        self.selections = []
+
+    def SetPos(self, list_id, para, pos):
+        self.selections.append(("SetPos", list_id, para, pos))
+
+    def SelectText(self, start_para, start_pos, end_para, end_pos):
+        self.selections.append(("SelectText", start_para, start_pos, end_para, end_pos))
+        return True
+
+
+def _span(list_id, para, text):
+    span = line_index.LineSpan(list_id, para, 0, text)
+    span.end_pos = len(text)
+    return span
+
+
+def test_line_range_across_lists_is_not_partially_selected(memory_assistant):
+    memory_assistant.backend.hwp = _FakeHwp()
+    index = line_index.LineIndex([_span(0, 0, "본문"), _span(5, 0, "표 셀"), _span(0, 1, "다음 본문")])
+
+    assert memory_assistant.select_text_by_line_range(1, 1, index) is True
+    assert memory_assistant.select_text_by_line_range(1, 3, index) is False
+    assert memory_assistant.backend.hwp.selections == [("SetPos", 0, 0, 0), ("SelectText", 0, 0, 0, 2)]
@@ -0,0 +1,106 @@
+import zipfile
+
+import pytest
+
+import hwpx_reader
+import hwpx_writer
+from conftest import NESTED_INNER, NESTED_OUTER
+
+NS = ('xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph" '
+      'xmlns:hs="http://www.hancom.co.kr/hwpml/2011/section" '
+      'xmlns:hh="http://www.hancom.co.kr/hwpml/2011/head"')
+
+
+def _begin(field_id, name):
+    return (f'<hp:ctrl><hp:fieldBegin id="{field_id}" type="CLICK_HERE" name="{name}" editable="1">'
+            f'<hp:parameters cnt="0"/></hp:fieldBegin></hp:ctrl>')
+
+
+def _end(field_id):
+    return f'<hp:ctrl><hp:fieldEnd beginIDRef="{field_id}" fieldid="{field_id}"/></hp:ctrl>'
+
+
+def _paragraph(body):
+    return (f'<hp:p paraPrIDRef="0"><hp:run charPrIDRef="0">{body}</hp:run>'
+            f'<hp:linesegarray><hp:lineseg textpos="0"/></hp:linesegarray></hp:p>')
+
+
+SECTION = (
+    _paragraph('<hp:t>날짜: </hp:t>' + _begin(1, "작성일") + '<hp:t>2025년 9월 1일</hp:t>' + _end(1)
+               + '<hp:t> 끝</hp:t>')
+    + _paragraph(_begin(2, NESTED_OUTER) + _begin(3, NESTED_INNER) + '<hp:t>1학기</hp:t>' + _end(3)
+                 + '<hp:t> 총괄평가 안내</hp:t>' + _end(2))
+    + _paragraph(_begin(4, "빈칸") + _end(4))
+)
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    path = tmp_path / "template.hwpx"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("mimetype", "application/hwp+zip", compress_type=zipfile.ZIP_STORED)
+        z.writestr("Contents/header.xml", f'<?xml version="1.0" encoding="UTF-8"?><hh:head {NS}/>',
+                   compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("Contents/section0.xml", f'<?xml version="1.0" encoding="UTF-8"?><hs:sec {NS}>{SECTION}</hs:sec>',
+                   compress_type=zipfile.ZIP_DEFLATED)
+    return str(path)
+
+
+def _fill(template_path, tmp_path, values):
+    output = str(tmp_path / "out.hwpx")
+    hwpx_writer.HwpxTemplate(template_path).save(output, values)
+    return output
+
+
+def test_field_names_include_nested_fields(template_path):
+    assert hwpx_writer.HwpxTemplate(template_path).field_names == ["작성일", NESTED_OUTER, NESTED_INNER, "빈칸"]
+
+
+def test_render_without_values_keeps_document(template_path, tmp_path):
+    output = _fill(template_path, tmp_path, {})
+    assert hwpx_reader.read_text_and_fields(output) == hwpx_reader.read_text_and_fields(template_path)
+    with zipfile.ZipFile(template_path) as before, zipfile.ZipFile(output) as after:
+        assert after.namelist() == before.namelist()
+        assert after.infolist()[0].compress_type == zipfile.ZIP_STORED
+        for name in before.namelist():
+            assert after.read(name) == before.read(name)
+
+
+def test_filled_values_read_back(template_path, tmp_path):
+    output = _fill(template_path, tmp_path, {"작성일": "2026년 <3월> & 2일", "빈칸": "새 값"})
+    text, fields = hwpx_reader.read_text_and_fields(output)
+    assert fields["작성일"] == "2026년 <3월> & 2일"
+    assert fields["빈칸"] == "새 값"
+    assert "날짜: 2026년 <3월> & 2일 끝" in text
+    with zipfile.ZipFile(output) as z:
+        # 값을 넣은 문단의 줄 배치 정보는 지움
+        assert z.read("Contents/section0.xml").count(b"<hp:linesegarray>") == 1
+
+
+def test_nested_inner_field_updates_outer(template_path, tmp_path):
+    _, fields = hwpx_reader.read_text_and_fields(_fill(template_path, tmp_path, {NESTED_INNER: "2학기"}))
+    assert fields[NESTED_INNER] == "2학기"
+    assert fields[NESTED_OUTER] == "2학기 총괄평가 안내"
+
+
+def test_nested_outer_value_keeps_inner_field(template_path, tmp_path):
+    output = _fill(template_path, tmp_path, {NESTED_OUTER: "2학기 결과 안내", NESTED_INNER: "2학기"})
+    _, fields = hwpx_reader.read_text_and_fields(output)
+    assert fields[NESTED_OUTER] == "2학기 결과 안내"
+    assert fields[NESTED_INNER] == "2학기"
+
+
+def test_nested_outer_value_without_inner_text_removes_inner(template_path, tmp_path):
+    _, fields = hwpx_reader.read_text_and_fields(_fill(template_path, tmp_path, {NESTED_OUTER: "새 제목"}))
+    assert fields[NESTED_OUTER] == "새 제목"
+    assert NESTED_INNER not in fields
+
+
+def test_conflicting_nested_values_are_rejected(template_path):
+    with pytest.raises(ValueError):
+        hwpx_writer.HwpxTemplate(template_path).render({NESTED_OUTER: "새 제목", NESTED_INNER: "2학기"})
+
+
+def test_unknown_field_is_rejected(template_path):
+    with pytest.raises(ValueError):
+        hwpx_writer.HwpxTemplate(template_path).render({"없는 누름틀": "값"})
@@ -0,0 +1,66 @@
+import style_analysis
+
+
+def _plan(*items):
+    """(시작 줄, 끝 줄, 스타일[, confidence]) 튜플로 normalize_plan 결과를 만듭니다."""
+    return style_analysis.normalize_plan(
+        [{"start_line": item[0], "end_line": item[1], "style_type": item[2],
+          "confidence": item[3] if len(item) > 3 else 1.0} for item in items],
+        lambda item: item["style_type"])
+
+
+def _ranges(merged):
+    return [(item["start_line"], item["end_line"], item["style"]) for item in merged]
+
+
+def test_merge_plans_sorts_and_joins_across_blank_lines():
+    plans = [
+        [{"start_line": 5, "end_line": 6, "style_type": "본문", "confidence": 0.9}],
+        [{"start_line": 1, "end_line": 3, "style_type": "본문", "confidence": 0.7},
+         {"start_line": 8, "end_line": 8, "style_type": "제목"}],
+    ]
+    merged = style_analysis.merge_plans(plans, blanks={4})
+    assert [(p["start_line"], p["end_line"], p["style_type"]) for p in merged] == [(1, 6, "본문"), (8, 8, "제목")]
+    assert merged[0]["confidence"] == 0.7
+    # 입력 항목은 바꾸지 않음
+    assert plans[1][0]["end_line"] == 3
+
+
+def test_merge_plans_keeps_gaps_with_text():
+    plans = [[{"start_line": 1, "end_line": 2, "style_type": "본문"}],
+             [{"start_line": 4, "end_line": 5, "style_type": "본문"}]]
+    merged = style_analysis.merge_plans(plans, blanks=())
+    assert [(p["start_line"], p["end_line"]) for p in merged] == [(1, 2), (4, 5)]
+
+
+def test_normalize_plan_drops_invalid_and_unmapped_items():
+    plan = [{"start_line": "3", "end_line": 1, "style_type": "본문"},
+            {"start_line": "x", "style_type": "본문"},
+            {"start_line": 4, "style_type": "없음"},
+            {"end_line": 5, "style_type": "본문"}]
+    normalized = style_analysis.normalize_plan(plan, lambda item: None if item["style_type"] == "없음" else "본문")
+    assert [(p["start_line"], p["end_line"], p["order"]) for p in normalized] == [(1, 3, 0)]
+
+
+def test_coalesce_plan_prefers_confident_then_narrow_then_earlier_items():
+    items = _plan((1, 10, "본문", 0.5), (3, 4, "제목", 0.9), (6, 7, "강조", 0.5), (6, 7, "인용", 0.5))
+    assert _ranges(style_analysis.coalesce_plan(items)) == [
+        (1, 2, "본문"), (3, 4, "제목"), (5, 5, "본문"), (6, 7, "강조"), (8, 10, "본문")]
+
+
+def test_coalesce_plan_joins_same_style_over_blank_lines_only():
+    items = _plan((1, 2, "본문"), (4, 5, "본문"), (7, 8, "본문"))
+    merged = style_analysis.coalesce_plan(items, blanks={3})
+    assert _ranges(merged) == [(1, 5, "본문"), (7, 8, "본문")]
+    assert merged[0]["sources"] == [0, 1]
+
+
+def test_coalesce_plan_merges_overlapping_items_of_one_style():
+    items = _plan((1, 5, "본문"), (3, 8, "본문"))
+    merged = style_analysis.coalesce_plan(items)
+    assert _ranges(merged) == [(1, 8, "본문")]
+    assert merged[0]["sources"] == [0, 1]
+
+
+def test_coalesce_plan_of_empty_plan():
+    assert style_analysis.coalesce_plan([]) == []
@@ -0,0 +1,32 @@
+import os
+
+import template_index
+from conftest import NESTED_INNER, NESTED_OUTER, TEMPLATES_DIR
+
+
+def test_scan_fields_lists_nested_click_here_fields():
+    fields = template_index.scan_fields(os.path.join(TEMPLATES_DIR, "detail.hwp"))
+    names = [f["name"] for f in fields]
+    assert names.index(NESTED_OUTER) < names.index(NESTED_INNER)
+    values = {f["name"]: f["value"] for f in fields}
+    assert values[NESTED_INNER] == "1학기"
+    assert values[NESTED_OUTER].startswith(values[NESTED_INNER])
+
+
+def test_index_fields_match_scan(tmp_path):
+    index = template_index.TemplateIndex(templates_dir=TEMPLATES_DIR, index_path=str(tmp_path / "index.json"))
+    assert NESTED_OUTER in index.fields("detail")
+    assert NESTED_OUTER in index.fields("공문예시")
+
+
+def test_stale_index_version_is_rebuilt(tmp_path):
+    index_path = tmp_path / "index.json"
+    index = template_index.TemplateIndex(templates_dir=TEMPLATES_DIR, index_path=str(index_path))
+    index.refresh()
+    # 예전 버전 색인은 읽지 않고 다시 만듦
+    data = index_path.read_text(encoding="utf-8").replace(
+        f'"version": {template_index.INDEX_VERSION}', '"version": 0')
+    index_path.write_text(data, encoding="utf-8")
+    reloaded = template_index.TemplateIndex(templates_dir=TEMPLATES_DIR, index_path=str(index_path))
+    assert reloaded.entries == {}
+    assert reloaded.refresh()["added"] == len(reloaded.entries) > 0